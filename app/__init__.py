@@ -1,29 +1,49 @@
 from flask import Flask, redirect, url_for, render_template
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, login_user
-from flask_migrate import Migrate
-from flask_dance.contrib.google import make_google_blueprint, google
 import os
+import time
 
 db = SQLAlchemy()
 login_manager = LoginManager()
-migrate = Migrate()
+
+
+class StartupTimer:
+    """Time each create_app() phase; `flask startup-profile` prints the result."""
+
+    def __init__(self):
+        self.phases = []
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, round((now - self._last) * 1000, 2)))
+        self._last = now
+
 
 def create_app(skip_socketio=False):
+    timer = StartupTimer()
     app = Flask(__name__)
+    app.extensions['startup_phases'] = timer.phases
     
     # Configuration
     from config import config
     config_name = os.environ.get('FLASK_CONFIG', 'default')
     app.config.from_object(config[config_name])
+    timer.mark('config')
     
     # Initialize extensions
     db.init_app(app)
     login_manager.init_app(app)
-    migrate.init_app(app, db)
+    # Flask-Migrate (and Alembic behind it) is only used by `flask db ...`;
+    # the web worker skips the import
+    if os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        from flask_migrate import Migrate
+        Migrate(app, db)
     
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
+    timer.mark('extensions')
     
     # Register blueprints
     from app.routes import auth, main, courses, assignments, quizzes, notifications, lessons
@@ -38,8 +58,10 @@ def create_app(skip_socketio=False):
     app.register_blueprint(admin_bp)
     app.register_blueprint(notifications.bp)
     app.register_blueprint(admin_db_export, url_prefix='/admin')
+    timer.mark('blueprints')
     
-    # Google OAuth blueprint
+    # Google OAuth blueprint (the login page and base template link to it)
+    from flask_dance.contrib.google import make_google_blueprint
     google_bp = make_google_blueprint(
         client_id=os.environ.get("GOOGLE_OAUTH_CLIENT_ID"),
         client_secret=os.environ.get("GOOGLE_OAUTH_CLIENT_SECRET"),
@@ -95,6 +117,7 @@ def create_app(skip_socketio=False):
             logging.exception("Exception during Google OAuth login:")
             flash(f"Google login error: {str(e)}", "danger")
             return False
+    timer.mark('google_oauth')
     
     # Admin bootstrap moved to CLI command
     # Flask CLI command to create or update the admin user
@@ -132,22 +155,15 @@ def create_app(skip_socketio=False):
             print(f"[ADMIN BOOTSTRAP] Admin user {admin_email} ensured with password (hidden) and role teacher.")
 
     def register_cli_commands(app):
+        from app.cli import register_commands
         app.cli.add_command(create_admin)
+        register_commands(app)
     
-    # Ensure code_hash column exists in comment_feedback table
-    with app.app_context():
-        try:
-            from sqlalchemy import text, inspect
-            inspector = inspect(db.engine)
-            if 'comment_feedback' in inspector.get_table_names():
-                columns = [col['name'] for col in inspector.get_columns('comment_feedback')]
-                if 'code_hash' not in columns:
-                    print("[DB INIT] Adding code_hash column to comment_feedback table...")
-                    with db.engine.begin() as conn:
-                        conn.execute(text('ALTER TABLE comment_feedback ADD COLUMN code_hash VARCHAR(64) DEFAULT \'unknown\''))
-                    print("[DB INIT] code_hash column added successfully")
-        except Exception as e:
-            print(f"[DB INIT] Warning: {e}")
+    # Schema changes are applied by Alembic; this only compares a cached
+    # fingerprint of migrations/versions and queries the database when it changed
+    from app.services.schema_version import check_schema
+    check_schema(app, db)
+    timer.mark('schema_check')
     
     # Register error handlers
     @app.errorhandler(404)
@@ -170,5 +186,6 @@ def create_app(skip_socketio=False):
         return {'admin_email': admin_email}
     
     register_cli_commands(app)
+    timer.mark('handlers_and_cli')
     return app
 
@@ -0,0 +1,141 @@
+"""Flask CLI commands registered by create_app()."""
+import json
+import click
+from flask.cli import with_appcontext
+
+
+@click.command("batch-check")
+@click.argument("path", type=click.Path(exists=True))
+@click.option("--teacher", "teacher_username", help="Record the checks under this teacher's account.")
+@click.option("--workers", type=int, default=None, help="Process pool size (0 or 1 runs inline).")
+@click.option("--json-output", type=click.Path(dir_okay=False, writable=True), help="Also write the full report as JSON.")
+@with_appcontext
+def batch_check(path, teacher_username, workers, json_output):
+    """Run the comment and debug checkers over a directory or zip of student .py files."""
+    from app.models import User
+    from app.services.batch_checker import read_batch_path, run_batch, BatchInputError
+    from app.services.template_registry import comment_checker_section_id
+    user_id = None
+    if teacher_username:
+        teacher = User.query.filter_by(username=teacher_username).first()
+        if not teacher or not teacher.is_teacher():
+            raise click.ClickException(f"No teacher account named '{teacher_username}'.")
+        user_id = teacher.id
+    try:
+        files = read_batch_path(path)
+    except BatchInputError as e:
+        raise click.ClickException(str(e))
+    if not files:
+        raise click.ClickException("No .py files found.")
+    report = run_batch(files, user_id=user_id, section_id=comment_checker_section_id(), workers=workers, save=user_id is not None)
+
+    click.echo(f"{'File':40} {'Lines':>6} {'Comments':>9} {'Good':>5} {'DEBUG':>6} {'Complete':>9}")
+    for r in report['files']:
+        click.echo(f"{r['filename'][:40]:40} {r['lines']:>6} {r['comments']:>9} {r['good_comments']:>5} {r['debug_blocks']:>6} {r['complete_debug_blocks']:>9}")
+    totals = report['totals']
+    click.echo(f"\n{totals['files']} files, {totals['comments']} comments ({totals['good_comments']} good), "
+               f"{totals['debug_blocks']} DEBUG blocks ({totals['complete_debug_blocks']} complete); "
+               f"{totals['meeting_debug_requirement']} files meet the DEBUG block requirement.")
+    click.echo(f"{report['cache_hits']} cached, {report['workers']} workers, {report['elapsed_ms']} ms"
+               + ("" if user_id else " (not saved: pass --teacher to record the checks)"))
+    if json_output:
+        with open(json_output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        click.echo(f"Report written to {json_output}")
+
+
+@click.command("purge-checker-results")
+@with_appcontext
+def purge_checker_results():
+    """Delete stored checker results older than CHECKER_RESULT_TTL_SECONDS."""
+    from app.services.result_store import purge_expired
+    click.echo(f"Purged {purge_expired()} expired checker result(s).")
+
+
+@click.command("rebuild-course-progress")
+@with_appcontext
+def rebuild_course_progress():
+    """Recompute the course_progress rollup from submissions, quiz attempts and lesson progress."""
+    from app.services.course_progress import rebuild_course_progress as rebuild
+    click.echo(f"Rebuilt {rebuild()} course progress row(s).")
+
+
+@click.command("export-feedback")
+@click.argument("output", type=click.Path(dir_okay=False, writable=True))
+@click.option("--course-id", type=int, default=None, help="Only students enrolled in this course.")
+@click.option("--workers", type=int, default=None, help="Process pool size (0 or 1 renders inline).")
+@with_appcontext
+def export_feedback(output, course_id, workers):
+    """Write every student's comment and DEBUG feedback PDFs into a zip."""
+    from app.services.feedback_export import stream_feedback_zip
+    from app.services.template_registry import comment_checker_section_id
+    with open(output, 'wb') as f:
+        for chunk in stream_feedback_zip(comment_checker_section_id(), course_id=course_id, workers=workers):
+            f.write(chunk)
+    click.echo(f"Feedback written to {output}")
+
+
+# Run in a fresh interpreter by startup-profile; the last stdout line is the JSON result
+_STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+app = create_app()
+print(json.dumps({'phases': app.extensions['startup_phases'], 'total_ms': (time.perf_counter() - started) * 1000}))
+"""
+
+
+def _parse_importtime(stderr):
+    """Return [(module, self_ms, cumulative_ms, depth)] from `python -X importtime` output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        modules.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+    return modules
+
+
+@click.command("startup-profile")
+@click.option("--top", default=15, show_default=True, help="How many modules to list.")
+@click.option("--cli", "as_cli", is_flag=True, help="Profile as a flask CLI command (loads Flask-Migrate) instead of the web worker.")
+@with_appcontext
+def startup_profile(top, as_cli):
+    """Report per-module import time and create_app() phase timings in a fresh interpreter."""
+    import os
+    import subprocess
+    import sys
+    from flask import current_app
+    project_root = os.path.dirname(current_app.root_path)
+    env = dict(os.environ)
+    if not as_cli:
+        env.pop('FLASK_RUN_FROM_CLI', None)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', _STARTUP_SCRIPT],
+                          capture_output=True, text=True, env=env, cwd=project_root)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise click.ClickException(f"create_app() failed in the profiling process:\n{proc.stderr[-2000:]}")
+    result = json.loads(lines[-1])
+    modules = _parse_importtime(proc.stderr)
+
+    top_level = sorted((m for m in modules if m[3] == 0), key=lambda m: -m[2])
+    click.echo(f"{'Top-level import':50} {'cumulative ms':>14}")
+    for name, _, cumulative, _ in top_level[:top]:
+        click.echo(f"{name[:50]:50} {cumulative:>14.1f}")
+    click.echo(f"\n{'Slowest modules (own time)':50} {'self ms':>14}")
+    for name, self_ms, _, _ in sorted(modules, key=lambda m: -m[1])[:top]:
+        click.echo(f"{name[:50]:50} {self_ms:>14.1f}")
+    click.echo(f"\n{'create_app() phase':50} {'ms':>14}")
+    for phase, ms in result['phases']:
+        click.echo(f"{phase:50} {ms:>14.1f}")
+    click.echo(f"\n{len(modules)} modules imported ({sum(m[2] for m in top_level):.0f} ms); "
+               f"import + create_app(): {result['total_ms']:.0f} ms")
+
+
+def register_commands(app):
+    app.cli.add_command(batch_check)
+    app.cli.add_command(export_feedback)
+    app.cli.add_command(purge_checker_results)
+    app.cli.add_command(rebuild_course_progress)
+    app.cli.add_command(startup_profile)
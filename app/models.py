@@ -139,6 +139,82 @@ class CommentFeedback(db.Model):
     code_hash = db.Column(db.String(64), nullable=False)  # SHA256 hash of code
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # One feedback row per line of a checked file; bulk inserts rely on this key
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'section_id', 'filename', 'line_num', name='uq_comment_feedback_line'),
+    )
+
+# Content-addressed store of comment checker results, shared by every user
+class CommentAnalysisCache(db.Model):
+    __tablename__ = 'comment_analysis_cache'
+    id = db.Column(db.Integer, primary_key=True)
+    code_hash = db.Column(db.String(64), nullable=False)  # SHA256 hash of code
+    ruleset_version = db.Column(db.String(64), nullable=False)
+    results = db.Column(db.Text, nullable=False)  # JSON list of [line_num, comment, feedback]
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('code_hash', 'ruleset_version', name='uq_comment_analysis_cache_key'),
+    )
+
+    def __repr__(self):
+        return f'<CommentAnalysisCache {self.code_hash[:12]} v{self.ruleset_version}>'
+
+# Teacher-defined comment checker rules (merged over app/comment_rules.json)
+class CommentRule(db.Model):
+    __tablename__ = 'comment_rules'
+    id = db.Column(db.Integer, primary_key=True)
+    rule_key = db.Column(db.String(64), unique=True, nullable=False)
+    pattern = db.Column(db.Text, nullable=False)  # Python regular expression, searched in the comment
+    message = db.Column(db.Text, nullable=False)
+    priority = db.Column(db.Integer, default=100)  # Lower runs first; first match gives the feedback
+    is_active = db.Column(db.Boolean, default=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CommentRule {self.rule_key}>'
+
+class CheckerResult(db.Model):
+    __tablename__ = 'checker_results'
+    id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String(32), unique=True, nullable=False)  # held in the cookie session
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, unique=True)  # one row per signed-in user
+    data = db.Column(db.Text, nullable=False, default='{}')  # JSON dict of checker results
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<CheckerResult {self.token} user={self.user_id}>'
+
+# One parsed DEBUG block from a debug checker run, per user/file/version of the code
+class DebugBlockResult(db.Model):
+    __tablename__ = 'debug_block_results'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    code_hash = db.Column(db.String(64), nullable=False)  # SHA256 hash of code
+    block_index = db.Column(db.Integer, nullable=False)  # 0-based position in the file
+    start_line = db.Column(db.Integer, nullable=False)
+    end_line = db.Column(db.Integer, nullable=False)
+    lines = db.Column(db.Text, nullable=False)  # JSON list of [line_num, line]
+    test = db.Column(db.Text, nullable=False, default='')
+    issue = db.Column(db.Text, nullable=False, default='')
+    fix = db.Column(db.Text, nullable=False, default='')
+    complete = db.Column(db.Boolean, nullable=False, default=False)
+    checked_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Bulk inserts rely on the unique key; the indexes serve teacher queries by file and by date
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'filename', 'code_hash', 'block_index', name='uq_debug_block_results_block'),
+        db.Index('ix_debug_block_results_filename_complete', 'filename', 'complete'),
+        db.Index('ix_debug_block_results_checked_at', 'checked_at'),
+    )
+
+    def __repr__(self):
+        return f'<DebugBlockResult user_id={self.user_id} filename={self.filename} #{self.block_index}>'
+
+
 class Enrollment(db.Model):
     __tablename__ = 'enrollments'
     
@@ -151,6 +227,27 @@ class Enrollment(db.Model):
     def __repr__(self):
         return f'<Enrollment Student:{self.student_id} Course:{self.course_id}>'
 
+# Per-student, per-course counters behind the progress page. Kept current by
+# app/services/course_progress.py as work is recorded; `flask rebuild-course-progress`
+# recomputes it from the source tables.
+class CourseProgress(db.Model):
+    __tablename__ = 'course_progress'
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
+    lessons_completed = db.Column(db.Integer, nullable=False, default=0)
+    assignments_submitted = db.Column(db.Integer, nullable=False, default=0)
+    quizzes_attempted = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'course_id', name='uq_course_progress_student_course'),
+    )
+
+    def __repr__(self):
+        return f'<CourseProgress Student:{self.student_id} Course:{self.course_id}>'
+
 class LessonProgress(db.Model):
     __tablename__ = 'lesson_progress'
     
@@ -195,6 +292,11 @@ class Submission(db.Model):
     score = db.Column(db.Integer)
     feedback = db.Column(db.Text)
     graded_at = db.Column(db.DateTime)
+
+    # Serves the dashboard's "no submission yet" anti-join
+    __table_args__ = (
+        db.Index('ix_submissions_student_assignment', 'student_id', 'assignment_id'),
+    )
     
     def __repr__(self):
         return f'<Submission Assignment:{self.assignment_id} Student:{self.student_id}>'
@@ -1,7 +1,6 @@
 import os
 from flask import Blueprint, Response, abort
 from flask import current_app as app
-from subprocess import Popen, PIPE
 
 admin_db_export = Blueprint('admin_db_export', __name__)
 
@@ -24,6 +23,7 @@ def export_db():
     env = os.environ.copy()
     env['PGPASSWORD'] = password
     # Run pg_dump
+    from subprocess import Popen, PIPE
     cmd = [
         'pg_dump',
         '-h', host,
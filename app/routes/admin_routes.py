@@ -1,10 +1,12 @@
-import csv
 import json
 from werkzeug.utils import secure_filename
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort
 from flask_login import login_required, current_user
 from app import db
 from app.models import User, Course, Enrollment, Lesson, Assignment, Submission
+from app.services.teacher_stats import teacher_stats, invalidate_teacher_stats
+from app.services.roster import roster_page, roster_count, enrolled_course_ids, serialize_user, set_enrollment
+from sqlalchemy.orm import selectinload
 from functools import wraps
 
 
@@ -12,6 +14,9 @@ bp = Blueprint('admin', __name__, url_prefix='/admin')
 from app.routes.admin.db_export import admin_db_export
 bp.register_blueprint(admin_db_export)
 
+# Students shown on the teacher dashboard before "View all"
+DASHBOARD_STUDENT_LIMIT = 8
+
 
 def teacher_required(f):
     @wraps(f)
@@ -30,15 +35,12 @@ def dashboard():
     """Enhanced teacher dashboard with statistics and recent submissions"""
     # Get current teacher's courses and students
     teacher_courses = Course.query.filter_by(teacher_id=current_user.id).all()
+    stats = teacher_stats(current_user.id)
     
-    # Collect all students enrolled in teacher's courses
-    student_ids = set()
-    for course in teacher_courses:
-        for enrollment in course.enrollments:
-            student_ids.add(enrollment.student_id)
-    
-    # Get student info and submissions
-    students = User.query.filter(User.id.in_(student_ids)).all() if student_ids else []
+    # The dashboard shows the first few students; the total comes from the stats
+    students = _teacher_students_query(current_user.id).options(
+        selectinload(User.enrollments)
+    ).order_by(User.id).limit(DASHBOARD_STUDENT_LIMIT).all()
     
     # Get recent submissions from teacher's courses
     recent_submissions = db.session.query(Submission).join(
@@ -47,19 +49,25 @@ def dashboard():
         Submission.assignment.has(Assignment.course_id.in_([c.id for c in teacher_courses]))
     ).order_by(Submission.submitted_at.desc()).limit(10).all()
     
-    # Calculate statistics
-    total_students = len(students)
-    total_enrollments = sum(len(course.enrollments) for course in teacher_courses)
-    
     return render_template('admin/teacher_dashboard.html',
         teacher_courses=teacher_courses,
         students=students,
         recent_submissions=recent_submissions,
-        total_students=total_students,
-        total_enrollments=total_enrollments
+        total_students=stats['students'],
+        total_enrollments=stats['enrollments'],
+        ungraded_submissions=stats['ungraded'],
+        average_score=stats['average_score'],
+        course_stats=stats['courses']
     )
 
 
+def _teacher_students_query(teacher_id):
+    """Users enrolled in any of the teacher's courses."""
+    return User.query.filter(User.id.in_(
+        db.select(Enrollment.student_id).join(Course, Course.id == Enrollment.course_id).where(Course.teacher_id == teacher_id)
+    ))
+
+
 
 
 # --- CHANGE COURSE ORDER ROUTE ---
@@ -91,6 +99,7 @@ def delete_course(course_id):
     course = Course.query.get_or_404(course_id)
     db.session.delete(course)
     db.session.commit()
+    invalidate_teacher_stats(course.teacher_id)
     flash(f'Course "{course.title}" and all its lessons/assignments/quizzes have been deleted.', 'success')
     return redirect(url_for('admin.index'))
 
@@ -102,8 +111,10 @@ def delete_course(course_id):
 @teacher_required
 def delete_lesson(lesson_id):
     lesson = Lesson.query.get_or_404(lesson_id)
+    teacher_id = lesson.course.teacher_id
     db.session.delete(lesson)
     db.session.commit()
+    invalidate_teacher_stats(teacher_id)
     flash(f'Lesson "{lesson.title}" deleted.', 'success')
     return redirect(url_for('admin.index'))
 
@@ -129,6 +140,7 @@ def bulk_upload():
     ext = filename.rsplit('.', 1)[-1].lower()
     try:
         if ext == 'csv':
+            import csv
             # Expecting: course_title, course_description, lesson_title, lesson_content, lesson_order, lesson_template_path, lesson_video_url
             reader = csv.DictReader(file.read().decode('utf-8').splitlines())
             for row in reader:
@@ -176,98 +188,114 @@ def bulk_upload():
             upload_message = 'Unsupported file type.'
     except Exception as e:
         upload_message = f'Error: {str(e)}'
+    invalidate_teacher_stats(current_user.id)
     # Show message on admin dashboard
-    users = User.query.all()
-    courses = Course.query.filter_by(teacher_id=current_user.id).all()
-    user_enrollments = {}
-    for user in users:
-        enrolled_courses = [enrollment.course for enrollment in user.enrollments]
-        user_enrollments[user.id] = enrolled_courses
-    return render_template('admin/index.html', users=users, courses=courses, user_enrollments=user_enrollments, upload_message=upload_message)
+    return redirect(url_for('admin.index', upload_message=upload_message))
 
 
-@bp.route('/', methods=['GET', 'POST'])
+@bp.route('/')
 @login_required
 @teacher_required
 def index():
     # Get current teacher's courses and students
     teacher_courses = Course.query.filter_by(teacher_id=current_user.id).all()
-    
-    # Collect all students enrolled in teacher's courses
-    student_ids = set()
-    for course in teacher_courses:
-        for enrollment in course.enrollments:
-            student_ids.add(enrollment.student_id)
-    
-    # Get student info and submissions
-    students = User.query.filter(User.id.in_(student_ids)).all() if student_ids else []
+    stats = teacher_stats(current_user.id)
+    students = _teacher_students_query(current_user.id).order_by(User.id).all()
     
     # Get recent submissions from teacher's courses
-    from app.models import Submission
     recent_submissions = db.session.query(Submission).join(
         Submission.assignment
     ).filter(
         Submission.assignment.has(Assignment.course_id.in_([c.id for c in teacher_courses]))
     ).order_by(Submission.submitted_at.desc()).limit(10).all()
     
-    # Calculate statistics
-    total_students = len(students)
-    total_enrollments = sum(len(course.enrollments) for course in teacher_courses)
-    total_submissions = sum(
-        len([s for s in course.assignments]) 
-        for course in teacher_courses
-        for assign in course.assignments
-        for s in assign.submissions
-    )
-    
-    # Fallback for legacy interface
-    users = User.query.all()
-    courses = Course.query.all()
-    user_enrollments = {}
-    for user in users:
-        enrolled_courses = [enrollment.course for enrollment in user.enrollments]
-        user_enrollments[user.id] = enrolled_courses
-    
-    message = None
-    if request.method == 'POST':
-        user_id = int(request.form['user_id'])
-        course_id = int(request.form['course_id'])
-        action = request.form['action']
-        user = User.query.get(user_id)
-        course = Course.query.get(course_id)
-        if not user or not course:
-            message = 'Invalid user or course.'
-        else:
-            enrollment = Enrollment.query.filter_by(student_id=user_id, course_id=course_id).first()
-            if action == 'enrol':
-                if enrollment:
-                    message = f'{user.username} is already enrolled in {course.title}.'
-                else:
-                    new_enrollment = Enrollment(student_id=user_id, course_id=course_id)
-                    db.session.add(new_enrollment)
-                    db.session.commit()
-                    message = f'{user.username} enrolled in {course.title}.'
-            elif action == 'unenrol':
-                if enrollment:
-                    db.session.delete(enrollment)
-                    db.session.commit()
-                    message = f'{user.username} unenrolled from {course.title}.'
-                else:
-                    message = f'{user.username} is not enrolled in {course.title}.'
+    # One page of the users/enrollments roster; enrol/unenrol go through admin.roster_enrollment
+    roster_filters = _roster_filters()
+    users, next_after = roster_page(after_id=request.args.get('after', type=int), **roster_filters)
+    courses = Course.query.options(selectinload(Course.lessons)).order_by(Course.order, Course.id).all()
     
     return render_template('admin/index.html', 
         users=users, 
         courses=courses, 
-        user_enrollments=user_enrollments, 
-        message=message,
+        user_enrollments=enrolled_course_ids(users), 
+        total_users=roster_count(),
+        roster_total=roster_count(**roster_filters),
+        roster_filters=roster_filters,
+        roster_after=request.args.get('after', type=int),
+        next_after=next_after,
+        upload_message=request.args.get('upload_message'),
         teacher_courses=teacher_courses,
         students=students,
         recent_submissions=recent_submissions,
-        total_students=total_students,
-        total_enrollments=total_enrollments,
-        total_submissions=total_submissions
+        total_students=stats['students'],
+        total_enrollments=stats['enrollments'],
+        total_submissions=stats['submissions'],
+        ungraded_submissions=stats['ungraded'],
+        average_score=stats['average_score']
     )
 
+
+def _roster_filters():
+    return {
+        'course_id': request.args.get('course_id', type=int),
+        'role': request.args.get('role') or None,
+    }
+
+
+@bp.route('/roster')
+@login_required
+@teacher_required
+def roster():
+    """One page of users with their enrolled course ids, as JSON (?after=&course_id=&role=&limit=)."""
+    roster_filters = _roster_filters()
+    users, next_after = roster_page(
+        after_id=request.args.get('after', type=int),
+        limit=request.args.get('limit', type=int),
+        **roster_filters
+    )
+    return jsonify({
+        'success': True,
+        'users': [serialize_user(user) for user in users],
+        'next_after': next_after,
+        'total': roster_count(**roster_filters),
+    })
+
+
+@bp.route('/roster/enrollment', methods=['POST'])
+@login_required
+@teacher_required
+def roster_enrollment():
+    """Enrol or unenrol one user in one course (form or JSON body: user_id, course_id, action)."""
+    data = request.get_json(silent=True) or request.form
+    try:
+        user_id = int(data.get('user_id'))
+        course_id = int(data.get('course_id'))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'user_id and course_id are required'}), 400
+    action = data.get('action')
+    if action not in ('enrol', 'unenrol'):
+        return jsonify({'success': False, 'error': "action must be 'enrol' or 'unenrol'"}), 400
+    try:
+        changed, message = set_enrollment(user_id, course_id, action == 'enrol')
+    except LookupError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+    return jsonify({'success': True, 'changed': changed, 'enrolled': action == 'enrol', 'message': message})
+
+@bp.route('/score_analytics')
+@login_required
+@teacher_required
+def score_analytics():
+    """Assignment and quiz score distributions across the teacher's courses, as JSON (?course_id= narrows to one)."""
+    from app.services.score_analytics import course_score_analytics
+    course_ids = [course_id for (course_id,) in db.session.query(Course.id).filter_by(teacher_id=current_user.id)]
+    requested = request.args.get('course_id', type=int)
+    if requested is not None:
+        if requested not in course_ids:
+            return jsonify({'success': False, 'error': 'Unknown course'}), 404
+        course_ids = [requested]
+    return jsonify({'success': True, **course_score_analytics(course_ids)})
+
+
 @bp.route('/students')
 @login_required
 @teacher_required
@@ -291,9 +319,126 @@ def student_detail(student_id):
 @teacher_required
 def reset_student_checker(student_id):
     from app.models import CommentCheck, DebugCheck, User
+    from app.services.checker_summary import invalidate_checked_files
     student = User.query.get_or_404(student_id)
     CommentCheck.query.filter_by(user_id=student_id).delete()
     DebugCheck.query.filter_by(user_id=student_id).delete()
     db.session.commit()
+    invalidate_checked_files(student_id)
     flash(f'All checker files for {student.username} have been reset.', 'success')
     return redirect(url_for('admin.student_detail', student_id=student_id))
+
+# --- COMMENT CHECKER RULES ---
+@bp.route('/comment_rules', methods=['GET', 'POST'])
+@login_required
+@teacher_required
+def comment_rules():
+    from app.models import CommentRule
+    from app.services.comment_rules import validate_pattern, invalidate_ruleset, get_ruleset, builtin_rule_ids
+    if request.method == 'POST':
+        action = request.form.get('action')
+        rule_key = request.form.get('rule_key', '').strip()
+        rule = CommentRule.query.filter_by(rule_key=rule_key).first() if rule_key else None
+        if action == 'save':
+            pattern = request.form.get('pattern', '')
+            message = request.form.get('message', '').strip()
+            try:
+                priority = int(request.form.get('priority') or 100)
+            except ValueError:
+                priority = 100
+            if not rule_key or not pattern or not message:
+                flash('Rule id, pattern and message are all required.', 'danger')
+                return redirect(url_for('admin.comment_rules'))
+            try:
+                validate_pattern(pattern)
+            except ValueError as e:
+                flash(str(e), 'danger')
+                return redirect(url_for('admin.comment_rules'))
+            if not rule:
+                rule = CommentRule(rule_key=rule_key, created_by=current_user.id)
+                db.session.add(rule)
+            rule.pattern = pattern
+            rule.message = message
+            rule.priority = priority
+            rule.is_active = True
+            db.session.commit()
+            flash(f'Rule "{rule_key}" saved.', 'success')
+        elif action == 'disable':
+            # Disabling a built-in rule stores an inactive override row
+            if not rule:
+                rule = CommentRule(rule_key=rule_key, pattern='', message='', created_by=current_user.id)
+                db.session.add(rule)
+            rule.is_active = False
+            db.session.commit()
+            flash(f'Rule "{rule_key}" disabled.', 'success')
+        elif action == 'reset' and rule:
+            db.session.delete(rule)
+            db.session.commit()
+            flash(f'Custom settings for rule "{rule_key}" removed.', 'success')
+        invalidate_ruleset()
+        return redirect(url_for('admin.comment_rules'))
+    ruleset = get_ruleset()
+    custom_rules = {r.rule_key: r for r in CommentRule.query.order_by(CommentRule.priority).all()}
+    # Optional preview of which rules fire for a sample comment
+    test_comment = request.args.get('test_comment', '')
+    test_matches = ruleset.evaluate(test_comment) if test_comment else None
+    return render_template('admin/comment_rules.html',
+        ruleset=ruleset,
+        custom_rules=custom_rules,
+        builtin_ids=builtin_rule_ids(),
+        test_comment=test_comment,
+        test_matches=test_matches
+    )
+
+# --- CLASS-WIDE BATCH CHECKER ---
+@bp.route('/batch_checker', methods=['GET', 'POST'])
+@login_required
+@teacher_required
+def batch_checker():
+    from app.services.batch_checker import read_zip, read_source, run_batch, max_total_bytes, BatchInputError
+    from app.services.template_registry import comment_checker_section_id
+    report = None
+    if request.method == 'POST':
+        uploads = [f for f in request.files.getlist('files') if f and f.filename]
+        files = []
+        try:
+            for upload in uploads:
+                name = upload.filename
+                if name.lower().endswith('.zip'):
+                    # Several zips in one request share the batch's decompressed-size budget
+                    remaining = max_total_bytes() - sum(len(code.encode('utf-8')) for _, code in files)
+                    files.extend(read_zip(upload.stream, max_bytes=max(remaining, 0)))
+                elif name.lower().endswith('.py'):
+                    files.append((secure_filename(name), read_source(upload.stream, name)))
+        except BatchInputError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('admin.batch_checker'))
+        if not files:
+            flash('Upload a .zip of student files or one or more .py files.', 'danger')
+            return redirect(url_for('admin.batch_checker'))
+        # Checked inline: the eventlet worker must not fork a process pool (use `flask batch-check` for big batches)
+        report = run_batch(files, user_id=current_user.id, section_id=comment_checker_section_id(), workers=0)
+    return render_template('admin/batch_checker.html', report=report)
+
+@bp.route('/feedback_export')
+@login_required
+@teacher_required
+def feedback_export():
+    from datetime import datetime
+    from flask import Response, stream_with_context
+    from app.services.feedback_export import stream_feedback_zip
+    from app.services.template_registry import comment_checker_section_id
+    course_id = request.args.get('course_id', type=int)
+    if course_id is not None:
+        course = db.session.get(Course, course_id)
+        if course is None:
+            abort(404)
+        if course.teacher_id != current_user.id:
+            abort(403)
+    course_label = f"course{course_id}" if course_id else 'all_students'
+    filename = f"feedback_{course_label}_{datetime.now().strftime('%Y-%m-%d')}.zip"
+    # Rendered inline: forking a pool inside the eventlet worker mid-response would share its DB connection
+    stream = stream_feedback_zip(comment_checker_section_id(), course_id=course_id, workers=0)
+    return Response(stream_with_context(stream), mimetype='application/zip', headers={
+        'Content-Disposition': f'attachment; filename={filename}'
+    })
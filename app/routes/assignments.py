@@ -3,6 +3,8 @@ from flask_login import login_required, current_user
 from app import db
 from app.models import Assignment, Submission, Course, Enrollment, AssignmentRubric, RubricCriterion, GradeDetail, User
 from app.forms import AssignmentForm, SubmissionForm
+from app.services.course_progress import bump_course_progress
+from app.services.teacher_stats import invalidate_course_stats, invalidate_teacher_stats
 from datetime import datetime
 import os
 from werkzeug.utils import secure_filename
@@ -145,8 +147,10 @@ def submit_assignment(assignment_id):
                 file_path=file_path
             )
             db.session.add(submission)
+            bump_course_progress(current_user.id, assignment.course_id, assignments=1)
         
         db.session.commit()
+        invalidate_teacher_stats(assignment.course.teacher_id)
         flash('Assignment submitted successfully!', 'success')
         
         # Send notification to teachers
@@ -186,6 +190,7 @@ def grade_submission(submission_id):
     submission.graded_at = datetime.utcnow()
     
     db.session.commit()
+    invalidate_course_stats(submission.assignment.course_id)
     flash('Submission graded successfully!', 'success')
     
     return redirect(url_for('assignments.view_assignment', assignment_id=submission.assignment_id))
@@ -207,25 +212,88 @@ def grading_dashboard(assignment_id):
     # Get rubric if exists
     rubric = AssignmentRubric.query.filter_by(assignment_id=assignment_id).first()
     
-    # Calculate stats
-    total_submissions = len(submissions)
-    graded_count = len([s for s in submissions if s.graded])
-    avg_score = 0
-    if graded_count > 0:
-        avg_score = sum(s.score for s in submissions if s.score) / len([s for s in submissions if s.score])
-    
+    # Score distribution and rubric breakdown (NumPy is only imported by the grading pages)
+    from app.services.score_analytics import assignment_analytics
+    analytics = assignment_analytics(assignment)
     stats = {
-        'total': total_submissions,
-        'graded': graded_count,
-        'pending': total_submissions - graded_count,
-        'average': round(avg_score, 1)
+        'total': analytics['submitted'],
+        'graded': analytics['graded'],
+        'pending': analytics['pending'],
+        'average': round(analytics['scores']['mean'], 1) if analytics['scores']['mean'] is not None else 0
     }
     
     return render_template('assignments/grading_dashboard.html',
                          assignment=assignment,
                          submissions=submissions,
                          rubric=rubric,
-                         stats=stats)
+                         stats=stats,
+                         analytics=analytics)
+
+
+@bp.route('/<int:assignment_id>/analytics')
+@login_required
+def assignment_analytics_json(assignment_id):
+    """Score percentiles, histogram and per-criterion statistics for one assignment, as JSON"""
+    assignment = Assignment.query.get_or_404(assignment_id)
+    
+    if assignment.course.teacher_id != current_user.id:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    
+    from app.services.score_analytics import assignment_analytics
+    return jsonify({'success': True, **assignment_analytics(assignment)})
+
+
+@bp.route('/course/<int:course_id>/gradebook')
+@login_required
+def gradebook(course_id):
+    """Students x assignments grid for a course, one page of students at a time"""
+    from flask import current_app
+    from app.services.gradebook import GRADED, SUBMITTED, build_gradebook
+    course = Course.query.get_or_404(course_id)
+    
+    if course.teacher_id != current_user.id:
+        flash('You do not have permission to view this gradebook.', 'danger')
+        return redirect(url_for('main.dashboard'))
+    
+    book = build_gradebook(course_id)
+    per_page = current_app.config.get('GRADEBOOK_PAGE_SIZE', 50)
+    total = len(book.students)
+    pages = max(1, -(-total // per_page))
+    page = min(max(request.args.get('page', 1, type=int), 1), pages)
+    start = (page - 1) * per_page
+    rows = [
+        (book.students[row], book.row(row), book.student_summary(row))
+        for row in range(start, min(start + per_page, total))
+    ]
+    
+    return render_template('assignments/gradebook.html',
+                         course=course,
+                         gradebook=book,
+                         rows=rows,
+                         means=book.assignment_means(),
+                         page=page,
+                         pages=pages,
+                         total=total,
+                         GRADED=GRADED,
+                         SUBMITTED=SUBMITTED)
+
+
+@bp.route('/course/<int:course_id>/gradebook.csv')
+@login_required
+def gradebook_csv(course_id):
+    """Stream the full gradebook as CSV"""
+    from flask import Response, stream_with_context
+    from app.services.gradebook import build_gradebook
+    course = Course.query.get_or_404(course_id)
+    
+    if course.teacher_id != current_user.id:
+        flash('You do not have permission to export this gradebook.', 'danger')
+        return redirect(url_for('main.dashboard'))
+    
+    filename = f"gradebook_course{course_id}_{datetime.now().strftime('%Y-%m-%d')}.csv"
+    return Response(stream_with_context(build_gradebook(course_id).csv_lines()), mimetype='text/csv', headers={
+        'Content-Disposition': f'attachment; filename={filename}'
+    })
 
 
 @bp.route('/<int:assignment_id>/submission/<int:submission_id>/grade', methods=['GET', 'POST'])
@@ -287,6 +355,7 @@ def grade_submission_advanced(assignment_id, submission_id):
         submission.graded_at = datetime.utcnow()
         
         db.session.commit()
+        invalidate_teacher_stats(assignment.course.teacher_id)
         flash('Submission graded successfully!', 'success')
         
         # Send notification to student
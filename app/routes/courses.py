@@ -4,6 +4,9 @@ from app import db
 from app.models import Course, Lesson, Enrollment, LessonProgress
 from app.forms import CourseForm, LessonForm
 from datetime import datetime
+from app.services.result_store import get_result, has_result
+from app.services.debug_block_results import current_debug_blocks
+from app.services.teacher_stats import invalidate_course_stats, invalidate_teacher_stats
 bp = Blueprint('courses', __name__, url_prefix='/courses')
 from flask_login import login_required, current_user
 from app import db
@@ -302,12 +305,8 @@ def view_course(course_id):
     # Get progress for students
     progress = {}
     if not current_user.is_teacher():
-        for lesson in lessons:
-            prog = LessonProgress.query.filter_by(
-                student_id=current_user.id,
-                lesson_id=lesson.id
-            ).first()
-            progress[lesson.id] = prog.completed if prog else False
+        from app.services.lesson_progress import lesson_completion
+        progress = lesson_completion(current_user.id, course_id, lessons)
 
     return render_template('courses/view.html', course=course, lessons=lessons, progress=progress, debug_intro_lesson_id=debug_intro_lesson_id)
 
@@ -329,6 +328,7 @@ def enroll(course_id):
         enrollment = Enrollment(student_id=current_user.id, course_id=course_id)
         db.session.add(enrollment)
         db.session.commit()
+        invalidate_course_stats(course_id)
         flash('Successfully enrolled in the course!', 'success')
     
     return redirect(url_for('courses.view_course', course_id=course_id))
@@ -356,6 +356,7 @@ def create_lesson(course_id):
         )
         db.session.add(lesson)
         db.session.commit()
+        invalidate_teacher_stats(course.teacher_id)
         flash('Lesson created successfully!', 'success')
         return redirect(url_for('courses.view_course', course_id=course_id))
     
@@ -399,13 +400,13 @@ def view_lesson(lesson_id):
     extracted_comments = None
     extracted_debug_blocks = None
     if lesson.id == 46 and current_user.is_authenticated:
-        # Prefer most recent extracted comments from session if available
-        if 'extracted_comments' in session:
-            extracted_comments = session['extracted_comments']
+        # Prefer the most recent stored comment checker results if available
+        if has_result('extracted_comments'):
+            extracted_comments = get_result('extracted_comments')
             # Ensure all entries are (line_num, comment, feedback)
             if extracted_comments and len(extracted_comments) > 0 and len(extracted_comments[0]) == 2:
                 extracted_comments = [(ln, c, '') for ln, c in extracted_comments]
-            # Do NOT clear session here; let PDF route clear it after download
+            # Do NOT clear stored results here; they expire with the result store TTL
         else:
             from app.models import CommentFeedback
             feedback_entries = CommentFeedback.query.filter_by(user_id=current_user.id, lesson_id=lesson.id).order_by(CommentFeedback.line_num.asc()).all()
@@ -416,27 +417,28 @@ def view_lesson(lesson_id):
     if lesson.id == 47 and current_user.is_authenticated:
         extracted_debug_blocks = None
         feedback_debug_blocks = None
-        # Try to get from session (if set by debug checker)
-        if 'extracted_debug_blocks' in session:
-            extracted_debug_blocks = session['extracted_debug_blocks']
+        # Try the stored debug checker results
+        if has_result('debug_code_hash') or has_result('extracted_debug_blocks'):
+            blocks = current_debug_blocks(current_user)
+            extracted_debug_blocks = [block.text for block in blocks]
             # Generate feedback for each block
             feedback_debug_blocks = []
-            for block in extracted_debug_blocks:
+            for block in blocks:
                 feedback = []
-                if '# Test:' in block or '# DEBUG TEST:' in block:
+                if block.test:
                     feedback.append('✅ Test description found.')
                 else:
                     feedback.append('❌ Add a clear test description (what you tried).')
-                if '# Issue:' in block or '# DEBUG ISSUE:' in block:
+                if block.issue:
                     feedback.append('✅ Issue description found.')
                 else:
                     feedback.append('❌ Add a clear issue description (what went wrong).')
-                if '# Fix:' in block or '# DEBUG FIX:' in block:
+                if block.fix:
                     feedback.append('✅ Fix description found.')
                 else:
                     feedback.append('❌ Add a clear fix description (how you fixed it).')
                 # Encourage detail
-                if len(block.splitlines()) < 3:
+                if len(block.lines) < 3:
                     feedback.append('ℹ️ Try to provide more detail in each debug block.')
                 feedback_debug_blocks.append(feedback)
             # Count and summary
@@ -445,7 +447,7 @@ def view_lesson(lesson_id):
                 debug_summary = f'✅ You have {debug_block_count} debug blocks. Great job!'
             else:
                 # Suggest possible places for more blocks
-                code = session.get('uploaded_code') or ''
+                code = get_result('uploaded_code') or ''
                 suggestions = []
                 if code:
                     lines = code.splitlines()
@@ -468,24 +470,15 @@ def view_lesson(lesson_id):
 def complete_lesson(lesson_id):
     lesson = Lesson.query.get_or_404(lesson_id)
     
-    progress = LessonProgress.query.filter_by(
-        student_id=current_user.id,
-        lesson_id=lesson_id
-    ).first()
-    
-    if not progress:
-        progress = LessonProgress(
-            student_id=current_user.id,
-            lesson_id=lesson_id,
-            completed=True,
-            completed_at=datetime.utcnow()
-        )
-        db.session.add(progress)
-    else:
-        progress.completed = True
-        progress.completed_at = datetime.utcnow()
+    # LessonProgress is recorded per section; this also updates the course progress rollup
+    from app.services.course_progress import record_lesson_completion
+    if not record_lesson_completion(current_user.id, lesson):
+        flash('This lesson has no sections to complete yet.', 'info')
+        return redirect(url_for('courses.view_course', course_id=lesson.course_id))
     
     db.session.commit()
+    from app.services.lesson_progress import invalidate_lesson_progress
+    invalidate_lesson_progress(current_user.id, lesson.course_id)
     flash('Lesson marked as complete!', 'success')
     return redirect(url_for('courses.view_course', course_id=lesson.course_id))
 
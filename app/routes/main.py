@@ -1,18 +1,25 @@
 from flask import Blueprint, render_template, request, session, redirect, url_for
-from flask import send_file, flash, jsonify
+from flask import flash, jsonify
 from flask_login import login_required, current_user
-from app.models import Course, Enrollment, Assignment, Submission, Quiz, QuizAttempt, User, CommentCheck, Lesson
-import io
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from app.models import Course, Enrollment, Assignment, Submission, User, CommentCheck, Lesson
 from sqlalchemy import func
 from datetime import datetime
-import hashlib
 from app import db
-import base64
+from app.services.comment_feedback import recheck_comment_feedback
+from app.services.comment_analysis import code_hash_for, get_comment_analysis, feedback_for_comment
+from app.services.debug_blocks import parse_debug_blocks
+from app.services.pdf_reports import render_comments_report, render_comment_feedback_report, render_debug_report, render_debug_feedback_report
+from app.services.pdf_cache import cache_key, content_hash, send_cached_pdf
+from app.services.debug_block_results import store_debug_blocks, current_debug_blocks, PASTED_FILENAME
+from app.services.upload_reader import read_upload, check_source_limits, UploadTooLarge
+from app.services.comment_extractor import LANGUAGES, language_for_filename
+from app.services.result_store import get_result, save_results
+from app.services.checker_summary import get_checked_files_grid, record_check
+from app.services.template_registry import comment_checker_section_id
+from app.services.pending_assignments import pending_assignments_for
+from app.services.course_progress import progress_report
 import json
 import os
-from email.mime.text import MIMEText
 
 bp = Blueprint('main', __name__)
 
@@ -23,6 +30,7 @@ def contact_teacher():
     """Send a message to the teacher via email"""
     try:
         from sqlalchemy.exc import OperationalError
+        from email.mime.text import MIMEText
         
         # Get form data
         subject = request.form.get('subject', 'Question from Student')
@@ -56,6 +64,7 @@ Class Training System"""
         # Try Gmail API first if available
         email_sent = False
         try:
+            import base64
             from flask_dance.contrib.google import google
             
             if google.authorized:
@@ -150,183 +159,58 @@ Class Training System"""
 @bp.route('/download_comments_pdf', methods=['POST'])
 @login_required
 def download_comments_pdf():
-    from flask import make_response
     code = request.form.get('code', '')
     code_str = str(code) if code is not None else ""
     uploaded_filename = request.form.get('uploaded_filename', 'Extracted_Comments')
     today_str = datetime.now().strftime('%Y-%m-%d')
     pdf_filename = f"{uploaded_filename}_comments_{today_str}.pdf"
-    # Compute code hash for strict filtering
-    code_hash = hashlib.sha256(code_str.encode('utf-8')).hexdigest()
-    # Unified logic: match web view
-    comment_lines = []
-    feedback_dict = {}
-    already_checked = False
-    from app.models import CommentFeedback, Lesson
-    template_path = "modules/module3/m3lesson1.html"
-    lesson = Lesson.query.filter_by(template_path=template_path).first()
-    if lesson:
-        lesson_id = lesson.id
-        feedback_entries = CommentFeedback.query.filter_by(
-            user_id=current_user.id,
-            lesson_id=lesson_id,
-            filename=uploaded_filename,
-            code_hash=code_hash
-        ).order_by(CommentFeedback.line_num).all()
-        if feedback_entries:
-            already_checked = True
-            for entry in feedback_entries:
-                comment_lines.append((entry.line_num, entry.comment))
-                feedback_dict[entry.line_num] = entry.feedback
-    if not already_checked:
-        # Use session data if not checked
-        comment_lines = session.get('comment_lines', [])
-        feedback_dict = session.get('feedback_dict', {})
-    # Generate PDF
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-    y = height - 40
-    p.setFont("Helvetica-Bold", 14)
-    p.drawString(40, y, f"Extracted Comments for: {uploaded_filename}")
-    y -= 24
-    p.setFont("Helvetica", 12)
-    p.drawString(40, y, f"Date: {today_str}")
-    y -= 30
-    p.setFont("Helvetica", 11)
-    p.drawString(40, y, "Code:")
-    y -= 18
-    p.setFont("Courier", 9)
-    for line in code.splitlines():
-        if y < 60:
-            p.showPage()
-            y = height - 40
-            p.setFont("Courier", 9)
-        p.drawString(50, y, line)
-        y -= 12
-    y -= 18
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(40, y, "Extracted Comments and Feedback:")
-    y -= 18
-    p.setFont("Helvetica", 10)
-    if comment_lines:
-        for idx, (line_num, comment) in enumerate(comment_lines):
-            if y < 60:
-                p.showPage()
-                y = height - 40
-                p.setFont("Helvetica", 10)
-            p.drawString(50, y, f"Line {line_num}: {comment}")
-            y -= 12
-            p.setFont("Helvetica-Oblique", 9)
-            feedback = feedback_dict.get(line_num, '(No feedback available)')
-            p.drawString(70, y, f"Feedback: {feedback}")
-            y -= 16
-            p.setFont("Helvetica", 10)
+    # Unified logic: match web view by reading the shared analysis cache
+    if code_str.strip():
+        comments = get_comment_analysis(code_str, language=_checker_language(uploaded_filename))
     else:
-        p.drawString(50, y, "No comments found.")
-    p.save()
-    buffer.seek(0)
-    return send_file(buffer, as_attachment=True, download_name=pdf_filename, mimetype='application/pdf')
+        # Fall back to the last stored comment checker results
+        comments = get_result('extracted_comments', [])
+    key = cache_key(current_user.id, uploaded_filename, content_hash(code_str, comments), 'comments', today_str)
+    return send_cached_pdf(key, lambda: render_comments_report(uploaded_filename, today_str, code_str, comments), pdf_filename)
 
 # PDF download for extracted debug blocks and feedback (Lesson 2)
 @bp.route('/lesson2/download_debug_feedback')
 @login_required
 def download_lesson2_debug_feedback():
-    # Get debug blocks and feedback from session
-    extracted_debug_blocks = session.get('lesson2_debug_blocks')
-    uploaded_filename = session.get('uploaded_filename', 'Debug_Feedback')
-    from datetime import datetime
-    import io
-    from reportlab.lib.pagesizes import A4
-    from reportlab.pdfgen import canvas
+    # Get debug blocks and feedback from the stored checker results
+    extracted_debug_blocks = current_debug_blocks(current_user)
+    uploaded_filename = get_result('uploaded_filename') or 'Debug_Feedback'
     if not extracted_debug_blocks:
         flash('No extracted debug blocks found. Please extract debug blocks first.', 'danger')
         return redirect(url_for('main.practice_debug_checker'))
     today = datetime.now().strftime('%Y-%m-%d')
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    y = height - 50
-    p.setFont("Helvetica-Bold", 16)
-    p.drawString(50, y, f"{uploaded_filename}")
-    y -= 30
-    p.setFont("Helvetica", 12)
-    p.drawString(50, y, f"Date: {today}")
-    y -= 30
-    p.setFont("Helvetica-Bold", 14)
-    p.drawString(50, y, "Lesson 2: Debug Checker - Extracted Debug Blocks")
-    y -= 40
-    p.setFont("Helvetica", 12)
-    from reportlab.lib.utils import simpleSplit
-    max_width = width - 100
-    for block in extracted_debug_blocks:
-        if y < 80:
-            p.showPage()
-            y = height - 50
-            p.setFont("Helvetica", 12)
-        block_lines = simpleSplit(block, "Helvetica", 12, max_width)
-        for line in block_lines:
-            p.drawString(50, y, line)
-            y -= 16
-        # Automatic feedback logic
-        feedback = []
-        block_lower = block.lower()
-        if '# debug:' in block_lower and ('test' not in block_lower and 'issue' not in block_lower and 'fix' not in block_lower):
-            feedback.append('Add a test, issue, and fix description to your DEBUG block.')
-        else:
-            missing = []
-            if 'test' not in block_lower:
-                missing.append('TEST')
-            if 'issue' not in block_lower:
-                missing.append('ISSUE')
-            if 'fix' not in block_lower:
-                missing.append('FIX')
-            if not missing:
-                feedback.append('Great! Your DEBUG block is complete.')
-            else:
-                feedback.append(f"Add a {', '.join(missing)} to your DEBUG block for full marks.")
-        p.setFillColorRGB(0.2,0.2,0.7)
-        for fb in feedback:
-            fb_lines = simpleSplit(f"Feedback: {fb}", "Helvetica", 12, max_width - 20)
-            for line in fb_lines:
-                p.drawString(70, y, line)
-                y -= 16
-        p.setFillColorRGB(0,0,0)
-        y -= 10
-    p.save()
-    buffer.seek(0)
-    return send_file(buffer, as_attachment=True, download_name=f"{uploaded_filename}_debug_blocks_{today}.pdf", mimetype="application/pdf")
+    key = cache_key(current_user.id, uploaded_filename, content_hash(extracted_debug_blocks), 'debug_feedback', today)
+    return send_cached_pdf(key, lambda: render_debug_feedback_report(uploaded_filename, today, extracted_debug_blocks), f"{uploaded_filename}_debug_blocks_{today}.pdf")
+
+def _checker_language(filename=None):
+    """Language for the comment checker: an explicit form choice, else the file extension."""
+    language = request.form.get('language')
+    if language in LANGUAGES:
+        return language
+    return language_for_filename(filename)
+
+def _source_too_large(code):
+    """Return an error message if posted code exceeds the checker upload caps."""
+    try:
+        check_source_limits(code or '')
+    except UploadTooLarge as e:
+        return str(e)
+    return None
 
-# Extract debug blocks utility (move to top-level, not nested)
-def extract_debug_blocks(code):
-    """
-    Extracts debug blocks in a flexible way, handling both # DEBUG: and # DEBUG TEST: starters,
-    and sub-lines with or without DEBUG, in any order, case-insensitive.
-    """
-    import re
-    debug_blocks = []
-    lines = code.splitlines()
-    i = 0
-    debug_line_regex = re.compile(r'#\s*DEBUG(\b|\s|:)', re.IGNORECASE)
-    while i < len(lines):
-        line = lines[i].strip()
-        # Start of a debug block: any line starting with # DEBUG (with or without subtype/colon/word)
-        if debug_line_regex.match(line):
-            block = [f"{i+1}: {lines[i].strip()}"]
-            j = i + 1
-            # Collect subsequent lines that also start with # DEBUG (with or without subtype/colon/word)
-            while j < len(lines):
-                subline = lines[j].strip()
-                if debug_line_regex.match(subline):
-                    block.append(f"{j+1}: {lines[j].strip()}")
-                    j += 1
-                else:
-                    break
-            debug_blocks.append('\n'.join(block))
-            i = j
-        else:
-            i += 1
-    return debug_blocks
+def _save_debug_blocks(filename, code, debug_blocks):
+    """Keep extracted DEBUG blocks: as DebugBlockResult rows when signed in, else in the result store."""
+    if current_user.is_authenticated:
+        code_hash = code_hash_for(code)
+        store_debug_blocks(current_user.id, filename or PASTED_FILENAME, code_hash, debug_blocks)
+        db.session.commit()
+        save_results(extracted_debug_blocks=None, debug_code_hash=code_hash, uploaded_filename=filename, uploaded_code=code)
+    else:
+        save_results(extracted_debug_blocks=[block.to_dict() for block in debug_blocks], uploaded_filename=filename, uploaded_code=code)
 
 # Debug Checker Route (Practice)
 @bp.route('/practice/debug_checker', methods=['GET', 'POST'])
@@ -340,14 +224,18 @@ def practice_debug_checker():
     can_extract = False
     username = current_user.username if current_user.is_authenticated else None
     if request.method == 'POST':
-        print(f"[DEBUG] POST received. form: {dict(request.form)}, files: {request.files.keys()}", flush=True)
+        print(f"[DEBUG] POST received. form fields: {list(request.form.keys())}, files: {list(request.files.keys())}", flush=True)
         # Handle file upload only (no extraction yet)
         if 'file' in request.files and request.files['file'].filename:
             file = request.files['file']
             uploaded_filename = file.filename
-            code = file.read().decode('utf-8')
-            # Normalize line endings for uploaded files
-            code = code.replace('\r\n', '\n').replace('\r', '\n')
+            # Stream-decode with size caps; line endings are normalised while reading
+            try:
+                code = read_upload(file.stream)
+            except UploadTooLarge as e:
+                return str(e), 413
+            except UnicodeDecodeError as e:
+                return f"Error reading file: {str(e)}", 400
             from app.models import DebugCheck
             if current_user.is_authenticated and uploaded_filename:
                 if current_user.is_teacher():
@@ -371,16 +259,16 @@ def practice_debug_checker():
         elif 'extract_file' in request.form:
             uploaded_filename = request.form.get('uploaded_filename')
             code = request.form.get('uploaded_code')
+            too_large = _source_too_large(code)
+            if too_large:
+                return too_large, 413
             from app.models import DebugCheck
-            from app import db
             if current_user.is_authenticated and uploaded_filename:
                 if current_user.is_teacher():
                     # Always create a DebugCheck record for teachers on extraction attempt
                     existing = DebugCheck.query.filter_by(user_id=current_user.id, filename=uploaded_filename).first()
                     if not existing:
-                        new_check = DebugCheck(user_id=current_user.id, filename=uploaded_filename)
-                        db.session.add(new_check)
-                        db.session.commit()
+                        record_check(DebugCheck, current_user.id, uploaded_filename)
                     can_extract = True
                     upload_status = f"File '{uploaded_filename}' extracted for user '{username}'."
                 else:
@@ -389,33 +277,29 @@ def practice_debug_checker():
                         already_checked = True
                         upload_status = f"User '{username}' has already uploaded/checked this file in the Debug Checker. Only one upload/check is allowed."
                     else:
-                        new_check = DebugCheck(user_id=current_user.id, filename=uploaded_filename)
-                        db.session.add(new_check)
-                        db.session.commit()
+                        record_check(DebugCheck, current_user.id, uploaded_filename)
                         can_extract = True
                         upload_status = f"File '{uploaded_filename}' extracted and checked for user '{username}'."
             # Extract debug blocks
             if can_extract and code:
-                print("[DEBUG] Code received for extraction (file upload):\n" + code, flush=True)
-                debug_blocks = extract_debug_blocks(code)
-                print(f"[DEBUG] Extracted debug blocks: {debug_blocks}", flush=True)
-                # Store in session for debug checker view
-                session['extracted_debug_blocks'] = debug_blocks
-                # Also persist for lesson 2 view
-                session['lesson2_debug_blocks'] = debug_blocks
-                session['uploaded_filename'] = uploaded_filename
+                print(f"[DEBUG] Code received for extraction (file upload): {len(code)} chars", flush=True)
+                debug_blocks = parse_debug_blocks(code)
+                print(f"[DEBUG] Extracted {len(debug_blocks)} debug block(s)", flush=True)
+                # Store server-side for the debug checker, lesson 2 view and PDFs
+                _save_debug_blocks(uploaded_filename, code, debug_blocks)
                 # Redirect to anchor after extraction
                 return redirect(url_for('main.practice_debug_checker') + '#extracted-debug-blocks')
         # Handle paste/submit as before
         else:
             code = request.form.get('code', '')
+            too_large = _source_too_large(code)
+            if too_large:
+                return too_large, 413
             if code:
-                print("[DEBUG] Code received for extraction (paste box):\n" + code, flush=True)
-                debug_blocks = extract_debug_blocks(code)
-                print(f"[DEBUG] Extracted debug blocks: {debug_blocks}", flush=True)
-                session['extracted_debug_blocks'] = debug_blocks
-                session['lesson2_debug_blocks'] = debug_blocks
-                session['uploaded_filename'] = uploaded_filename
+                print(f"[DEBUG] Code received for extraction (paste box): {len(code)} chars", flush=True)
+                debug_blocks = parse_debug_blocks(code)
+                print(f"[DEBUG] Extracted {len(debug_blocks)} debug block(s)", flush=True)
+                _save_debug_blocks(uploaded_filename, code, debug_blocks)
 
 
     if already_checked:
@@ -430,20 +314,18 @@ def practice_debug_checker():
         comment_lines = []
         feedback_entries = []
         if current_user.is_authenticated and (uploaded_filename or filename):
-            from app.models import CommentFeedback, Lesson
-            template_path = "modules/module3/m3lesson1.html"
-            lesson = Lesson.query.filter_by(template_path=template_path).first()
-            if lesson:
-                lesson_id = lesson.id
+            from app.models import CommentFeedback
+            section_id = comment_checker_section_id()
+            if section_id is not None:
                 file_to_check = uploaded_filename or filename or "unknown"
-                feedback_entries = CommentFeedback.query.filter_by(user_id=current_user.id, lesson_id=lesson_id, filename=file_to_check).order_by(CommentFeedback.line_num).all()
+                feedback_entries = CommentFeedback.query.filter_by(user_id=current_user.id, section_id=section_id, filename=file_to_check).order_by(CommentFeedback.line_num).all()
                 for entry in feedback_entries:
                     comment_lines.append((entry.line_num, entry.comment))
         can_extract = False
 
-    # Only set debug_blocks from session if not just extracted (i.e., not POST with extraction)
-    if request.method != 'POST' and 'extracted_debug_blocks' in session:
-        debug_blocks = session['extracted_debug_blocks']
+    # Only load stored debug_blocks if not just extracted (i.e., not POST with extraction)
+    if request.method != 'POST':
+        debug_blocks = current_debug_blocks(current_user) or debug_blocks
 
     # Add a message if no debug blocks are found after extraction (file or paste)
     debug_message = None
@@ -454,20 +336,7 @@ def practice_debug_checker():
     # Gather checked files for this user (for sidebar grid)
     checked_files_grid = []
     if current_user.is_authenticated:
-        from app.models import CommentCheck, DebugCheck
-        comment_files = {c.filename for c in CommentCheck.query.filter_by(user_id=current_user.id).all()}
-        # For teachers, always show all files they've checked (all DebugCheck records)
-        if current_user.is_teacher():
-            debug_files = {d.filename for d in DebugCheck.query.filter_by(user_id=current_user.id).all()}
-        else:
-            debug_files = {d.filename for d in DebugCheck.query.filter_by(user_id=current_user.id).all()}
-        all_files = sorted(comment_files | debug_files)
-        for fname in all_files:
-            checked_files_grid.append({
-                'filename': fname,
-                'comment': '✔️' if fname in comment_files else '',
-                'debug': '✔️' if fname in debug_files else ''
-            })
+        checked_files_grid = get_checked_files_grid(current_user.id)
 
     return render_template('main/practice_debug_checker.html', code=code, debug_blocks=debug_blocks, already_checked=already_checked, uploaded_filename=uploaded_filename, upload_status=upload_status, can_extract=can_extract, username=username, checked_files_grid=checked_files_grid, debug_message=debug_message)
 
@@ -475,122 +344,51 @@ def practice_debug_checker():
 @bp.route('/download_debug_blocks_pdf', methods=['POST'])
 @login_required
 def download_debug_blocks_pdf():
-    from flask import make_response
     code = request.form.get('code', '')
     if not code:
-        code = session.get('uploaded_code', '')
+        code = get_result('uploaded_code', '')
     uploaded_filename = request.form.get('uploaded_filename', '').strip()
     if not uploaded_filename or uploaded_filename == 'None':
-        uploaded_filename = session.get('uploaded_filename', 'Extracted_DebugBlocks')
-    debug_blocks = session.get('extracted_debug_blocks', [])
+        uploaded_filename = get_result('uploaded_filename') or 'Extracted_DebugBlocks'
+    # Read the stored blocks when this is the version last checked; parse anything else
+    if code.strip() and code_hash_for(code) != get_result('debug_code_hash'):
+        debug_blocks = parse_debug_blocks(code)
+    else:
+        debug_blocks = current_debug_blocks(current_user)
     today_str = datetime.now().strftime('%Y-%m-%d')
     pdf_filename = f"{uploaded_filename}_debug_blocks_{today_str}.pdf"
-    # Generate PDF
-    buffer = io.BytesIO()
-    from reportlab.lib.pagesizes import letter
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.utils import simpleSplit
-    width, height = letter
-    y = height - 40
-    p = canvas.Canvas(buffer, pagesize=letter)
-    p.setFont("Helvetica-Bold", 16)
-    p.drawString(40, y, f"{uploaded_filename}")
-    y -= 28
-    p.setFont("Helvetica", 12)
-    p.drawString(40, y, f"Date: {today_str}")
-    y -= 30
-    p.setFont("Helvetica-Bold", 13)
-    p.drawString(40, y, "Lesson 2: Debug Checker - Extracted Debug Blocks")
-    y -= 28
-    p.setFont("Helvetica", 11)
-    p.drawString(40, y, "Code:")
-    y -= 18
-    p.setFont("Courier", 9)
-    if code.strip():
-        for line in code.splitlines():
-            if y < 60:
-                p.showPage()
-                y = height - 40
-                p.setFont("Courier", 9)
-            p.drawString(50, y, line)
-            y -= 12
-    else:
-        p.drawString(50, y, "(No code provided)")
-        y -= 12
-    y -= 18
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(40, y, "Extracted Debug Blocks and Feedback:")
-    y -= 18
-    p.setFont("Helvetica", 10)
-    if debug_blocks:
-        for block in debug_blocks:
-            if y < 60:
-                p.showPage()
-                y = height - 40
-                p.setFont("Helvetica", 10)
-            block_lines = simpleSplit(block, "Helvetica", 10, width - 100)
-            for line in block_lines:
-                p.drawString(50, y, line)
-                y -= 12
-            # Feedback logic (same as template)
-            block_lower = block.lower()
-            if '# debug:' in block_lower and ('test' not in block_lower and 'issue' not in block_lower and 'fix' not in block_lower):
-                feedback = 'Add a test, issue, and fix description to your DEBUG block.'
-            else:
-                missing = []
-                if 'test' not in block_lower:
-                    missing.append('TEST')
-                if 'issue' not in block_lower:
-                    missing.append('ISSUE')
-                if 'fix' not in block_lower:
-                    missing.append('FIX')
-                if not missing:
-                    feedback = 'Great! Your DEBUG block is complete.'
-                else:
-                    feedback = f"Add a {', '.join(missing)} to your DEBUG block for full marks."
-            p.setFont("Helvetica-Oblique", 9)
-            p.setFillColorRGB(0.2,0.2,0.7)
-            feedback_lines = simpleSplit(f"Feedback: {feedback}", "Helvetica-Oblique", 9, width - 120)
-            for line in feedback_lines:
-                p.drawString(70, y, line)
-                y -= 12
-            p.setFillColorRGB(0,0,0)
-            y -= 10
-    p.save()
-    buffer.seek(0)
-    return send_file(buffer, as_attachment=True, download_name=pdf_filename, mimetype="application/pdf")
+    key = cache_key(current_user.id, uploaded_filename, content_hash(code, debug_blocks), 'debug_blocks', today_str)
+    return send_cached_pdf(key, lambda: render_debug_report(uploaded_filename, today_str, code, debug_blocks), pdf_filename)
 
 # Practice: Code Comments Extractor (copy/paste version)
 @bp.route('/lesson1/download_feedback', methods=['POST'])
 @login_required
 def download_lesson1_feedback():
     from app.models import CommentFeedback
-    from datetime import datetime
-    from reportlab.lib.pagesizes import A4
-    # Dynamically get lesson_id by template_path
-    from app.models import Section
-    template_path = "lessons/lesson3/l3section1.html"
-    section = Section.query.filter_by(template_path=template_path).first()
-    if not section:
+    section_id = comment_checker_section_id()
+    if section_id is None:
         return "Section for comment checker not found.", 404
-    section_id = section.id
     
     # Get filename from form
     filename = request.form.get('uploaded_filename', 'Comment_Feedback')
     
-    # Extract comments from form data
+    # Prefer the shared analysis cache when the checked code is posted back
     extracted_comments = []
-    line_nums = request.form.getlist('line_num')
-    comments = request.form.getlist('comment')
-    feedbacks = request.form.getlist('feedback')
+    code = request.form.get('code', '')
+    if code.strip():
+        extracted_comments = list(get_comment_analysis(code, language=_checker_language(filename)))
     
-    # Build extracted_comments list from form data
-    for line_num, comment, feedback in zip(line_nums, comments, feedbacks):
-        try:
-            line_num = int(line_num)
-            extracted_comments.append((line_num, comment, feedback))
-        except (ValueError, TypeError):
-            pass
+    # Otherwise build extracted_comments list from form data
+    if not extracted_comments:
+        line_nums = request.form.getlist('line_num')
+        comments = request.form.getlist('comment')
+        feedbacks = request.form.getlist('feedback')
+        for line_num, comment, feedback in zip(line_nums, comments, feedbacks):
+            try:
+                line_num = int(line_num)
+                extracted_comments.append((line_num, comment, feedback))
+            except (ValueError, TypeError):
+                pass
     
     # If no form data, fall back to database
     if not extracted_comments:
@@ -607,47 +405,12 @@ def download_lesson1_feedback():
 
     today = datetime.now().strftime('%Y-%m-%d')
 
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-    y = height - 50
-    p.setFont("Helvetica-Bold", 16)
-    p.drawString(50, y, f"{filename}")
-    y -= 30
-    p.setFont("Helvetica", 12)
-    p.drawString(50, y, f"Date: {today}")
-    y -= 30
-    p.setFont("Helvetica-Bold", 14)
-    p.drawString(50, y, "Lesson 1: Comment Checker - Feedback")
-    y -= 40
-    p.setFont("Helvetica", 12)
-    from reportlab.lib.utils import simpleSplit
-    max_width = width - 100
-    for line_num, comment, feedback in extracted_comments:
-        if y < 80:
-            p.showPage()
-            y = height - 50
-            p.setFont("Helvetica", 12)
-        # Word-wrap comment
-        comment_lines = simpleSplit(f"Line {line_num}: {comment}", "Helvetica", 12, max_width)
-        for line in comment_lines:
-            p.drawString(50, y, line)
-            y -= 16
-        # Word-wrap feedback
-        p.setFillColorRGB(0.2,0.2,0.7)
-        feedback_lines = simpleSplit(f"Feedback: {feedback}", "Helvetica", 12, max_width - 20)
-        for line in feedback_lines:
-            p.drawString(70, y, line)
-            y -= 16
-        p.setFillColorRGB(0,0,0)
-        y -= 10
-    p.save()
-    buffer.seek(0)
-    return send_file(buffer, as_attachment=True, download_name=f"{filename}_feedback_{today}.pdf", mimetype="application/pdf")
+    key = cache_key(current_user.id, filename, content_hash(extracted_comments), 'comment_feedback', today)
+    return send_cached_pdf(key, lambda: render_comment_feedback_report(filename, today, extracted_comments), f"{filename}_feedback_{today}.pdf")
 @bp.route('/practice/code-comments', methods=['GET', 'POST'])
 def practice_code_comments():
     from flask import flash
-    from app.models import CommentCheck, DebugCheck
+    from app.models import CommentCheck
     code = None
     comment_lines = []
     already_checked = False
@@ -662,13 +425,17 @@ def practice_code_comments():
     checked_files_grid = []
     is_teacher = False
     feedback_dict = {}
+    language = None
+    recheck = None
     if request.method == 'POST':
         # Handle file upload only (no extraction yet)
         if 'file' in request.files and request.files['file'].filename:
             file = request.files['file']
             uploaded_filename = file.filename
             try:
-                code = file.read().decode('utf-8')
+                code = read_upload(file.stream)
+            except UploadTooLarge as e:
+                return str(e), 413
             except (UnicodeDecodeError, AttributeError) as e:
                 return f"Error reading file: {str(e)}", 400
             if current_user.is_authenticated and uploaded_filename:
@@ -680,18 +447,12 @@ def practice_code_comments():
                         already_checked = True
                         upload_status = f"User '{username}' has already uploaded/checked this file. Only one upload/check is allowed."
                     else:
-                        from app import db
-                        new_check = CommentCheck(user_id=current_user.id, filename=uploaded_filename)
-                        db.session.add(new_check)
-                        db.session.commit()
+                        record_check(CommentCheck, current_user.id, uploaded_filename)
                         can_extract = True
                         upload_status = f"File '{uploaded_filename}' uploaded by user '{username}'. Ready to extract."
                 else:
                     # Teachers can always check/upload
-                    from app import db
-                    new_check = CommentCheck(user_id=current_user.id, filename=uploaded_filename)
-                    db.session.add(new_check)
-                    db.session.commit()
+                    record_check(CommentCheck, current_user.id, uploaded_filename)
                     can_extract = True
                     upload_status = f"File '{uploaded_filename}' uploaded by user '{username}'. Ready to extract."
             else:
@@ -702,22 +463,16 @@ def practice_code_comments():
             checked_files_grid = []
             is_teacher = False
             if current_user.is_authenticated:
-                from app.models import CommentCheck as CommentCheckModel, DebugCheck
                 is_teacher = hasattr(current_user, 'is_teacher') and current_user.is_teacher()
-                comment_files = {c.filename for c in CommentCheckModel.query.filter_by(user_id=current_user.id).all()}
-                debug_files = {d.filename for d in DebugCheck.query.filter_by(user_id=current_user.id).all()}
-                all_files = sorted(comment_files | debug_files)
-                for fname in all_files:
-                    checked_files_grid.append({
-                        'filename': fname,
-                        'comment': '✔️' if fname in comment_files else '',
-                        'debug': '✔️' if fname in debug_files else ''
-                    })
+                checked_files_grid = get_checked_files_grid(current_user.id)
             return render_template('main/practice_code_comments.html', code=code, comment_lines=[], already_checked=already_checked, uploaded_filename=uploaded_filename, upload_status=upload_status, can_extract=can_extract, username=username, checked_files_grid=checked_files_grid, is_teacher=is_teacher, feedback_dict={})
         # Handle extraction after upload
         elif 'extract_file' in request.form:
             uploaded_filename = request.form.get('uploaded_filename')
             code = request.form.get('uploaded_code')
+            too_large = _source_too_large(code)
+            if too_large:
+                return too_large, 413
             if current_user.is_authenticated and uploaded_filename:
                 is_teacher = hasattr(current_user, 'is_teacher') and current_user.is_teacher()
                 if not is_teacher:
@@ -726,110 +481,62 @@ def practice_code_comments():
                         already_checked = True
                         upload_status = f"User '{username}' has already uploaded/checked this file. Only one upload/check is allowed."
                     else:
-                        from app import db
-                        new_check = CommentCheck(user_id=current_user.id, filename=uploaded_filename)
-                        db.session.add(new_check)
-                        db.session.commit()
+                        record_check(CommentCheck, current_user.id, uploaded_filename)
                         can_extract = True
                         upload_status = f"File '{uploaded_filename}' extracted and checked for user '{username}'."
                 else:
-                    from app import db
-                    new_check = CommentCheck(user_id=current_user.id, filename=uploaded_filename)
-                    db.session.add(new_check)
-                    db.session.commit()
+                    record_check(CommentCheck, current_user.id, uploaded_filename)
                 can_extract = True
                 upload_status = f"File '{uploaded_filename}' extracted for user '{username}'."
             # Extract all comments (lines starting with # or inline after code)
             if can_extract and code:
                 from app import db
-                from app.models import CommentFeedback, Section
-                # Use the first Section with a template_path for the comment checker (or make this configurable)
-                template_path = "lessons/lesson3/l3section1.html"
-                section = Section.query.filter_by(template_path=template_path).first()
-                if not section:
+                from app.models import CommentFeedback
+                # Section configured by COMMENT_CHECKER_SECTION_TEMPLATE
+                section_id = comment_checker_section_id()
+                if section_id is None:
                     return "Section for comment checker not found.", 404
-                section_id = section.id
                 save_filename = uploaded_filename or filename or "unknown"
                 extracted_comments_for_session.clear()
-                # Compute code hash for deduplication
-                code_hash = hashlib.sha256(code.encode('utf-8')).hexdigest()
-                for idx, line in enumerate(code.splitlines(), start=1):
-                    if '#' in line:
-                        comment_index = line.find('#')
-                        comment = line[comment_index:].strip()
-                        if comment:
-                            # Feedback logic
-                            if 'http' in comment or 'www.' in comment:
-                                feedback = "This comment appears to be a pasted URL. Comments should explain your code, not just link to resources."
-                            elif 'print(' in comment:
-                                feedback = "This comment is just a commented-out line of code. Good comments should explain why the code is there or what it does, not just repeat the code."
-                            elif len(comment) < 15:
-                                feedback = "This comment is too short or vague. Try to be more descriptive and explain the purpose of the code."
-                            else:
-                                feedback = "This comment is clear and descriptive. Well done!"
-                            comment_lines.append((idx, comment))
-                            extracted_comments_for_session.append((idx, comment, feedback))
-                            extracted_feedback_for_session.append((idx, feedback))
-                            # Save to DB
-                            if current_user.is_authenticated:
-                                exists = CommentFeedback.query.filter_by(user_id=current_user.id, section_id=section_id, filename=save_filename, line_num=idx).first()
-                                if not exists:
-                                    db.session.add(CommentFeedback(
-                                        user_id=current_user.id,
-                                        section_id=section_id,
-                                        filename=save_filename,
-                                        line_num=idx,
-                                        comment=comment,
-                                        feedback=feedback,
-                                        code_hash=code_hash
-                                    ))
+                # Compute code hash for deduplication and the analysis cache
+                code_hash = code_hash_for(code)
+                language = _checker_language(uploaded_filename)
+                if current_user.is_authenticated:
+                    # Re-uploads of a revised file only rewrite the lines that changed
+                    feedback_rows, recheck = recheck_comment_feedback(current_user.id, section_id, save_filename, code, code_hash, language)
+                else:
+                    feedback_rows = get_comment_analysis(code, code_hash, language)
+                for idx, comment, feedback in feedback_rows:
+                    comment_lines.append((idx, comment))
+                    extracted_comments_for_session.append((idx, comment, feedback))
+                    extracted_feedback_for_session.append((idx, feedback))
                 db.session.commit()
+                save_results(extracted_comments=extracted_comments_for_session)
                 # Always fetch feedback for this file from DB for display
                 feedback_entries = CommentFeedback.query.filter_by(user_id=current_user.id, section_id=section_id, filename=save_filename).order_by(CommentFeedback.line_num).all()
                 # Instead of redirecting, just show results on this page
         # Handle paste/submit as before
         else:
             code = request.form.get('code', '')
+            too_large = _source_too_large(code)
+            if too_large:
+                return too_large, 413
             # Extract all comments (lines starting with # or inline after code)
             if code:
                 from app import db
-                from app.models import CommentFeedback, Section
-                template_path = "lessons/lesson3/l3section1.html"
-                section = Section.query.filter_by(template_path=template_path).first()
-                if not section:
+                from app.models import CommentFeedback
+                section_id = comment_checker_section_id()
+                if section_id is None:
                     return "Section for comment checker not found.", 404
-                section_id = section.id
                 save_filename = filename or "unknown"
-                # Compute code hash for deduplication
-                code_hash = hashlib.sha256(code.encode('utf-8')).hexdigest()
-                for idx, line in enumerate(code.splitlines(), start=1):
-                    if '#' in line:
-                        comment_index = line.find('#')
-                        comment = line[comment_index:].strip()
-                        if comment:
-                            # Feedback logic
-                            if 'http' in comment or 'www.' in comment:
-                                feedback = "This comment appears to be a pasted URL. Comments should explain your code, not just link to resources."
-                            elif 'print(' in comment:
-                                feedback = "This comment is just a commented-out line of code. Good comments should explain why the code is there or what it does, not just repeat the code."
-                            elif len(comment) < 15:
-                                feedback = "This comment is too short or vague. Try to be more descriptive and explain the purpose of the code."
-                            else:
-                                feedback = "This comment is clear and descriptive. Well done!"
-                            comment_lines.append((idx, comment))
-                            # Save to DB
-                            if current_user.is_authenticated:
-                                exists = CommentFeedback.query.filter_by(user_id=current_user.id, section_id=section_id, filename=save_filename, line_num=idx).first()
-                                if not exists:
-                                    db.session.add(CommentFeedback(
-                                        user_id=current_user.id,
-                                        section_id=section_id,
-                                        filename=save_filename,
-                                        line_num=idx,
-                                        comment=comment,
-                                        feedback=feedback,
-                                        code_hash=code_hash
-                                    ))
+                # Compute code hash for deduplication and the analysis cache
+                code_hash = code_hash_for(code)
+                language = _checker_language(filename)
+                if current_user.is_authenticated:
+                    feedback_rows, recheck = recheck_comment_feedback(current_user.id, section_id, save_filename, code, code_hash, language)
+                else:
+                    feedback_rows = get_comment_analysis(code, code_hash, language)
+                comment_lines = [(idx, comment) for idx, comment, _ in feedback_rows]
                 db.session.commit()
                 # Always fetch feedback for this file from DB for display
                 feedback_entries = CommentFeedback.query.filter_by(user_id=current_user.id, section_id=section_id, filename=save_filename).order_by(CommentFeedback.line_num).all()
@@ -842,44 +549,27 @@ def practice_code_comments():
                         already_checked = True
                         upload_status = f"User '{username}' has already checked this file. Only one check is allowed."
                     else:
-                        from app import db
-                        new_check = CommentCheck(user_id=current_user.id, filename=filename)
-                        db.session.add(new_check)
-                        db.session.commit()
+                        record_check(CommentCheck, current_user.id, filename)
                 else:
-                    from app import db
-                    new_check = CommentCheck(user_id=current_user.id, filename=filename)
-                    db.session.add(new_check)
-                    db.session.commit()
+                    record_check(CommentCheck, current_user.id, filename)
             # If user clicked Extract Comments, show results on this page
             if 'extract_file' in request.form and not already_checked:
                 extracted_comments_for_session = []
                 for idx, comment in comment_lines:
-                    feedback = ""
-                    if 'http' in comment or 'www.' in comment:
-                        feedback = "This comment appears to be a pasted URL. Comments should explain your code, not just link to resources."
-                    elif 'print(' in comment:
-                        feedback = "This comment is just a commented-out line of code. Good comments should explain why the code is there or what it does, not just repeat the code."
-                    elif len(comment) < 15:
-                        feedback = "This comment is too short or vague. Try to be more descriptive and explain the purpose of the code."
-                    else:
-                        feedback = "This comment is clear and descriptive. Well done!"
-                    extracted_comments_for_session.append((idx, comment, feedback))
-                session['extracted_comments'] = extracted_comments_for_session
+                    extracted_comments_for_session.append((idx, comment, feedback_for_comment(comment)))
+                save_results(extracted_comments=extracted_comments_for_session)
                 # Build feedback dict for template
                 feedback_dict = {idx: feedback for idx, _, feedback in extracted_comments_for_session}
-                return render_template('main/practice_code_comments.html', code=code, comment_lines=comment_lines, already_checked=already_checked, uploaded_filename=uploaded_filename, upload_status=upload_status, can_extract=can_extract, username=username, checked_files_grid=checked_files_grid, is_teacher=is_teacher, feedback_dict=feedback_dict)
+                return render_template('main/practice_code_comments.html', code=code, comment_lines=comment_lines, already_checked=already_checked, uploaded_filename=uploaded_filename, upload_status=upload_status, can_extract=can_extract, username=username, checked_files_grid=checked_files_grid, is_teacher=is_teacher, feedback_dict=feedback_dict, language=language, recheck=recheck)
     # If already checked, fetch comments and feedback from DB for display
     if already_checked:
         # Don't clear code/comments; fetch from DB
         comment_lines = []
         feedback_entries = []
         if current_user.is_authenticated and (uploaded_filename or filename):
-            from app.models import CommentFeedback, Section
-            template_path = "lessons/lesson3/l3section1.html"
-            section = Section.query.filter_by(template_path=template_path).first()
-            if section:
-                section_id = section.id
+            from app.models import CommentFeedback
+            section_id = comment_checker_section_id()
+            if section_id is not None:
                 file_to_check = uploaded_filename or filename or "unknown"
                 feedback_entries = CommentFeedback.query.filter_by(user_id=current_user.id, section_id=section_id, filename=file_to_check).order_by(CommentFeedback.line_num).all()
                 for entry in feedback_entries:
@@ -889,30 +579,19 @@ def practice_code_comments():
     # Populate checked files grid and teacher status if not already set
     if not checked_files_grid:
         if current_user.is_authenticated:
-            from app.models import CommentCheck, DebugCheck
             is_teacher = hasattr(current_user, 'is_teacher') and current_user.is_teacher()
             # Show both comment and debug checked files for both teachers and students
-            comment_files = {c.filename for c in CommentCheck.query.filter_by(user_id=current_user.id).all()}
-            debug_files = {d.filename for d in DebugCheck.query.filter_by(user_id=current_user.id).all()}
-            all_files = sorted(comment_files | debug_files)
-            for fname in all_files:
-                checked_files_grid.append({
-                    'filename': fname,
-                    'comment': '✔️' if fname in comment_files else '',
-                    'debug': '✔️' if fname in debug_files else ''
-                })
+            checked_files_grid = get_checked_files_grid(current_user.id)
     # Always fetch feedback for the current file for display
     if current_user.is_authenticated and (uploaded_filename or filename):
-        from app.models import CommentFeedback, Section
-        template_path = "lessons/lesson3/l3section1.html"
-        section = Section.query.filter_by(template_path=template_path).first()
-        if section:
-            section_id = section.id
+        from app.models import CommentFeedback
+        section_id = comment_checker_section_id()
+        if section_id is not None:
             file_to_check = uploaded_filename or filename or "unknown"
             feedback_entries = CommentFeedback.query.filter_by(user_id=current_user.id, section_id=section_id, filename=file_to_check).order_by(CommentFeedback.line_num).all()
     # Build a feedback dict for template: line_num -> feedback
     feedback_dict = {entry.line_num: entry.feedback for entry in feedback_entries} if feedback_entries else {}
-    return render_template('main/practice_code_comments.html', code=code, comment_lines=comment_lines, already_checked=already_checked, uploaded_filename=uploaded_filename, upload_status=upload_status, can_extract=can_extract, username=username, checked_files_grid=checked_files_grid, is_teacher=is_teacher, feedback_dict=feedback_dict)
+    return render_template('main/practice_code_comments.html', code=code, comment_lines=comment_lines, already_checked=already_checked, uploaded_filename=uploaded_filename, upload_status=upload_status, can_extract=can_extract, username=username, checked_files_grid=checked_files_grid, is_teacher=is_teacher, feedback_dict=feedback_dict, language=language, recheck=recheck)
 
 @bp.route('/')
 def index():
@@ -935,42 +614,22 @@ def dashboard():
         pending_assignments = []
         if preview_user:
             enrollments = Enrollment.query.filter_by(student_id=preview_user.id).all()
-            # Get pending assignments for preview user
-            for enrollment in enrollments:
-                assignments = Assignment.query.filter_by(course_id=enrollment.course_id).all()
-                for assignment in assignments:
-                    submission = Submission.query.filter_by(
-                        assignment_id=assignment.id,
-                        student_id=preview_user.id
-                    ).first()
-                    if not submission:
-                        pending_assignments.append(assignment)
+            pending_assignments = pending_assignments_for(preview_user.id)
 
         return render_template('dashboard/teacher.html',
             courses=courses,
             total_students=total_students,
             preview_enrollments=enrollments,
-            preview_pending_assignments=pending_assignments[:5],
+            preview_pending_assignments=pending_assignments,
             preview_user=preview_user
         )
     else:
         # Student dashboard
         enrollments = Enrollment.query.filter_by(student_id=current_user.id).all()
-        # Get pending assignments
-        pending_assignments = []
-        for enrollment in enrollments:
-            assignments = Assignment.query.filter_by(course_id=enrollment.course_id).all()
-            for assignment in assignments:
-                submission = Submission.query.filter_by(
-                    assignment_id=assignment.id, 
-                    student_id=current_user.id
-                ).first()
-                if not submission:
-                    pending_assignments.append(assignment)
         return render_template('dashboard/student_dashboard_page.html',
             preview_user=current_user,
             preview_enrollments=enrollments,
-            preview_pending_assignments=pending_assignments[:5]
+            preview_pending_assignments=pending_assignments_for(current_user.id)
         )
 
 # Standalone student dashboard route for macro-based rendering
@@ -978,20 +637,10 @@ def dashboard():
 @login_required
 def student_dashboard():
     enrollments = Enrollment.query.filter_by(student_id=current_user.id).all()
-    pending_assignments = []
-    for enrollment in enrollments:
-        assignments = Assignment.query.filter_by(course_id=enrollment.course_id).all()
-        for assignment in assignments:
-            submission = Submission.query.filter_by(
-                assignment_id=assignment.id, 
-                student_id=current_user.id
-            ).first()
-            if not submission:
-                pending_assignments.append(assignment)
     return render_template('dashboard/student_dashboard_page.html',
         preview_user=current_user,
         preview_enrollments=enrollments,
-        preview_pending_assignments=pending_assignments[:5]
+        preview_pending_assignments=pending_assignments_for(current_user.id)
     )
 
 from flask import redirect, url_for
@@ -1195,129 +844,7 @@ def student_progress():
         flash('Students only feature.', 'warning')
         return redirect(url_for('main.dashboard'))
     
-    # Get all enrolled courses
-    enrollments = Enrollment.query.filter_by(student_id=current_user.id).all()
-    
-    progress_data = []
-    total_lessons = 0
-    total_completed = 0
-    total_assignments = 0
-    total_submitted = 0
-    total_quizzes = 0
-    total_quiz_attempts = 0
-    
-    for enrollment in enrollments:
-        course = enrollment.course
-        
-        # Count lessons
-        lessons = Lesson.query.filter_by(course_id=course.id).all()
-        lesson_count = len(lessons)
-        total_lessons += lesson_count
-        
-        # Count completed lessons (has submission or quiz attempt)
-        completed_lessons = 0
-        for lesson in lessons:
-            has_submission = Submission.query.filter(
-                Submission.user_id == current_user.id,
-                Submission.assignment_id.in_(
-                    db.session.query(Assignment.id).filter_by(lesson_id=lesson.id)
-                )
-            ).first()
-            
-            has_quiz = QuizAttempt.query.filter(
-                QuizAttempt.user_id == current_user.id,
-                QuizAttempt.quiz_id.in_(
-                    db.session.query(Quiz.id).filter_by(lesson_id=lesson.id)
-                )
-            ).first()
-            
-            if has_submission or has_quiz:
-                completed_lessons += 1
-        
-        total_completed += completed_lessons
-        
-        # Count assignments and submissions
-        assignments = Assignment.query.filter(
-            Assignment.lesson_id.in_(db.session.query(Lesson.id).filter_by(course_id=course.id))
-        ).all()
-        assignment_count = len(assignments)
-        total_assignments += assignment_count
-        
-        submitted_count = Submission.query.filter(
-            Submission.user_id == current_user.id,
-            Submission.assignment_id.in_(
-                db.session.query(Assignment.id).filter(
-                    Assignment.lesson_id.in_(db.session.query(Lesson.id).filter_by(course_id=course.id))
-                )
-            )
-        ).count()
-        total_submitted += submitted_count
-        
-        # Count quizzes and attempts
-        quizzes = Quiz.query.filter(
-            Quiz.lesson_id.in_(db.session.query(Lesson.id).filter_by(course_id=course.id))
-        ).all()
-        quiz_count = len(quizzes)
-        total_quizzes += quiz_count
-        
-        quiz_attempts = QuizAttempt.query.filter(
-            QuizAttempt.user_id == current_user.id,
-            QuizAttempt.quiz_id.in_(
-                db.session.query(Quiz.id).filter(
-                    Quiz.lesson_id.in_(db.session.query(Lesson.id).filter_by(course_id=course.id))
-                )
-            )
-        ).count()
-        total_quiz_attempts += quiz_attempts
-        
-        # Calculate percentages
-        lesson_progress = (completed_lessons / lesson_count * 100) if lesson_count > 0 else 0
-        assignment_progress = (submitted_count / assignment_count * 100) if assignment_count > 0 else 0
-        quiz_progress = (quiz_attempts / quiz_count * 100) if quiz_count > 0 else 0
-        
-        # Overall course progress
-        total_items = lesson_count + assignment_count + quiz_count
-        completed_items = completed_lessons + submitted_count + quiz_attempts
-        overall_progress = (completed_items / total_items * 100) if total_items > 0 else 0
-        
-        progress_data.append({
-            'course': course,
-            'lessons': {
-                'total': lesson_count,
-                'completed': completed_lessons,
-                'progress': round(lesson_progress, 1)
-            },
-            'assignments': {
-                'total': assignment_count,
-                'submitted': submitted_count,
-                'progress': round(assignment_progress, 1)
-            },
-            'quizzes': {
-                'total': quiz_count,
-                'attempts': quiz_attempts,
-                'progress': round(quiz_progress, 1)
-            },
-            'overall_progress': round(overall_progress, 1)
-        })
-    
-    # Calculate overall statistics
-    overall_stats = {
-        'lessons': {
-            'total': total_lessons,
-            'completed': total_completed,
-            'progress': (total_completed / total_lessons * 100) if total_lessons > 0 else 0
-        },
-        'assignments': {
-            'total': total_assignments,
-            'submitted': total_submitted,
-            'progress': (total_submitted / total_assignments * 100) if total_assignments > 0 else 0
-        },
-        'quizzes': {
-            'total': total_quizzes,
-            'attempts': total_quiz_attempts,
-            'progress': (total_quiz_attempts / total_quizzes * 100) if total_quizzes > 0 else 0
-        }
-    }
+    progress_data, overall_stats = progress_report(current_user.id)
     
     return render_template('dashboard/student_progress.html', 
                          progress_data=progress_data,
@@ -3,6 +3,7 @@ from flask_login import login_required, current_user
 from app import db
 from app.models import Quiz, QuizQuestion, QuizAttempt, Course
 from app.forms import QuizForm, QuizQuestionForm
+from app.services.course_progress import bump_course_progress
 import json
 from datetime import datetime
 
@@ -155,6 +156,8 @@ def take_quiz(quiz_id):
             answers=json.dumps(answers)
         )
         db.session.add(attempt)
+        if attempts_count == 0:
+            bump_course_progress(current_user.id, quiz.course_id, quizzes=1)
         db.session.commit()
         
         flash(f'Quiz submitted! Your score: {attempt.score}%', 'success')
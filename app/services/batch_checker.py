@@ -0,0 +1,248 @@
+"""
+Class-wide batch checking for the comment and debug checkers.
+
+A teacher hands over a zip (or, from the CLI, a directory) of student .py
+files. Comment and DEBUG block analysis is CPU-bound and independent per
+file, so `flask batch-check` fans it out across a process pool. The web
+route runs it inline, since the eventlet worker must not fork. Only the
+parent process touches the database: cached comment analyses are read up
+front with one query, and CommentCheck, DebugCheck, CommentFeedback and
+DebugBlockResult rows are written in bulk at the end.
+"""
+import os
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app, has_app_context
+from sqlalchemy import insert
+from app import db
+from app.models import CommentCheck, DebugCheck, DebugBlockResult
+from app.services.bulk import insert_ignoring_conflicts
+from app.services.checker_summary import invalidate_checked_files
+from app.services.comment_feedback import sync_comment_feedback_batch
+from app.services.comment_analysis import code_hash_for, get_cached_analyses, store_analyses
+from app.services.comment_extractor import iter_comments
+from app.services.comment_rules import get_ruleset
+from app.services.upload_reader import count_lines, read_upload, UploadTooLarge
+from app.services.debug_blocks import parse_debug_blocks, REQUIRED_DEBUG_BLOCKS
+from app.services.debug_block_results import debug_block_rows, CONFLICT_COLUMNS as DEBUG_BLOCK_CONFLICT_COLUMNS
+
+MAX_BATCH_FILES = 500
+DEFAULT_MAX_TOTAL_BYTES = 32 * 1024 * 1024
+
+_worker_ruleset = None
+
+
+class BatchInputError(ValueError):
+    """Raised when an uploaded batch cannot be read."""
+
+
+def read_source(stream, name):
+    """Decode one student file leniently, applying the checker upload caps."""
+    try:
+        return read_upload(stream, errors='replace')
+    except UploadTooLarge as e:
+        raise BatchInputError(f"{name}: {e}")
+
+
+def _check_count(count):
+    if count > MAX_BATCH_FILES:
+        raise BatchInputError(f"Too many files: at most {MAX_BATCH_FILES} .py files per batch.")
+
+
+def max_total_bytes():
+    """Cap on the decompressed size of all files in one batch."""
+    if has_app_context():
+        return current_app.config.get('BATCH_MAX_TOTAL_BYTES', DEFAULT_MAX_TOTAL_BYTES)
+    return DEFAULT_MAX_TOTAL_BYTES
+
+
+def _too_large(limit):
+    return BatchInputError(f"Batch is too large: at most {limit // 1024} KB of source once unzipped.")
+
+
+class _BudgetedReader:
+    """Binary stream wrapper that stops reading once the batch's byte budget is spent."""
+
+    def __init__(self, stream, budget):
+        self._stream = stream
+        self._budget = budget
+
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        self._budget['used'] += len(data)
+        if self._budget['used'] > self._budget['limit']:
+            raise _too_large(self._budget['limit'])
+        return data
+
+
+def read_zip(fileobj, max_bytes=None):
+    """
+    Return [(filename, code)] for every .py file in a zip archive.
+
+    The decompressed .py members may total at most `max_bytes` (default
+    BATCH_MAX_TOTAL_BYTES). The sizes declared in the archive are checked
+    before anything is decompressed, and the bytes actually read are counted
+    against the same budget as they are decoded.
+    """
+    limit = max_total_bytes() if max_bytes is None else max_bytes
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise BatchInputError("The uploaded file is not a valid zip archive.")
+    files = []
+    with archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and info.filename.lower().endswith('.py') and not info.filename.startswith('__MACOSX/')
+        ]
+        _check_count(len(members))
+        if sum(info.file_size for info in members) > limit:
+            raise _too_large(limit)
+        budget = {'used': 0, 'limit': limit}
+        try:
+            for info in members:
+                with archive.open(info) as member:
+                    files.append((info.filename[:255], read_source(_BudgetedReader(member, budget), info.filename)))
+        except (zipfile.BadZipFile, zlib.error) as e:
+            raise BatchInputError(f"The zip archive is corrupt: {e}")
+    return files
+
+
+def read_directory(path):
+    """Return [(relative filename, code)] for every .py file under `path`."""
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(('.', '__pycache__')))
+        for name in sorted(names):
+            if not name.lower().endswith('.py'):
+                continue
+            _check_count(len(files) + 1)
+            full_path = os.path.join(root, name)
+            relative = os.path.relpath(full_path, path).replace(os.sep, '/')
+            with open(full_path, 'rb') as f:
+                files.append((relative[:255], read_source(f, relative)))
+    return files
+
+
+def read_batch_path(path):
+    """Read a batch from a directory or a .zip file on disk."""
+    if os.path.isdir(path):
+        return read_directory(path)
+    with open(path, 'rb') as f:
+        return read_zip(f)
+
+
+def _init_worker(ruleset):
+    global _worker_ruleset
+    _worker_ruleset = ruleset
+
+
+def _analyze_file(item):
+    """Process pool task: analyse one file without touching the database."""
+    filename, code, need_comments = item
+    comments = None
+    if need_comments:
+        comments = [(r.line, r.comment, _worker_ruleset.feedback(r.comment)) for r in iter_comments(code)]
+    return filename, comments, parse_debug_blocks(code)
+
+
+def _default_workers():
+    return current_app.config.get('BATCH_CHECK_WORKERS', min(4, os.cpu_count() or 1))
+
+
+def _save(user_id, section_id, file_results, parsed_blocks):
+    filenames = [r['filename'] for r in file_results]
+    existing_comment = {f for (f,) in db.session.query(CommentCheck.filename).filter(
+        CommentCheck.user_id == user_id, CommentCheck.filename.in_(filenames))}
+    existing_debug = {f for (f,) in db.session.query(DebugCheck.filename).filter(
+        DebugCheck.user_id == user_id, DebugCheck.filename.in_(filenames))}
+    comment_checks = [{'user_id': user_id, 'filename': f} for f in filenames if f not in existing_comment]
+    debug_checks = [{'user_id': user_id, 'filename': f} for f in filenames if f not in existing_debug]
+    if comment_checks:
+        db.session.execute(insert(CommentCheck), comment_checks)
+    if debug_checks:
+        db.session.execute(insert(DebugCheck), debug_checks)
+    if section_id is not None:
+        # Same insert/update/delete rules as the web checker, so re-checked files drop stale feedback
+        sync_comment_feedback_batch(user_id, section_id, {
+            r['filename']: (r['code_hash'], r['comment_details']) for r in file_results
+        })
+    block_rows = [
+        row
+        for r in file_results
+        for row in debug_block_rows(user_id, r['filename'], r['code_hash'], parsed_blocks[r['filename']])
+    ]
+    insert_ignoring_conflicts(DebugBlockResult, block_rows, DEBUG_BLOCK_CONFLICT_COLUMNS)
+    db.session.commit()
+    invalidate_checked_files(user_id)
+
+
+def run_batch(files, user_id=None, section_id=None, workers=None, save=True):
+    """
+    Check every (filename, code) pair and return a combined class report.
+
+    When `save` is true the checks are recorded for `user_id`; comment
+    feedback is only stored when a `section_id` is given.
+    """
+    started = time.perf_counter()
+    ruleset = get_ruleset()
+    workers = _default_workers() if workers is None else workers
+    hashes = {filename: code_hash_for(code) for filename, code in files}
+    cached = get_cached_analyses(hashes.values())
+    items = [(filename, code, hashes[filename] not in cached) for filename, code in files]
+
+    if workers > 1 and len(items) > 1:
+        chunksize = max(1, len(items) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ruleset,)) as pool:
+            analysed = list(pool.map(_analyze_file, items, chunksize=chunksize))
+    else:
+        _init_worker(ruleset)
+        analysed = [_analyze_file(item) for item in items]
+
+    fresh = {}
+    file_results = []
+    parsed_blocks = {}
+    line_counts = {filename: count_lines(code) for filename, code in files}
+    for filename, comments, debug_blocks in analysed:
+        code_hash = hashes[filename]
+        if comments is None:
+            comments = cached[code_hash]
+        else:
+            fresh[code_hash] = comments
+        good = sum(1 for _, _, feedback in comments if feedback == ruleset.default_message)
+        parsed_blocks[filename] = debug_blocks
+        complete = sum(1 for block in debug_blocks if block.complete)
+        file_results.append({
+            'filename': filename,
+            'code_hash': code_hash,
+            'lines': line_counts[filename],
+            'comments': len(comments),
+            'good_comments': good,
+            'comments_needing_work': len(comments) - good,
+            'debug_blocks': len(debug_blocks),
+            'complete_debug_blocks': complete,
+            'meets_debug_requirement': complete >= REQUIRED_DEBUG_BLOCKS,
+            'comment_details': comments,
+            'debug_details': [(block.text, block.feedback) for block in debug_blocks],
+        })
+    store_analyses(fresh)
+    if save and user_id is not None:
+        _save(user_id, section_id, file_results, parsed_blocks)
+
+    file_results.sort(key=lambda r: r['filename'].lower())
+    return {
+        'files': file_results,
+        'totals': {
+            'files': len(file_results),
+            'comments': sum(r['comments'] for r in file_results),
+            'good_comments': sum(r['good_comments'] for r in file_results),
+            'debug_blocks': sum(r['debug_blocks'] for r in file_results),
+            'complete_debug_blocks': sum(r['complete_debug_blocks'] for r in file_results),
+            'meeting_debug_requirement': sum(1 for r in file_results if r['meets_debug_requirement']),
+        },
+        'cache_hits': sum(1 for item in items if not item[2]),
+        'workers': workers,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
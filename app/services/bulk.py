@@ -0,0 +1,38 @@
+"""Dialect-aware bulk INSERT helpers."""
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app import db
+
+# Rows per INSERT statement. Keeps bind parameters well under the
+# PostgreSQL (65535) and SQLite (32766) limits for very large batches.
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+def insert_ignoring_conflicts(model, rows, conflict_columns):
+    """
+    Insert `rows` (a list of column dicts) into `model`'s table with
+    INSERT ... ON CONFLICT DO NOTHING on `conflict_columns`, one multi-row
+    statement per chunk. Returns the number of statements executed. The
+    caller is responsible for committing the session.
+    """
+    if not rows:
+        return 0
+    dialect_name = db.session.get_bind().dialect.name
+    if dialect_name == 'postgresql':
+        stmt = postgresql.insert(model).on_conflict_do_nothing(index_elements=conflict_columns)
+    elif dialect_name == 'sqlite':
+        stmt = sqlite.insert(model).on_conflict_do_nothing(index_elements=conflict_columns)
+    else:
+        # No ON CONFLICT support: insert row by row inside savepoints
+        for row in rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(model.__table__.insert(), [row])
+            except IntegrityError:
+                pass
+        return len(rows)
+    statements = 0
+    for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+        db.session.execute(stmt.values(rows[start:start + BULK_INSERT_CHUNK_SIZE]))
+        statements += 1
+    return statements
@@ -0,0 +1,66 @@
+"""Small in-process caches shared by the service modules."""
+import threading
+from collections import OrderedDict
+
+
+class SizedLRUCache:
+    """
+    Least-recently-used cache bounded by the total size of its values.
+
+    `sizeof` estimates the size of a value in bytes; entries are evicted from
+    the least recently used end until the total fits in `max_bytes`. A value
+    larger than the whole budget is simply not cached.
+    """
+
+    def __init__(self, max_bytes, sizeof=len):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._total -= self._sizes.pop(key)
+                del self._data[key]
+            if size > self.max_bytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self._total += size
+            while self._total > self.max_bytes:
+                old_key, _ = self._data.popitem(last=False)
+                self._total -= self._sizes.pop(old_key)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._total -= self._sizes.pop(key)
+            return self._data.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._total = 0
+
+    @property
+    def total_bytes(self):
+        return self._total
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
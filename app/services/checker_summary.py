@@ -0,0 +1,80 @@
+"""
+Per-user "checked files" grid shown beside the comment and debug checkers.
+
+The grid only needs filenames, so it is built from one UNION ALL / GROUP BY
+query over comment_checks and debug_checks instead of loading both tables as
+ORM objects. Results are memoised per user and invalidated whenever a check
+is recorded through record_check() or the batch checker. The TTL bounds how
+stale another process's view can get (e.g. after a CLI batch check).
+"""
+import time
+from flask import current_app
+from sqlalchemy import select, union_all, literal, func
+from app import db
+from app.models import CommentCheck, DebugCheck
+from app.services.cache import SizedLRUCache
+
+CHECK_MARK = '✔️'
+DEFAULT_CACHE_BYTES = 2 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 300
+
+_cache = None
+
+
+def _grid_size(entry):
+    _, grid = entry
+    return sum(len(row['filename']) + 64 for row in grid) + 64
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        max_bytes = current_app.config.get('CHECKER_SUMMARY_CACHE_BYTES', DEFAULT_CACHE_BYTES)
+        _cache = SizedLRUCache(max_bytes, sizeof=_grid_size)
+    return _cache
+
+
+def _query_grid(user_id):
+    checks = union_all(
+        select(CommentCheck.filename, literal(1).label('comment'), literal(0).label('debug'))
+        .where(CommentCheck.user_id == user_id),
+        select(DebugCheck.filename, literal(0).label('comment'), literal(1).label('debug'))
+        .where(DebugCheck.user_id == user_id),
+    ).subquery()
+    rows = db.session.execute(
+        select(checks.c.filename, func.max(checks.c.comment), func.max(checks.c.debug))
+        .group_by(checks.c.filename)
+    ).all()
+    return [
+        {
+            'filename': filename,
+            'comment': CHECK_MARK if comment else '',
+            'debug': CHECK_MARK if debug else '',
+        }
+        for filename, comment, debug in sorted(rows, key=lambda row: row[0])
+    ]
+
+
+def get_checked_files_grid(user_id):
+    """Return [{'filename', 'comment', 'debug'}] for every file `user_id` has checked."""
+    cache = _get_cache()
+    entry = cache.get(user_id)
+    now = time.monotonic()
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    grid = _query_grid(user_id)
+    ttl = current_app.config.get('CHECKER_SUMMARY_TTL_SECONDS', DEFAULT_TTL_SECONDS)
+    cache.set(user_id, (now + ttl, grid))
+    return grid
+
+
+def invalidate_checked_files(user_id):
+    """Forget the memoised grid for `user_id` after recording a check."""
+    _get_cache().pop(user_id)
+
+
+def record_check(model, user_id, filename):
+    """Add a CommentCheck or DebugCheck row, commit, and refresh the user's grid."""
+    db.session.add(model(user_id=user_id, filename=filename))
+    db.session.commit()
+    invalidate_checked_files(user_id)
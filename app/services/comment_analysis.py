@@ -0,0 +1,160 @@
+"""
+Comment checker analysis with a content-addressed result cache.
+
+Feedback depends only on the code, the extractor and the feedback rules, so
+results are keyed by (code_hash, analysis version). Lookups go through an
+in-process LRU first, then the comment_analysis_cache table, and only then
+re-analyse the code. The analysis version combines EXTRACTOR_VERSION, the
+source language (for non-Python code) and the current ruleset version, so
+editing a rule naturally misses the cache. Bump EXTRACTOR_VERSION whenever
+comment extraction changes.
+"""
+import hashlib
+import json
+from flask import current_app
+from app import db
+from app.models import CommentAnalysisCache
+from app.services.cache import SizedLRUCache
+from app.services.comment_extractor import iter_comments, PYTHON
+from app.services.comment_rules import get_ruleset
+from app.services.bulk import insert_ignoring_conflicts
+
+EXTRACTOR_VERSION = '2'
+
+DEFAULT_CACHE_BYTES = 8 * 1024 * 1024
+
+_memory_cache = None
+
+
+def code_hash_for(code):
+    """SHA256 of the code, as stored in CommentFeedback.code_hash."""
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def analysis_version(ruleset, language=PYTHON):
+    """Version string stored with cached results for `ruleset` and `language`."""
+    if language == PYTHON:
+        return f"x{EXTRACTOR_VERSION}-{ruleset.version}"
+    return f"x{EXTRACTOR_VERSION}-{language}-{ruleset.version}"
+
+
+def feedback_for_comment(comment):
+    """Return the feedback message for a single extracted comment."""
+    return get_ruleset().feedback(comment)
+
+
+def analyze_comments(code, ruleset=None, language=PYTHON):
+    """Extract every comment in `code` and return (line_num, comment, feedback) tuples."""
+    ruleset = ruleset or get_ruleset()
+    return [(record.line, record.comment, ruleset.feedback(record.comment)) for record in iter_comments(code, language)]
+
+
+def _results_size(results):
+    return sum(len(comment) + len(feedback) + 16 for _, comment, feedback in results)
+
+
+def _get_memory_cache():
+    global _memory_cache
+    if _memory_cache is None:
+        max_bytes = current_app.config.get('COMMENT_ANALYSIS_CACHE_BYTES', DEFAULT_CACHE_BYTES)
+        _memory_cache = SizedLRUCache(max_bytes, sizeof=_results_size)
+    return _memory_cache
+
+
+def _load_stored(code_hash, version):
+    entry = CommentAnalysisCache.query.filter_by(code_hash=code_hash, ruleset_version=version).first()
+    if entry is None:
+        return None
+    return [tuple(row) for row in json.loads(entry.results)]
+
+
+def _store(code_hash, version, results):
+    insert_ignoring_conflicts(CommentAnalysisCache, [{
+        'code_hash': code_hash,
+        'ruleset_version': version,
+        'results': json.dumps(results),
+    }], ['code_hash', 'ruleset_version'])
+    db.session.commit()
+
+
+def get_comment_analysis(code, code_hash=None, language=PYTHON):
+    """
+    Return the (line_num, comment, feedback) list for `code`, using the cache.
+
+    The persistent table is best effort: if it cannot be read or written the
+    analysis is still returned.
+    """
+    code_hash = code_hash or code_hash_for(code)
+    ruleset = get_ruleset()
+    version = analysis_version(ruleset, language)
+    key = (code_hash, version)
+    memory_cache = _get_memory_cache()
+    results = memory_cache.get(key)
+    if results is not None:
+        return results
+    try:
+        results = _load_stored(code_hash, version)
+    except Exception as e:
+        db.session.rollback()
+        print(f"[COMMENT CACHE] Warning: could not read stored analysis: {e}")
+        results = None
+    if results is None:
+        results = analyze_comments(code, ruleset, language)
+        try:
+            _store(code_hash, version, results)
+        except Exception as e:
+            db.session.rollback()
+            print(f"[COMMENT CACHE] Warning: could not store analysis: {e}")
+    memory_cache.set(key, results)
+    return results
+
+
+def get_cached_analyses(code_hashes, language=PYTHON):
+    """
+    Return {code_hash: results} for every hash already analysed under the
+    current ruleset, using one query for the hashes not held in memory.
+    """
+    version = analysis_version(get_ruleset(), language)
+    memory_cache = _get_memory_cache()
+    found = {}
+    missing = []
+    for code_hash in set(code_hashes):
+        results = memory_cache.get((code_hash, version))
+        if results is None:
+            missing.append(code_hash)
+        else:
+            found[code_hash] = results
+    if missing:
+        try:
+            entries = CommentAnalysisCache.query.filter(
+                CommentAnalysisCache.code_hash.in_(missing),
+                CommentAnalysisCache.ruleset_version == version
+            ).all()
+        except Exception as e:
+            db.session.rollback()
+            print(f"[COMMENT CACHE] Warning: could not read stored analysis: {e}")
+            entries = []
+        for entry in entries:
+            results = [tuple(row) for row in json.loads(entry.results)]
+            memory_cache.set((entry.code_hash, version), results)
+            found[entry.code_hash] = results
+    return found
+
+
+def store_analyses(results_by_hash, language=PYTHON):
+    """Store several freshly computed analyses with one bulk insert."""
+    if not results_by_hash:
+        return
+    version = analysis_version(get_ruleset(), language)
+    memory_cache = _get_memory_cache()
+    for code_hash, results in results_by_hash.items():
+        memory_cache.set((code_hash, version), results)
+    try:
+        insert_ignoring_conflicts(CommentAnalysisCache, [
+            {'code_hash': code_hash, 'ruleset_version': version, 'results': json.dumps(results)}
+            for code_hash, results in results_by_hash.items()
+        ], ['code_hash', 'ruleset_version'])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[COMMENT CACHE] Warning: could not store analysis: {e}")
@@ -0,0 +1,341 @@
+"""
+Single-pass comment extractors for the languages taught in Module 1.
+
+Python uses the standard tokenize module. Unlike a plain ``line.find('#')``
+scan, the tokenizer knows about string literals, so ``print("#1")`` is not
+reported as a comment. Student code does not always tokenize cleanly (bad
+indentation, unclosed brackets), so when the tokenizer gives up the remaining
+lines are scanned with a simple quote-aware fallback instead of being dropped.
+
+JavaScript, CSS and HTML use small string-aware scanners that jump between
+interesting characters with a regex rather than stepping through every
+character, which keeps large minified files fast. HTML hands the contents of
+<script> and <style> elements to the JavaScript and CSS scanners. Every
+language yields the same CommentRecord tuples.
+"""
+import os
+import re
+import tokenize
+from collections import namedtuple
+
+FULL_LINE = 'full-line'
+INLINE = 'inline'
+
+PYTHON = 'python'
+JAVASCRIPT = 'javascript'
+HTML = 'html'
+CSS = 'css'
+
+LANGUAGES = (PYTHON, JAVASCRIPT, HTML, CSS)
+
+LANGUAGE_EXTENSIONS = {
+    '.py': PYTHON,
+    '.js': JAVASCRIPT,
+    '.mjs': JAVASCRIPT,
+    '.cjs': JAVASCRIPT,
+    '.jsx': JAVASCRIPT,
+    '.html': HTML,
+    '.htm': HTML,
+    '.css': CSS,
+}
+
+CommentRecord = namedtuple('CommentRecord', ['line', 'comment', 'kind'])
+
+
+def _kind(physical_line, col):
+    return FULL_LINE if not physical_line[:col].strip() else INLINE
+
+
+def _find_comment_start(line, quote=None):
+    """
+    Return (index of the first '#' outside a string or -1, open quote).
+
+    `quote` is the string delimiter still open from the previous line, so
+    triple-quoted strings spanning several lines are skipped correctly.
+    """
+    i = 0
+    while i < len(line):
+        ch = line[i]
+        if quote:
+            if ch == '\\':
+                i += 1
+            elif line.startswith(quote, i):
+                i += len(quote) - 1
+                quote = None
+        elif ch in ('"', "'"):
+            quote = ch * 3 if line.startswith(ch * 3, i) else ch
+            i += len(quote) - 1
+        elif ch == '#':
+            return i, None
+        i += 1
+    # Only triple-quoted strings carry over to the next line
+    return -1, quote if quote and len(quote) == 3 else None
+
+
+def _scan_lines(numbered_lines, skip_through=0):
+    """Fallback scanner used once the tokenizer has given up."""
+    quote = None
+    for line_num, line in numbered_lines:
+        col, quote = _find_comment_start(line, quote)
+        if col != -1 and line_num > skip_through:
+            comment = line[col:].strip()
+            if comment:
+                yield CommentRecord(line_num, comment, _kind(line, col))
+
+
+class _LineReader:
+    """readline() adapter over a string or an iterable of lines.
+
+    Keeps the lines the tokenizer has read but not yet finished with, so
+    they can be re-scanned if tokenizing fails part way through.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, str):
+            source = source.splitlines(keepends=True)
+        self._lines = iter(source)
+        self.line_num = 0
+        self.pending = {}
+
+    def readline(self):
+        line = next(self._lines, '')
+        if line:
+            if not line.endswith('\n'):
+                line += '\n'
+            self.line_num += 1
+            self.pending[self.line_num] = line
+        return line
+
+    def release_through(self, line_num):
+        for n in [n for n in self.pending if n <= line_num]:
+            del self.pending[n]
+
+    def remaining(self):
+        """Yield (line_num, line) for pending lines, then any unread lines."""
+        for n in sorted(self.pending):
+            yield n, self.pending[n]
+        self.pending.clear()
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            self.pending.clear()
+            yield self.line_num, line
+
+
+# --- JavaScript / CSS / HTML -------------------------------------------------
+
+_JS_NEXT = re.compile(r"""[/'"`{}]""")
+_CSS_NEXT = re.compile(r"""[/'"]""")
+_STRINGS = {
+    '"': re.compile(r'"(?:[^"\\\n]|\\[\s\S])*"?'),
+    "'": re.compile(r"'(?:[^'\\\n]|\\[\s\S])*'?"),
+}
+_JS_REGEX_LITERAL = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_JS_TEMPLATE_NEXT = re.compile(r'\\[\s\S]|`|\$\{')
+# A '/' after one of these words starts a regex literal, not a division
+_JS_REGEX_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+}
+_HTML_NEXT = re.compile(r'<!--|<([A-Za-z][\w:-]*)')
+_HTML_TAG_END = re.compile(r"""(?:"[^"]*"|'[^']*'|[^'">])*>""")
+_HTML_CLOSE = {
+    'script': re.compile(r'</script\s*>', re.IGNORECASE),
+    'style': re.compile(r'</style\s*>', re.IGNORECASE),
+}
+
+
+def _block_comment_end(text, pos, end, closer):
+    found = text.find(closer, pos, end)
+    return end if found == -1 else found + len(closer)
+
+
+def _regex_allowed(text, pos, start):
+    """Guess whether the '/' at `pos` starts a regex literal."""
+    i = pos - 1
+    while i >= start and text[i] in ' \t\r\n':
+        i -= 1
+    if i < start:
+        return True
+    ch = text[i]
+    if ch in ')]}':
+        return False
+    if ch.isalnum() or ch in '_$':
+        j = i
+        while j >= start and (text[j].isalnum() or text[j] in '_$'):
+            j -= 1
+        return text[j + 1:i + 1] in _JS_REGEX_KEYWORDS
+    return True
+
+
+def _skip_template(text, pos, end, braces):
+    """Skip template literal text; returns the position after '`' or '${'."""
+    while True:
+        m = _JS_TEMPLATE_NEXT.search(text, pos, end)
+        if not m:
+            return end
+        if m.group() == '`':
+            return m.end()
+        if m.group() == '${':
+            braces.append(0)
+            return m.end()
+        pos = m.end()
+
+
+def _scan_js(text, pos, end):
+    """Yield (start, end) offsets of // and /* */ comments in text[pos:end]."""
+    start = pos
+    # One brace counter per open ${ ... } inside a template literal
+    braces = []
+    while True:
+        m = _JS_NEXT.search(text, pos, end)
+        if not m:
+            return
+        pos = m.start()
+        ch = m.group()
+        if ch == '/':
+            if text.startswith('//', pos, end):
+                stop = text.find('\n', pos, end)
+                stop = end if stop == -1 else stop
+                yield pos, stop
+                pos = stop
+            elif text.startswith('/*', pos, end):
+                stop = _block_comment_end(text, pos + 2, end, '*/')
+                yield pos, stop
+                pos = stop
+            else:
+                literal = _regex_allowed(text, pos, start) and _JS_REGEX_LITERAL.match(text, pos, end)
+                pos = literal.end() if literal else pos + 1
+        elif ch in _STRINGS:
+            pos = _STRINGS[ch].match(text, pos, end).end()
+        elif ch == '`':
+            pos = _skip_template(text, pos + 1, end, braces)
+        elif ch == '{':
+            if braces:
+                braces[-1] += 1
+            pos += 1
+        elif braces and braces[-1] == 0:
+            # '}' closing a ${ ... } expression: back inside the template
+            braces.pop()
+            pos = _skip_template(text, pos + 1, end, braces)
+        else:
+            if braces:
+                braces[-1] -= 1
+            pos += 1
+
+
+def _scan_css(text, pos, end):
+    """Yield (start, end) offsets of /* */ comments in text[pos:end]."""
+    while True:
+        m = _CSS_NEXT.search(text, pos, end)
+        if not m:
+            return
+        pos = m.start()
+        ch = m.group()
+        if ch == '/':
+            if text.startswith('/*', pos, end):
+                stop = _block_comment_end(text, pos + 2, end, '*/')
+                yield pos, stop
+                pos = stop
+            else:
+                pos += 1
+        else:
+            pos = _STRINGS[ch].match(text, pos, end).end()
+
+
+def _scan_html(text, pos, end):
+    """Yield (start, end) offsets of <!-- --> comments and comments in <script>/<style>."""
+    while True:
+        m = _HTML_NEXT.search(text, pos, end)
+        if not m:
+            return
+        tag = m.group(1)
+        if tag is None:
+            stop = _block_comment_end(text, m.end(), end, '-->')
+            yield m.start(), stop
+            pos = stop
+            continue
+        tag = tag.lower()
+        # Skip the whole start tag so quoted attribute values are not scanned
+        open_tag = _HTML_TAG_END.match(text, m.end(), end)
+        if not open_tag:
+            pos = m.end()
+            continue
+        if tag not in _HTML_CLOSE:
+            pos = open_tag.end()
+            continue
+        close = _HTML_CLOSE[tag].search(text, open_tag.end(), end)
+        body_end = close.start() if close else end
+        scanner = _scan_js if tag == 'script' else _scan_css
+        yield from scanner(text, open_tag.end(), body_end)
+        pos = close.end() if close else end
+
+
+_SCANNERS = {
+    JAVASCRIPT: _scan_js,
+    CSS: _scan_css,
+    HTML: _scan_html,
+}
+
+
+def _records_from_spans(text, spans):
+    line = 1
+    counted = 0
+    for start, stop in spans:
+        line += text.count('\n', counted, start)
+        counted = start
+        # Multi-line block comments are reported once, on their first line
+        comment = ' '.join(part.strip() for part in text[start:stop].splitlines() if part.strip())
+        if not comment:
+            continue
+        i = start - 1
+        while i >= 0 and text[i] in ' \t\r':
+            i -= 1
+        kind = FULL_LINE if i < 0 or text[i] == '\n' else INLINE
+        yield CommentRecord(line, comment, kind)
+
+
+def language_for_filename(filename, default=PYTHON):
+    """Return the checker language for `filename`, based on its extension."""
+    extension = os.path.splitext(filename or '')[1].lower()
+    return LANGUAGE_EXTENSIONS.get(extension, default)
+
+
+def iter_comments(source, language=PYTHON):
+    """
+    Yield a CommentRecord(line, comment, kind) for every comment in `source`.
+
+    `source` is a string or any iterable of lines; for Python the lines are
+    consumed lazily. `kind` is FULL_LINE for comments on their own line and
+    INLINE for comments that follow code.
+    """
+    if language != PYTHON:
+        if language not in _SCANNERS:
+            raise ValueError(f"Unsupported comment checker language: {language}")
+        text = source if isinstance(source, str) else ''.join(source)
+        yield from _records_from_spans(text, _SCANNERS[language](text, 0, len(text)))
+        return
+    if isinstance(source, str) and '#' not in source:
+        return
+    reader = _LineReader(source)
+    last_comment_line = 0
+    released = 0
+    try:
+        for tok in tokenize.generate_tokens(reader.readline):
+            if tok.type == tokenize.COMMENT:
+                comment = tok.string.strip()
+                if comment:
+                    last_comment_line = tok.start[0]
+                    yield CommentRecord(tok.start[0], comment, _kind(tok.line, tok.start[1]))
+            # Most tokens share a line with the previous one; only release on a new line
+            if tok.start[0] - 1 > released:
+                released = tok.start[0] - 1
+                reader.release_through(released)
+    except (tokenize.TokenError, SyntaxError):
+        yield from _scan_lines(reader.remaining(), skip_through=last_comment_line)
+
+
+def extract_comments(source, language=PYTHON):
+    """Return every comment in `source` as a list of CommentRecord tuples."""
+    return list(iter_comments(source, language))
@@ -0,0 +1,197 @@
+"""Bulk persistence for CommentFeedback rows written by the comment checker."""
+from sqlalchemy import update
+from app import db
+from app.models import CommentFeedback
+from app.services.bulk import insert_ignoring_conflicts
+from app.services.comment_analysis import code_hash_for, get_comment_analysis, get_cached_analyses, store_analyses
+from app.services.comment_extractor import iter_comments, PYTHON
+from app.services.comment_rules import get_ruleset
+
+CONFLICT_COLUMNS = ['user_id', 'section_id', 'filename', 'line_num']
+
+
+def bulk_insert_comment_feedback(user_id, section_id, filename, code_hash, comments):
+    """
+    Persist feedback for a checked file using one multi-row INSERT per chunk.
+
+    `comments` is an iterable of (line_num, comment, feedback) tuples. Lines
+    that already have a row for this user/section/file are left untouched,
+    matching the old per-line "insert if not exists" behaviour. The caller is
+    responsible for committing the session.
+    """
+    rows = [
+        {
+            'user_id': user_id,
+            'section_id': section_id,
+            'filename': filename,
+            'line_num': line_num,
+            'comment': comment,
+            'feedback': feedback,
+            'code_hash': code_hash,
+        }
+        for line_num, comment, feedback in comments
+    ]
+    return insert_ignoring_conflicts(CommentFeedback, rows, CONFLICT_COLUMNS)
+
+
+def _analyse_against_previous(code, code_hash, previous, language):
+    """
+    Return (results, evaluated) for `code`, reusing stored feedback where possible.
+
+    Feedback depends only on the comment text, so a comment that is unchanged
+    (or has merely moved) keeps its stored feedback. That is only safe when
+    the stored rows come from a single version that was analysed under the
+    current rules, which the analysis cache tells us.
+    """
+    previous_hashes = {row.code_hash for row in previous}
+    cached = get_cached_analyses({code_hash} | previous_hashes, language)
+    if code_hash in cached:
+        return cached[code_hash], 0
+    reusable = {}
+    if len(previous_hashes) == 1 and previous_hashes <= cached.keys():
+        reusable = {row.comment: row.feedback for row in previous}
+    ruleset = get_ruleset()
+    results = []
+    evaluated = 0
+    for record in iter_comments(code, language):
+        feedback = reusable.get(record.comment)
+        if feedback is None:
+            feedback = ruleset.feedback(record.comment)
+            reusable[record.comment] = feedback
+            evaluated += 1
+        results.append((record.line, record.comment, feedback))
+    store_analyses({code_hash: results}, language)
+    return results, evaluated
+
+
+def recheck_comment_feedback(user_id, section_id, filename, code, code_hash=None, language=PYTHON):
+    """
+    Store feedback for a new or revised file, writing only the lines that changed.
+
+    Stored rows are compared with the new analysis by line_num: lines whose
+    comment or feedback differ are updated, new comment lines inserted and
+    lines that no longer hold a comment deleted. Unchanged rows only have
+    their code_hash moved to the new version. Returns (results, changes),
+    where `changes` reports the mode ('full', 'incremental' or 'unchanged')
+    and the added/changed/removed line numbers. The caller commits.
+    """
+    code_hash = code_hash or code_hash_for(code)
+    file_filter = {'user_id': user_id, 'section_id': section_id, 'filename': filename}
+    previous = db.session.query(
+        CommentFeedback.id, CommentFeedback.line_num, CommentFeedback.comment,
+        CommentFeedback.feedback, CommentFeedback.code_hash,
+    ).filter_by(**file_filter).all()
+    if not previous:
+        results = get_comment_analysis(code, code_hash, language)
+        bulk_insert_comment_feedback(user_id, section_id, filename, code_hash, results)
+        return results, {
+            'mode': 'full',
+            'added': [line_num for line_num, _, _ in results],
+            'changed': [],
+            'removed': [],
+            'unchanged': 0,
+            'evaluated': None,
+        }
+
+    results, evaluated = _analyse_against_previous(code, code_hash, previous, language)
+    inserts, updates, removed_ids, changes = _diff_feedback(previous, results, code_hash)
+    changes['evaluated'] = evaluated
+
+    if inserts:
+        bulk_insert_comment_feedback(user_id, section_id, filename, code_hash, inserts)
+    if updates:
+        db.session.execute(update(CommentFeedback), updates)
+    if removed_ids:
+        CommentFeedback.query.filter(CommentFeedback.id.in_(removed_ids)).delete(synchronize_session=False)
+    if any(row.code_hash != code_hash for row in previous):
+        CommentFeedback.query.filter_by(**file_filter).filter(
+            CommentFeedback.code_hash != code_hash
+        ).update({'code_hash': code_hash}, synchronize_session=False)
+    return results, changes
+
+
+def _diff_feedback(previous, results, code_hash):
+    """
+    Compare stored rows with a new analysis by line_num.
+
+    Returns (inserts, updates, removed_ids, changes): (line_num, comment,
+    feedback) tuples for new lines, update dicts by id for changed lines, ids
+    of rows whose line no longer holds a comment, and the change report.
+    """
+    by_line = {row.line_num: row for row in previous}
+    inserts = []
+    updates = []
+    changes = {'added': [], 'changed': [], 'removed': [], 'unchanged': 0}
+    for line_num, comment, feedback in results:
+        row = by_line.pop(line_num, None)
+        if row is None:
+            inserts.append((line_num, comment, feedback))
+            changes['added'].append(line_num)
+        elif row.comment != comment or row.feedback != feedback:
+            updates.append({'id': row.id, 'comment': comment, 'feedback': feedback, 'code_hash': code_hash})
+            changes['changed'].append(line_num)
+        else:
+            changes['unchanged'] += 1
+    # Whatever is left in by_line no longer holds a comment
+    removed_ids = [row.id for row in by_line.values()]
+    changes['removed'] = sorted(by_line)
+    nothing_changed = not (inserts or updates or removed_ids)
+    changes['mode'] = 'unchanged' if nothing_changed else 'incremental'
+    return inserts, updates, removed_ids, changes
+
+
+def sync_comment_feedback_batch(user_id, section_id, analysed):
+    """
+    Store already-analysed feedback for many files at once, with the same
+    insert/update/delete rules as recheck_comment_feedback().
+
+    `analysed` maps filename to (code_hash, [(line_num, comment, feedback)]).
+    Stored rows for all the files are read with one query, and the writes
+    are batched across files. The caller commits.
+    """
+    if not analysed:
+        return
+    previous = {}
+    for row in db.session.query(
+        CommentFeedback.id, CommentFeedback.filename, CommentFeedback.line_num, CommentFeedback.comment,
+        CommentFeedback.feedback, CommentFeedback.code_hash,
+    ).filter(
+        CommentFeedback.user_id == user_id,
+        CommentFeedback.section_id == section_id,
+        CommentFeedback.filename.in_(list(analysed)),
+    ):
+        previous.setdefault(row.filename, []).append(row)
+
+    insert_rows = []
+    updates = []
+    removed_ids = []
+    for filename, (code_hash, results) in analysed.items():
+        rows = previous.get(filename, [])
+        inserts, file_updates, file_removed, _ = _diff_feedback(rows, results, code_hash)
+        insert_rows.extend(
+            {
+                'user_id': user_id,
+                'section_id': section_id,
+                'filename': filename,
+                'line_num': line_num,
+                'comment': comment,
+                'feedback': feedback,
+                'code_hash': code_hash,
+            }
+            for line_num, comment, feedback in inserts
+        )
+        updates.extend(file_updates)
+        removed_ids.extend(file_removed)
+        # Unchanged rows from an older version move to the new hash
+        updated_ids = {u['id'] for u in file_updates}
+        updates.extend(
+            {'id': row.id, 'code_hash': code_hash}
+            for row in rows
+            if row.code_hash != code_hash and row.id not in updated_ids and row.id not in file_removed
+        )
+
+    if removed_ids:
+        CommentFeedback.query.filter(CommentFeedback.id.in_(removed_ids)).delete(synchronize_session=False)
+    if updates:
+        db.session.execute(update(CommentFeedback), updates)
+    insert_ignoring_conflicts(CommentFeedback, insert_rows, CONFLICT_COLUMNS)
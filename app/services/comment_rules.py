@@ -0,0 +1,232 @@
+"""
+Data-driven feedback rules for the comment checker.
+
+Built-in rules live in app/comment_rules.json. Teachers can add, override
+or switch off rules through the CommentRule table without a deploy.
+
+The merged ruleset is compiled once per version. Each rule pattern is
+compiled with re, and the literal text every match must contain (e.g.
+"print(" in r"print\(") is loaded into a single Aho-Corasick automaton.
+Evaluating a comment is one pass of the automaton to find candidate rules,
+then a confirming regex search for those candidates only, plus the few
+rules with no required literal. Per-comment cost therefore stays flat as
+teachers add keyword-style rules.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import deque, namedtuple
+from flask import current_app
+from app import db
+from app.models import CommentRule
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'comment_rules.json')
+
+DEFAULT_RELOAD_SECONDS = 60
+
+Rule = namedtuple('Rule', ['rule_id', 'pattern', 'message', 'priority'])
+
+_current = None
+_loaded_at = None
+_lock = threading.Lock()
+
+
+def validate_pattern(pattern):
+    """Raise ValueError if `pattern` is not a valid regular expression."""
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression: {e}")
+
+
+def _literal_run(items):
+    """Longest run of consecutive literal characters in a parsed sequence."""
+    best, run = '', ''
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run += chr(av)
+        else:
+            best, run = max(best, run, key=len), ''
+    return max(best, run, key=len)
+
+
+def required_literals(pattern):
+    """
+    Return literals one of which appears in every match of `pattern`, or None.
+
+    Only the top level is inspected: a plain sequence gives its longest
+    literal run and a top-level alternation gives one literal per branch.
+    Anything else (case-insensitive patterns, no literal text) returns None
+    and the rule is simply checked against every comment.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    items = list(parsed)
+    if len(items) == 1 and items[0][0] is sre_parse.BRANCH:
+        literals = [_literal_run(list(branch)) for branch in items[0][1][1]]
+    else:
+        literals = [_literal_run(items)]
+    if not all(literals):
+        return None
+    return literals
+
+
+class LiteralAutomaton:
+    """Aho-Corasick automaton mapping literal strings to sets of values."""
+
+    def __init__(self, entries):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [frozenset()]
+        outputs = [set()]
+        for literal, value in entries:
+            state = 0
+            for ch in literal:
+                if ch not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                    self._goto[state][ch] = len(self._goto) - 1
+                state = self._goto[state][ch]
+            outputs[state].add(value)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child] |= outputs[self._fail[child]]
+        self._out = [frozenset(o) for o in outputs]
+
+    def scan(self, text):
+        """Return the set of values whose literal occurs in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+def ruleset_version(rules, default_message):
+    """Short content hash identifying a set of rules."""
+    ordered = sorted(rules, key=lambda r: (r.priority, r.rule_id))
+    payload = json.dumps([[r.rule_id, r.pattern, r.message, r.priority] for r in ordered] + [default_message])
+    return 'rules-' + hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class CompiledRuleset:
+    """A compiled set of rules; the first match by priority gives the feedback."""
+
+    def __init__(self, rules, default_message):
+        valid = []
+        for rule in rules:
+            try:
+                validate_pattern(rule.pattern)
+                valid.append(rule)
+            except ValueError as e:
+                print(f"[COMMENT RULES] Skipping rule '{rule.rule_id}': {e}")
+        self.rules = sorted(valid, key=lambda r: (r.priority, r.rule_id))
+        self.default_message = default_message
+        self.version = ruleset_version(rules, default_message)
+        self._regexes = [re.compile(rule.pattern) for rule in self.rules]
+        entries = []
+        self._always = set()
+        for index, rule in enumerate(self.rules):
+            literals = required_literals(rule.pattern)
+            if literals is None:
+                self._always.add(index)
+            else:
+                entries.extend((literal, index) for literal in literals)
+        self._automaton = LiteralAutomaton(entries)
+
+    def _candidates(self, comment):
+        return sorted(self._automaton.scan(comment) | self._always)
+
+    def evaluate(self, comment):
+        """Return [(rule_id, message), ...] for every rule matching `comment`, in priority order."""
+        return [
+            (self.rules[index].rule_id, self.rules[index].message)
+            for index in self._candidates(comment)
+            if self._regexes[index].search(comment)
+        ]
+
+    def feedback(self, comment):
+        """Return the feedback message for `comment`."""
+        for index in self._candidates(comment):
+            if self._regexes[index].search(comment):
+                return self.rules[index].message
+        return self.default_message
+
+
+def load_rules():
+    """Return (rules, default_message) from the JSON file merged with CommentRule rows."""
+    with open(RULES_FILE, encoding='utf-8') as f:
+        data = json.load(f)
+    rules = {
+        r['id']: Rule(r['id'], r['pattern'], r['message'], r.get('priority', 100))
+        for r in data.get('rules', [])
+    }
+    try:
+        for row in CommentRule.query.all():
+            if row.is_active:
+                rules[row.rule_key] = Rule(row.rule_key, row.pattern, row.message, row.priority or 100)
+            else:
+                rules.pop(row.rule_key, None)
+    except Exception as e:
+        db.session.rollback()
+        print(f"[COMMENT RULES] Warning: could not load custom rules: {e}")
+    return list(rules.values()), data.get('default_message', '')
+
+
+def builtin_rule_ids():
+    """Rule ids defined in the JSON file (used by the admin page)."""
+    with open(RULES_FILE, encoding='utf-8') as f:
+        return {r['id'] for r in json.load(f).get('rules', [])}
+
+
+def get_ruleset():
+    """
+    Return the current CompiledRuleset.
+
+    Rules are re-read at most every COMMENT_RULES_RELOAD_SECONDS, and the
+    regex is only recompiled when the re-read rules have a new version.
+    """
+    global _current, _loaded_at
+    reload_seconds = current_app.config.get('COMMENT_RULES_RELOAD_SECONDS', DEFAULT_RELOAD_SECONDS)
+    with _lock:
+        now = time.monotonic()
+        if _loaded_at is None or now - _loaded_at >= reload_seconds:
+            rules, default_message = load_rules()
+            version = ruleset_version(rules, default_message)
+            if _current is None or version != _current.version:
+                _current = CompiledRuleset(rules, default_message)
+            _loaded_at = now
+        return _current
+
+
+def invalidate_ruleset():
+    """Force the next get_ruleset() call to re-read the rules (e.g. after a teacher edit)."""
+    global _loaded_at
+    with _lock:
+        _loaded_at = None
@@ -0,0 +1,185 @@
+"""
+Per-student, per-course progress rollup (course_progress table).
+
+The progress page used to run several nested-subquery counts per lesson and
+per course, against Submission.user_id and Assignment.lesson_id columns that
+the models do not have. Now each course_progress row holds a student's
+completed lessons, submitted assignments and attempted quizzes for one
+course. The routes that record that work call bump_course_progress() inside
+their own transaction, so the page is a single read of the rollup joined to
+the course totals.
+
+Definitions, shared by the incremental updates and rebuild_course_progress():
+- A lesson is completed once every one of its sections has a completed
+  LessonProgress row.
+- An assignment counts once the student has any submission for it.
+- A quiz counts once the student has any attempt at it.
+
+Two concurrent writes can both count the same item. `flask
+rebuild-course-progress` recomputes every row from the source tables.
+"""
+from datetime import datetime
+from sqlalchemy import delete, exists, func, select, update
+from app import db
+from app.models import (Assignment, Course, CourseProgress, Enrollment, Lesson, LessonProgress,
+                        Quiz, QuizAttempt, Section, Submission)
+from app.services.bulk import insert_ignoring_conflicts
+
+CONFLICT_COLUMNS = ['student_id', 'course_id']
+
+
+def bump_course_progress(student_id, course_id, lessons=0, assignments=0, quizzes=0):
+    """Add to a student's counters for a course. The caller commits."""
+    insert_ignoring_conflicts(CourseProgress, [{'student_id': student_id, 'course_id': course_id}], CONFLICT_COLUMNS)
+    db.session.execute(
+        update(CourseProgress)
+        .where(CourseProgress.student_id == student_id, CourseProgress.course_id == course_id)
+        .values(
+            lessons_completed=CourseProgress.lessons_completed + lessons,
+            assignments_submitted=CourseProgress.assignments_submitted + assignments,
+            quizzes_attempted=CourseProgress.quizzes_attempted + quizzes,
+            updated_at=datetime.utcnow(),
+        )
+    )
+
+
+def record_lesson_completion(student_id, lesson):
+    """
+    Mark every section of `lesson` completed for the student and count the
+    lesson if it was not already complete. Returns False for a lesson with
+    no sections, since LessonProgress rows are per section. The caller commits.
+    """
+    section_ids = db.session.execute(select(Section.id).where(Section.lesson_id == lesson.id)).scalars().all()
+    if not section_ids:
+        return False
+    existing = {
+        progress.section_id: progress
+        for progress in LessonProgress.query.filter(
+            LessonProgress.student_id == student_id,
+            LessonProgress.section_id.in_(section_ids),
+        )
+    }
+    was_complete = all(sid in existing and existing[sid].completed for sid in section_ids)
+    now = datetime.utcnow()
+    for section_id in section_ids:
+        progress = existing.get(section_id)
+        if progress is None:
+            db.session.add(LessonProgress(student_id=student_id, section_id=section_id, completed=True, completed_at=now))
+        elif not progress.completed:
+            progress.completed = True
+            progress.completed_at = now
+    if not was_complete:
+        bump_course_progress(student_id, lesson.course_id, lessons=1)
+    return True
+
+
+def _percent(done, total):
+    return (done / total * 100) if total > 0 else 0
+
+
+def progress_report(student_id):
+    """Return (progress_data, overall_stats) for the progress page, from one query."""
+    lesson_total = select(func.count(Lesson.id)).where(Lesson.course_id == Course.id).scalar_subquery()
+    assignment_total = select(func.count(Assignment.id)).where(Assignment.course_id == Course.id).scalar_subquery()
+    quiz_total = select(func.count(Quiz.id)).where(Quiz.course_id == Course.id).scalar_subquery()
+    enrolled = exists().where(Enrollment.course_id == Course.id, Enrollment.student_id == student_id)
+    rows = db.session.execute(
+        select(
+            Course,
+            lesson_total,
+            assignment_total,
+            quiz_total,
+            func.coalesce(CourseProgress.lessons_completed, 0),
+            func.coalesce(CourseProgress.assignments_submitted, 0),
+            func.coalesce(CourseProgress.quizzes_attempted, 0),
+        )
+        .outerjoin(CourseProgress, (CourseProgress.course_id == Course.id) & (CourseProgress.student_id == student_id))
+        .where(enrolled)
+        .order_by(Course.order, Course.id)
+    ).all()
+
+    progress_data = []
+    totals = [0] * 6
+    for course, lessons, assignments, quizzes, completed, submitted, attempted in rows:
+        # Counters can briefly exceed the totals if items are deleted; never show more than 100%
+        completed, submitted, attempted = min(completed, lessons), min(submitted, assignments), min(attempted, quizzes)
+        for i, value in enumerate((lessons, completed, assignments, submitted, quizzes, attempted)):
+            totals[i] += value
+        progress_data.append({
+            'course': course,
+            'lessons': {'total': lessons, 'completed': completed, 'progress': round(_percent(completed, lessons), 1)},
+            'assignments': {'total': assignments, 'submitted': submitted, 'progress': round(_percent(submitted, assignments), 1)},
+            'quizzes': {'total': quizzes, 'attempts': attempted, 'progress': round(_percent(attempted, quizzes), 1)},
+            'overall_progress': round(_percent(completed + submitted + attempted, lessons + assignments + quizzes), 1),
+        })
+
+    lessons, completed, assignments, submitted, quizzes, attempted = totals
+    overall_stats = {
+        'lessons': {'total': lessons, 'completed': completed, 'progress': _percent(completed, lessons)},
+        'assignments': {'total': assignments, 'submitted': submitted, 'progress': _percent(submitted, assignments)},
+        'quizzes': {'total': quizzes, 'attempts': attempted, 'progress': _percent(attempted, quizzes)},
+    }
+    return progress_data, overall_stats
+
+
+def _completed_lessons_query():
+    section_counts = (
+        select(Section.lesson_id, func.count(Section.id).label('sections'))
+        .group_by(Section.lesson_id)
+        .subquery()
+    )
+    done = (
+        select(LessonProgress.student_id, Section.lesson_id, func.count(func.distinct(Section.id)).label('done'))
+        .join(Section, Section.id == LessonProgress.section_id)
+        .where(LessonProgress.completed.is_(True))
+        .group_by(LessonProgress.student_id, Section.lesson_id)
+        .subquery()
+    )
+    return (
+        select(done.c.student_id, Lesson.course_id, func.count())
+        .join(section_counts, section_counts.c.lesson_id == done.c.lesson_id)
+        .join(Lesson, Lesson.id == done.c.lesson_id)
+        .where(done.c.done == section_counts.c.sections)
+        .group_by(done.c.student_id, Lesson.course_id)
+    )
+
+
+def _submitted_assignments_query():
+    return (
+        select(Submission.student_id, Assignment.course_id, func.count(func.distinct(Submission.assignment_id)))
+        .join(Assignment, Assignment.id == Submission.assignment_id)
+        .group_by(Submission.student_id, Assignment.course_id)
+    )
+
+
+def _attempted_quizzes_query():
+    return (
+        select(QuizAttempt.student_id, Quiz.course_id, func.count(func.distinct(QuizAttempt.quiz_id)))
+        .join(Quiz, Quiz.id == QuizAttempt.quiz_id)
+        .group_by(QuizAttempt.student_id, Quiz.course_id)
+    )
+
+
+def rebuild_course_progress():
+    """Recompute every course_progress row from the source tables and commit. Returns the row count."""
+    counts = {}
+    queries = (_completed_lessons_query(), _submitted_assignments_query(), _attempted_quizzes_query())
+    for position, query in enumerate(queries):
+        for student_id, course_id, count in db.session.execute(query):
+            counts.setdefault((student_id, course_id), [0, 0, 0])[position] = count
+    now = datetime.utcnow()
+    rows = [
+        {
+            'student_id': student_id,
+            'course_id': course_id,
+            'lessons_completed': lessons,
+            'assignments_submitted': assignments,
+            'quizzes_attempted': quizzes,
+            'updated_at': now,
+        }
+        for (student_id, course_id), (lessons, assignments, quizzes) in sorted(counts.items())
+    ]
+    db.session.execute(delete(CourseProgress))
+    insert_ignoring_conflicts(CourseProgress, rows, CONFLICT_COLUMNS)
+    db.session.commit()
+    return len(rows)
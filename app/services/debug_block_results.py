@@ -0,0 +1,89 @@
+"""
+Persistence for parsed DEBUG blocks (DebugBlockResult rows).
+
+Signed-in users' debug checker results are stored one row per block, keyed
+by user, file and code hash, so teachers can query them and the PDFs read
+them straight from the table. Anonymous visitors have no user row; their
+blocks stay in the result store.
+"""
+import json
+from app.models import DebugBlockResult
+from app.services.bulk import insert_ignoring_conflicts
+from app.services.debug_blocks import DebugBlock, load_debug_blocks
+from app.services.result_store import get_result
+
+CONFLICT_COLUMNS = ['user_id', 'filename', 'code_hash', 'block_index']
+
+# Filename recorded for code pasted into the checker rather than uploaded
+PASTED_FILENAME = '(pasted code)'
+
+
+def debug_block_rows(user_id, filename, code_hash, blocks):
+    """Column dicts for bulk inserting `blocks` (DebugBlocks, in file order)."""
+    return [
+        {
+            'user_id': user_id,
+            'filename': filename,
+            'code_hash': code_hash,
+            'block_index': index,
+            'start_line': block.start_line,
+            'end_line': block.end_line,
+            'lines': json.dumps(block.lines),
+            'test': block.test,
+            'issue': block.issue,
+            'fix': block.fix,
+            'complete': block.complete,
+        }
+        for index, block in enumerate(blocks)
+    ]
+
+
+def store_debug_blocks(user_id, filename, code_hash, blocks):
+    """
+    Insert the blocks for one checked version of a file in bulk.
+
+    Re-checking an identical version leaves the existing rows untouched. The
+    caller is responsible for committing the session.
+    """
+    rows = debug_block_rows(user_id, filename, code_hash, blocks)
+    return insert_ignoring_conflicts(DebugBlockResult, rows, CONFLICT_COLUMNS)
+
+
+def block_from_row(row):
+    """DebugBlock from a DebugBlockResult row (or a query row with the same columns)."""
+    return DebugBlock(
+        start_line=row.start_line,
+        end_line=row.end_line,
+        lines=[tuple(line) for line in json.loads(row.lines)],
+        test=row.test,
+        issue=row.issue,
+        fix=row.fix,
+    )
+
+
+def get_debug_blocks(user_id, filename=None, code_hash=None):
+    """
+    Return the DebugBlocks stored for one checked version of a file.
+
+    Without `code_hash` the most recently checked version of `filename` is
+    used; without `filename`, the user's most recently checked file.
+    """
+    query = DebugBlockResult.query.filter_by(user_id=user_id)
+    if filename is None or code_hash is None:
+        latest = query.filter_by(filename=filename) if filename is not None else query
+        latest = latest.with_entities(DebugBlockResult.filename, DebugBlockResult.code_hash).order_by(
+            DebugBlockResult.checked_at.desc(), DebugBlockResult.id.desc()
+        ).first()
+        if latest is None:
+            return []
+        filename, code_hash = latest
+    rows = query.filter_by(filename=filename, code_hash=code_hash).order_by(DebugBlockResult.block_index).all()
+    return [block_from_row(row) for row in rows]
+
+
+def current_debug_blocks(user):
+    """The blocks from the current user's (or session's) last debug checker run."""
+    if user.is_authenticated:
+        return get_debug_blocks(user.id, get_result('uploaded_filename') or PASTED_FILENAME, get_result('debug_code_hash'))
+    return load_debug_blocks(get_result('extracted_debug_blocks'))
+
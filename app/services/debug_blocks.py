@@ -0,0 +1,173 @@
+"""
+DEBUG comment block parsing and feedback shared by the debug checker routes.
+
+Students document each bug they fixed with consecutive ``# DEBUG`` comment
+lines, ideally labelled TEST, ISSUE and FIX::
+
+    # DEBUG TEST: entered -5 as the age
+    # DEBUG ISSUE: the program crashed with a ValueError
+    # DEBUG FIX: added a range check before converting
+
+parse_debug_blocks() finds DEBUG lines with one multiline regex search over
+the whole source (no per-line Python loop over non-DEBUG lines) and returns
+DebugBlock tuples with the line span, the TEST/ISSUE/FIX text and a
+completeness verdict. Unlabelled lines that mention testing, an issue or a
+fix still count, as they did with the old substring check.
+"""
+import re
+from collections import namedtuple
+
+# Starts with a literal '#', so the regex engine can skip quickly to candidates;
+# parse_debug_blocks() checks that only indentation precedes it on the line.
+DEBUG_LINE_REGEX = re.compile(r'#[ \t]*DEBUG\b[ \t]*:?[ \t]*([^\n]*)', re.IGNORECASE)
+
+# "TEST ..." at the start of a line, or "TEST:" / "TEST -" anywhere in it
+PART_LABEL_REGEX = re.compile(r'(?:^(TEST|ISSUE|FIX)\b|\b(TEST|ISSUE|FIX)[ \t]*[:\-])[ \t]*[:\-]?[ \t]*', re.IGNORECASE)
+PART_WORD_REGEX = re.compile(r'\b(test|issue|fix)', re.IGNORECASE)
+LEADING_LABEL_REGEX = re.compile(r'(TEST|ISSUE|FIX)\b[ \t]*[:\-]?[ \t]*', re.IGNORECASE)
+
+PARTS = ('TEST', 'ISSUE', 'FIX')
+
+DEBUG_COMPLETE_FEEDBACK = 'Great! Your DEBUG block is complete.'
+DEBUG_EMPTY_FEEDBACK = 'Add a test, issue, and fix description to your DEBUG block.'
+
+# The debug checker asks students for at least this many DEBUG blocks
+REQUIRED_DEBUG_BLOCKS = 3
+
+
+class DebugBlock(namedtuple('DebugBlock', ['start_line', 'end_line', 'lines', 'test', 'issue', 'fix'])):
+    """
+    One run of consecutive DEBUG lines.
+
+    `lines` is a list of (line_num, stripped line); `test`, `issue` and `fix`
+    hold the text given for each part, or '' when it is missing.
+    """
+    __slots__ = ()
+
+    @property
+    def missing(self):
+        return [part for part in PARTS if not getattr(self, part.lower())]
+
+    @property
+    def complete(self):
+        return not self.missing
+
+    @property
+    def feedback(self):
+        missing = self.missing
+        if not missing:
+            return DEBUG_COMPLETE_FEEDBACK
+        if len(missing) == len(PARTS):
+            return DEBUG_EMPTY_FEEDBACK
+        return f"Add a {', '.join(missing)} to your DEBUG block for full marks."
+
+    @property
+    def text(self):
+        """The block as "N: line" rows, the format shown on the checker pages."""
+        return '\n'.join(f"{line_num}: {line}" for line_num, line in self.lines)
+
+    def to_dict(self):
+        return self._asdict()
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**dict(data, lines=[tuple(row) for row in data['lines']]))
+
+
+def _classify(body, parts, last_part):
+    """Record the TEST/ISSUE/FIX text in one DEBUG line; returns the part it ended on."""
+    leading = LEADING_LABEL_REGEX.match(body)
+    if leading:
+        rest = body[leading.end():]
+        # Common case: one label at the start and no further "X:" labels
+        if ':' not in rest and '-' not in rest:
+            part = leading.group(1).upper()
+            parts[part].append(rest.strip() or body.strip())
+            return part
+    labels = list(PART_LABEL_REGEX.finditer(body))
+    if labels:
+        if labels[0].start() > 0 and last_part:
+            parts[last_part].append(body[:labels[0].start()].strip())
+        for i, label in enumerate(labels):
+            part = (label.group(1) or label.group(2)).upper()
+            end = labels[i + 1].start() if i + 1 < len(labels) else len(body)
+            parts[part].append(body[label.end():end].strip() or body.strip())
+            last_part = part
+        return last_part
+    words = {match.group(1).upper() for match in PART_WORD_REGEX.finditer(body)}
+    if words:
+        for part in words:
+            parts[part].append(body.strip())
+        return last_part
+    # A plain continuation line adds detail to the part before it
+    if last_part and body.strip():
+        parts[last_part].append(body.strip())
+    return last_part
+
+
+def _body(line):
+    match = DEBUG_LINE_REGEX.match(line.lstrip())
+    return match.group(1).rstrip() if match else line
+
+
+def _build_block(lines, bodies):
+    parts = {'TEST': [], 'ISSUE': [], 'FIX': []}
+    last_part = None
+    for body in bodies:
+        last_part = _classify(body, parts, last_part)
+    return DebugBlock(
+        start_line=lines[0][0],
+        end_line=lines[-1][0],
+        lines=lines,
+        test=' '.join(p for p in parts['TEST'] if p),
+        issue=' '.join(p for p in parts['ISSUE'] if p),
+        fix=' '.join(p for p in parts['FIX'] if p),
+    )
+
+
+def parse_debug_blocks(code):
+    """Return a DebugBlock for every run of consecutive DEBUG lines in `code`."""
+    blocks = []
+    lines = []
+    bodies = []
+    line_num = 1
+    counted = 0
+    for match in DEBUG_LINE_REGEX.finditer(code):
+        start = match.start()
+        line_start = code.rfind('\n', 0, start) + 1
+        if code[line_start:start].strip(' \t'):
+            continue  # '# DEBUG' after code is an inline comment, not a block line
+        line_num += code.count('\n', counted, start)
+        counted = start
+        if lines and line_num != lines[-1][0] + 1:
+            blocks.append(_build_block(lines, bodies))
+            lines = []
+            bodies = []
+        lines.append((line_num, match.group().rstrip()))
+        bodies.append(match.group(1).rstrip())
+    if lines:
+        blocks.append(_build_block(lines, bodies))
+    return blocks
+
+
+def load_debug_blocks(stored):
+    """
+    Turn stored checker results back into DebugBlocks.
+
+    Accepts DebugBlock.to_dict() output, and the "N: line" strings saved
+    before blocks were structured.
+    """
+    blocks = []
+    for item in stored or []:
+        if isinstance(item, dict):
+            blocks.append(DebugBlock.from_dict(item))
+            continue
+        lines = []
+        for row in item.splitlines():
+            num, sep, text = row.partition(': ')
+            if sep and num.isdigit():
+                lines.append((int(num), text))
+        if lines:
+            blocks.append(_build_block(lines, [_body(text) for _, text in lines]))
+    return blocks
+
@@ -0,0 +1,164 @@
+"""
+Class-wide export of comment and debug checker feedback as a zip of PDFs.
+
+Stored CommentFeedback and DebugBlockResult rows are read with a streaming
+cursor (yield_per) and grouped into one report per student file. Each
+finished PDF is written into a zip that goes straight to the response, so
+memory stays flat however many students are exported. The web route renders
+inline: the single eventlet worker must not fork while it holds a streaming
+cursor. `flask export-feedback` renders in a process pool instead, with only
+a small window of renders in flight; only the parent touches the database.
+"""
+import itertools
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, func
+from werkzeug.utils import secure_filename
+from app import db
+from app.models import CommentFeedback, DebugBlockResult, Enrollment, User
+from app.services.debug_block_results import block_from_row
+from app.services.pdf_reports import render_comment_feedback_report, render_debug_feedback_report
+
+# Rows fetched per round trip from the streaming cursor
+EXPORT_FETCH_SIZE = 500
+
+
+class _ZipStream:
+    """Write-only file object whose contents are drained after each zip entry."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _student_filter(query, course_id):
+    if course_id is None:
+        return query.filter(User.role == 'student')
+    enrolled = db.session.query(Enrollment.student_id).filter(Enrollment.course_id == course_id)
+    return query.filter(User.id.in_(enrolled))
+
+
+def _comment_reports(section_id, course_id):
+    """Yield (username, filename, [(line_num, comment, feedback)]) per checked file."""
+    if section_id is None:
+        return
+    query = db.session.query(
+        User.username, CommentFeedback.filename, CommentFeedback.line_num,
+        CommentFeedback.comment, CommentFeedback.feedback,
+    ).join(User, User.id == CommentFeedback.user_id).filter(CommentFeedback.section_id == section_id)
+    query = _student_filter(query, course_id).order_by(
+        User.username, CommentFeedback.filename, CommentFeedback.line_num
+    ).yield_per(EXPORT_FETCH_SIZE)
+    for (username, filename), rows in itertools.groupby(query, key=lambda row: (row.username, row.filename)):
+        yield username, filename, [(row.line_num, row.comment, row.feedback) for row in rows]
+
+
+def _latest_versions():
+    """(user_id, filename, code_hash) of the most recently stored version of each file."""
+    latest_ids = db.session.query(func.max(DebugBlockResult.id)).group_by(
+        DebugBlockResult.user_id, DebugBlockResult.filename
+    )
+    return db.session.query(
+        DebugBlockResult.user_id, DebugBlockResult.filename, DebugBlockResult.code_hash,
+    ).filter(DebugBlockResult.id.in_(latest_ids)).subquery()
+
+
+def _debug_reports(course_id):
+    """Yield (username, filename, [DebugBlock]) for the latest checked version of each file."""
+    # checked_at is set per row, so blocks of one version differ by microseconds:
+    # pick the version first, then order its blocks by position only
+    latest = _latest_versions()
+    query = db.session.query(
+        User.username, DebugBlockResult.filename,
+        DebugBlockResult.start_line, DebugBlockResult.end_line, DebugBlockResult.lines,
+        DebugBlockResult.test, DebugBlockResult.issue, DebugBlockResult.fix,
+    ).join(User, User.id == DebugBlockResult.user_id).join(latest, and_(
+        latest.c.user_id == DebugBlockResult.user_id,
+        latest.c.filename == DebugBlockResult.filename,
+        latest.c.code_hash == DebugBlockResult.code_hash,
+    ))
+    query = _student_filter(query, course_id).order_by(
+        User.username, DebugBlockResult.filename, DebugBlockResult.block_index,
+    ).yield_per(EXPORT_FETCH_SIZE)
+    for (username, filename), rows in itertools.groupby(query, key=lambda row: (row.username, row.filename)):
+        yield username, filename, [block_from_row(row) for row in rows]
+
+
+def _arcname(username, filename, suffix):
+    """Zip path for a report; student-supplied names cannot escape the user's folder."""
+    parts = [secure_filename(part) for part in filename.replace('\\', '/').split('/')]
+    name = '/'.join(part for part in parts if part) or 'unnamed'
+    return f"{secure_filename(username) or 'user'}/{name}{suffix}"
+
+
+def _render(task):
+    """Process pool task: render one report and return (zip path, PDF bytes)."""
+    kind, username, filename, items, date = task
+    if kind == 'comments':
+        buffer = render_comment_feedback_report(filename, date, items)
+        return _arcname(username, filename, '_comment_feedback.pdf'), buffer.getvalue()
+    buffer = render_debug_feedback_report(filename, date, items)
+    return _arcname(username, filename, '_debug_blocks.pdf'), buffer.getvalue()
+
+
+def _tasks(section_id, course_id, date):
+    for username, filename, comments in _comment_reports(section_id, course_id):
+        yield 'comments', username, filename, comments, date
+    for username, filename, blocks in _debug_reports(course_id):
+        yield 'debug', username, filename, blocks, date
+
+
+def _default_workers():
+    return current_app.config.get('FEEDBACK_EXPORT_WORKERS', min(4, os.cpu_count() or 1))
+
+
+def _rendered(tasks, workers):
+    """Yield rendered reports in task order, keeping at most 2 * workers renders in flight."""
+    if workers <= 1:
+        for task in tasks:
+            yield _render(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(_render, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def stream_feedback_zip(section_id, course_id=None, workers=None):
+    """
+    Yield the bytes of a zip holding every student's feedback PDFs.
+
+    Students are those enrolled in `course_id`, or every student when it is
+    None. Must run inside an app context (use stream_with_context).
+    """
+    workers = _default_workers() if workers is None else workers
+    date = datetime.now().strftime('%Y-%m-%d')
+    out = _ZipStream()
+    count = 0
+    # PDFs are already compressed, so entries are stored as-is
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for arcname, data in _rendered(_tasks(section_id, course_id, date), workers):
+            archive.writestr(arcname, data)
+            count += 1
+            yield out.drain()
+    yield out.drain()
+    print(f"[FEEDBACK EXPORT] Streamed {count} report(s) for course {course_id or 'all'}")
@@ -0,0 +1,152 @@
+"""
+Per-course gradebook: enrolled students x assignments.
+
+Until now teachers could only open view_assignment one assignment at a time,
+and each page loaded every submission. The gradebook comes from a single
+query: enrolled students, left-joined to the course's assignments, then
+left-joined to each student's submission. The rows are pivoted into two
+flat arrays of students x assignments cells. array('d') holds the scores,
+with NaN where there is no score; array('b') holds the cell status. Cell
+(i, j) lives at i * columns + j, so a class-sized gradebook is a few tens
+of kilobytes with no per-cell Python objects. csv_lines() streams the whole
+matrix row by row for export.
+"""
+import csv
+import io
+import math
+from array import array
+from sqlalchemy import and_, select
+from app import db
+from app.models import Assignment, Enrollment, Submission, User
+
+MISSING = 0
+SUBMITTED = 1
+GRADED = 2
+
+STATUS_LABELS = {MISSING: '', SUBMITTED: 'submitted'}
+
+
+class Gradebook:
+    """Students (rows) x assignments (columns) with a score and status per cell."""
+
+    def __init__(self, students, assignments, scores, status):
+        self.students = students  # [(id, username, first_name, last_name)]
+        self.assignments = assignments  # [(id, title, max_points, due_date)]
+        self._scores = scores
+        self._status = status
+
+    @property
+    def columns(self):
+        return len(self.assignments)
+
+    def cell(self, row, column):
+        """(status, score) for one student/assignment; score is None unless graded."""
+        index = row * self.columns + column
+        status = self._status[index]
+        return status, (self._scores[index] if status == GRADED else None)
+
+    def row(self, row):
+        return [self.cell(row, column) for column in range(self.columns)]
+
+    def student_summary(self, row):
+        """(submitted count, mean % of max points over graded work or None)."""
+        start = row * self.columns
+        submitted = 0
+        percents = []
+        for column in range(self.columns):
+            status = self._status[start + column]
+            if status != MISSING:
+                submitted += 1
+            max_points = self.assignments[column][2]
+            if status == GRADED and max_points:
+                percents.append(self._scores[start + column] * 100.0 / max_points)
+        return submitted, (round(sum(percents) / len(percents), 1) if percents else None)
+
+    def assignment_means(self):
+        """Mean graded score per assignment column (None where nothing is graded)."""
+        means = []
+        for column in range(self.columns):
+            values = [
+                self._scores[row * self.columns + column]
+                for row in range(len(self.students))
+                if self._status[row * self.columns + column] == GRADED
+            ]
+            means.append(round(sum(values) / len(values), 1) if values else None)
+        return means
+
+    def csv_lines(self):
+        """Yield the gradebook as CSV text, one line per student after a header line."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush():
+            line = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return line
+
+        writer.writerow(['Username', 'First name', 'Last name']
+                        + [f"{title} (/{max_points})" for _, title, max_points, _ in self.assignments]
+                        + ['Submitted', 'Average %'])
+        yield flush()
+        for row, (_, username, first_name, last_name) in enumerate(self.students):
+            cells = []
+            for status, score in self.row(row):
+                cells.append(_format_score(score) if status == GRADED else STATUS_LABELS[status])
+            submitted, average = self.student_summary(row)
+            writer.writerow([username, first_name or '', last_name or ''] + cells
+                            + [submitted, '' if average is None else average])
+            yield flush()
+
+
+def _format_score(score):
+    return str(int(score)) if score == int(score) else f"{score:g}"
+
+
+def build_gradebook(course_id):
+    """Load and pivot the gradebook for `course_id` with one query."""
+    rows = db.session.execute(
+        select(
+            User.id, User.username, User.first_name, User.last_name,
+            Assignment.id, Assignment.title, Assignment.max_points, Assignment.due_date,
+            Submission.id, Submission.graded, Submission.score, Submission.submitted_at,
+        )
+        .select_from(Enrollment)
+        .join(User, User.id == Enrollment.student_id)
+        .outerjoin(Assignment, Assignment.course_id == Enrollment.course_id)
+        .outerjoin(Submission, and_(Submission.assignment_id == Assignment.id, Submission.student_id == User.id))
+        .where(Enrollment.course_id == course_id)
+    ).all()
+
+    students = {}
+    assignments = {}
+    for row in rows:
+        students.setdefault(row[0], tuple(row[0:4]))
+        if row[4] is not None:
+            assignments.setdefault(row[4], tuple(row[4:8]))
+    student_list = sorted(students.values(), key=lambda s: ((s[3] or '').lower(), (s[2] or '').lower(), s[1].lower()))
+    assignment_list = sorted(assignments.values(), key=lambda a: (a[3] is None, a[3] or 0, a[0]))
+    row_of = {student[0]: i for i, student in enumerate(student_list)}
+    column_of = {assignment[0]: j for j, assignment in enumerate(assignment_list)}
+
+    columns = len(assignment_list)
+    size = len(student_list) * columns
+    scores = array('d', [math.nan]) * size
+    status = array('b', [MISSING]) * size
+    latest = {}
+    for student_id, _, _, _, assignment_id, _, _, _, submission_id, graded, score, submitted_at in rows:
+        if submission_id is None:
+            continue
+        index = row_of[student_id] * columns + column_of[assignment_id]
+        # Several submissions for one cell: keep the most recent
+        order = (submitted_at is not None, submitted_at or 0, submission_id)
+        if index in latest and latest[index] >= order:
+            continue
+        latest[index] = order
+        if graded and score is not None:
+            status[index] = GRADED
+            scores[index] = score
+        else:
+            status[index] = SUBMITTED
+            scores[index] = math.nan
+    return Gradebook(student_list, assignment_list, scores, status)
@@ -0,0 +1,90 @@
+"""
+Which of a course's lessons a student has completed, for view_course.
+
+view_course used to run one LessonProgress query per lesson, filtering on a
+lesson_id column that LessonProgress does not have. Progress is recorded per
+section: a lesson counts as completed once every one of its sections has a
+completed LessonProgress row, the same rule record_lesson_completion()
+uses. One grouped query now returns the completed lessons of a course. The
+result is memoised per (student, course) as an int bitmap over the course's
+lessons in display order: bit i is set when the i-th lesson is complete.
+Each entry also stores the lesson ids it was built for, so adding,
+removing or reordering lessons simply misses the cache. complete_lesson drops
+the entry through invalidate_lesson_progress(). LESSON_PROGRESS_TTL_SECONDS
+bounds staleness from other workers and from sections added to a lesson.
+"""
+import time
+from flask import current_app
+from sqlalchemy import func, select
+from app import db
+from app.models import Lesson, LessonProgress, Section
+from app.services.cache import SizedLRUCache
+
+DEFAULT_CACHE_BYTES = 1024 * 1024
+DEFAULT_TTL_SECONDS = 300
+
+_cache = None
+
+
+def _entry_size(entry):
+    _, lesson_ids, _ = entry
+    return 128 + 8 * len(lesson_ids)
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        max_bytes = current_app.config.get('LESSON_PROGRESS_CACHE_BYTES', DEFAULT_CACHE_BYTES)
+        _cache = SizedLRUCache(max_bytes, sizeof=_entry_size)
+    return _cache
+
+
+def completed_lesson_ids(student_id, course_id):
+    """Ids of the course's lessons whose sections are all completed by the student (one query)."""
+    return set(db.session.execute(
+        select(Section.lesson_id)
+        .join(Lesson, Lesson.id == Section.lesson_id)
+        .outerjoin(
+            LessonProgress,
+            (LessonProgress.section_id == Section.id)
+            & (LessonProgress.student_id == student_id)
+            & LessonProgress.completed.is_(True),
+        )
+        .where(Lesson.course_id == course_id)
+        .group_by(Section.lesson_id)
+        .having(func.count(func.distinct(LessonProgress.section_id)) == func.count(func.distinct(Section.id)))
+    ).scalars())
+
+
+def progress_bitmap(student_id, course_id, lesson_ids):
+    """
+    Completion bitmap for `lesson_ids` (the course's lessons in display
+    order): bit i is set when lesson_ids[i] is completed.
+    """
+    lesson_ids = tuple(lesson_ids)
+    key = (student_id, course_id)
+    cache = _get_cache()
+    entry = cache.get(key)
+    now = time.monotonic()
+    if entry is not None and entry[0] > now and entry[1] == lesson_ids:
+        return entry[2]
+    completed = completed_lesson_ids(student_id, course_id)
+    bitmap = 0
+    for position, lesson_id in enumerate(lesson_ids):
+        if lesson_id in completed:
+            bitmap |= 1 << position
+    ttl = current_app.config.get('LESSON_PROGRESS_TTL_SECONDS', DEFAULT_TTL_SECONDS)
+    cache.set(key, (now + ttl, lesson_ids, bitmap))
+    return bitmap
+
+
+def lesson_completion(student_id, course_id, lessons):
+    """{lesson id: completed} for `lessons`, ordered as the course page lists them."""
+    lesson_ids = [lesson.id for lesson in lessons]
+    bitmap = progress_bitmap(student_id, course_id, lesson_ids)
+    return {lesson_id: bool(bitmap >> position & 1) for position, lesson_id in enumerate(lesson_ids)}
+
+
+def invalidate_lesson_progress(student_id, course_id):
+    """Forget the memoised bitmap after the student's progress in `course_id` changed."""
+    _get_cache().pop((student_id, course_id))
@@ -0,0 +1,149 @@
+"""
+On-disk cache of generated feedback PDFs.
+
+Students download the same feedback report again and again. Each rendered
+PDF is written to PDF_CACHE_DIR under a key built from the user, filename,
+a hash of the report content, the report type, the template version and
+the report date. A repeat download is then a plain send_file() of the
+cached file. The key doubles as the ETag, so a browser revalidating a GET
+download gets a 304 without any rendering.
+
+File modification times act as the LRU clock: hits touch the file, and once
+the directory grows past PDF_CACHE_MAX_BYTES the oldest files are removed
+until it is back under 90% of the budget. The directory may be shared by
+several worker processes; every write is atomic (temp file + rename).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from flask import current_app, send_file
+from app.services.pdf_reports import REPORT_TEMPLATE_VERSION
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_lock = threading.Lock()
+# Estimated bytes in the cache directory, per directory; rescanned when over budget
+_estimated_bytes = {}
+
+
+def _cache_dir():
+    return current_app.config.get('PDF_CACHE_DIR') or os.path.join(current_app.instance_path, 'pdf_cache')
+
+
+def _max_bytes():
+    return current_app.config.get('PDF_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+
+
+def content_hash(*parts):
+    """SHA256 over the inputs a report is drawn from (code, comments, blocks...)."""
+    # JSON, so tuples and the lists they come back as from the caches hash alike
+    return hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+
+
+def cache_key(user_id, filename, code_hash, report, date):
+    raw = '\0'.join(str(part) for part in (user_id, filename, code_hash, report, REPORT_TEMPLATE_VERSION, date))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _path_for(key):
+    return os.path.join(_cache_dir(), key[:2], key + '.pdf')
+
+
+def cached_pdf(key):
+    """Path of the cached PDF for `key`, marking it recently used, or None."""
+    path = _path_for(key)
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def _scan(directory):
+    entries = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if not name.endswith('.pdf'):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+
+def _scan_total(directory):
+    return sum(size for _, size, _ in _scan(directory))
+
+
+def _evict(directory, max_bytes):
+    """Remove least recently used files until the directory is under 90% of the budget."""
+    entries = _scan(directory)
+    total = sum(size for _, size, _ in entries)
+    if total > max_bytes:
+        target = max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+    return total
+
+
+def store_pdf(key, buffer):
+    """Write the rendered PDF for `key` and return its path, or None if it could not be written."""
+    path = _path_for(key)
+    data = buffer.getvalue()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Don't leave a partial temp file behind in the cache directory
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    except OSError as e:
+        print(f"[PDF CACHE] Warning: could not write {path}: {e}")
+        return None
+    directory = _cache_dir()
+    max_bytes = _max_bytes()
+    with _lock:
+        total = _estimated_bytes.get(directory)
+        total = _scan_total(directory) if total is None else total + len(data)
+        if total > max_bytes:
+            total = _evict(directory, max_bytes)
+        _estimated_bytes[directory] = total
+    return path if os.path.exists(path) else None
+
+
+def send_cached_pdf(key, render, download_name):
+    """
+    Send the PDF for `key`, calling `render()` (which returns a BytesIO) only on a miss.
+
+    Responses carry the key as a strong ETag and must be revalidated, so an
+    unchanged report is answered with 304 Not Modified on conditional GETs.
+    """
+    path = cached_pdf(key)
+    if path is None:
+        buffer = render()
+        path = store_pdf(key, buffer)
+        if path is None:
+            buffer.seek(0)
+            return send_file(buffer, as_attachment=True, download_name=download_name, mimetype='application/pdf')
+    response = send_file(path, as_attachment=True, download_name=download_name, mimetype='application/pdf',
+                         etag=key, conditional=True, max_age=0)
+    response.cache_control.private = True
+    return response
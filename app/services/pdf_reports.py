@@ -0,0 +1,202 @@
+"""
+Shared PDF rendering for the comment and debug checker downloads.
+
+Every checker PDF is a title block, optionally the submitted code, then a
+list of items (a comment or DEBUG block) each followed by its feedback.
+ReportWriter lays these out on a PageTemplate and handles page breaks.
+All text on a page is drawn through a single text object rather than one
+drawString() call per line.
+
+Text is wrapped with the same greedy algorithm as reportlab's simpleSplit().
+Font objects and per-word widths are cached, and wrapped lines are memoised,
+because the same feedback messages repeat on every report.
+
+reportlab's canvas and font modules take longer to import than the rest of
+the app's routes put together, so they are imported on first render.
+"""
+import io
+from collections import namedtuple
+from functools import lru_cache
+from reportlab.lib.pagesizes import A4, letter
+
+# left = x of the text column; top/bottom = page margins in points
+PageTemplate = namedtuple('PageTemplate', ['pagesize', 'left', 'top', 'bottom'])
+
+LETTER_REPORT = PageTemplate(letter, 40, 40, 60)
+A4_REPORT = PageTemplate(A4, 50, 50, 80)
+
+# Bump when the layout changes so cached PDFs (app/services/pdf_cache.py) are redrawn
+REPORT_TEMPLATE_VERSION = 1
+
+FEEDBACK_COLOR = (0.2, 0.2, 0.7)
+BLACK = (0, 0, 0)
+
+WRAP_CACHE_SIZE = 4096
+# Per-font word width entries kept before the table is cleared
+WORD_WIDTH_CACHE_SIZE = 50000
+
+_word_widths = {}
+
+
+@lru_cache(maxsize=None)
+def _font(name):
+    from reportlab.pdfbase.pdfmetrics import getFont
+    return getFont(name)
+
+
+def string_width(text, font, size):
+    """Width of `text` in points, caching the width of each word seen."""
+    widths = _word_widths.setdefault((font, size), {})
+    width = widths.get(text)
+    if width is None:
+        if len(widths) >= WORD_WIDTH_CACHE_SIZE:
+            widths.clear()
+        width = widths[text] = _font(font).stringWidth(text, size)
+    return width
+
+
+@lru_cache(maxsize=WRAP_CACHE_SIZE)
+def wrap_text(text, font, size, max_width):
+    """Split `text` into lines no wider than `max_width`, like simpleSplit()."""
+    lines = []
+    space = string_width(' ', font, size)
+    for paragraph in text.split('\n'):
+        words = []
+        width = -space
+        for word in paragraph.split():
+            word_width = string_width(word, font, size)
+            if width + space + word_width <= max_width or not words:
+                words.append(word)
+                width += space + word_width
+            else:
+                lines.append(' '.join(words))
+                words = [word]
+                width = word_width
+        if words:
+            lines.append(' '.join(words))
+    return tuple(lines)
+
+
+class ReportWriter:
+    """Write lines top to bottom on a PageTemplate, starting new pages as needed."""
+
+    def __init__(self, template=LETTER_REPORT):
+        from reportlab.pdfgen import canvas
+        self.template = template
+        self.width, self.height = template.pagesize
+        self.buffer = io.BytesIO()
+        self.canvas = canvas.Canvas(self.buffer, pagesize=template.pagesize)
+        self.y = self.height - template.top
+        self._start_text()
+
+    def _start_text(self):
+        self.text = self.canvas.beginText()
+        self._font = None
+        self._color = BLACK
+
+    def _set_style(self, font, size, color):
+        if self._font != (font, size):
+            self.text.setFont(font, size)
+            self._font = (font, size)
+        if self._color != color:
+            self.text.setFillColorRGB(*color)
+            self._color = color
+
+    def new_page(self):
+        self.canvas.drawText(self.text)
+        self.canvas.showPage()
+        self.y = self.height - self.template.top
+        self._start_text()
+
+    def line(self, text, font='Helvetica', size=10, leading=12, indent=0, color=BLACK):
+        """Draw one line at the current position and move down by `leading`."""
+        if self.y < self.template.bottom:
+            self.new_page()
+        self._set_style(font, size, color)
+        self.text.setTextOrigin(self.template.left + indent, self.y)
+        self.text.textOut(text)
+        self.y -= leading
+
+    def wrapped(self, text, font='Helvetica', size=10, leading=12, indent=0, color=BLACK):
+        """Draw `text` wrapped to the width left of the column after `indent`."""
+        max_width = self.width - 2 * self.template.left - indent
+        for row in wrap_text(text, font, size, max_width):
+            self.line(row, font, size, leading, indent, color)
+
+    def space(self, points):
+        self.y -= points
+
+    def title_block(self, title, date, subtitle=None, title_size=16):
+        self.line(title, 'Helvetica-Bold', title_size, leading=28)
+        self.line(f"Date: {date}", 'Helvetica', 12, leading=30)
+        if subtitle:
+            self.line(subtitle, 'Helvetica-Bold', 13, leading=28)
+
+    def code(self, code, empty_text=None):
+        """The submitted source in a small monospace font, one row per line."""
+        self.line("Code:", 'Helvetica', 11, leading=18)
+        rows = code.splitlines() if code.strip() else ([empty_text] if empty_text else [])
+        for row in rows:
+            self.line(row, 'Courier', 9, leading=12, indent=10)
+        self.space(18)
+
+    def finish(self):
+        """Close the document and return the PDF as a rewound BytesIO."""
+        self.canvas.drawText(self.text)
+        self.canvas.save()
+        self.buffer.seek(0)
+        return self.buffer
+
+
+def render_comments_report(filename, date, code, comments):
+    """Code plus extracted comments and feedback; `comments` is [(line_num, comment, feedback)]."""
+    report = ReportWriter(LETTER_REPORT)
+    report.title_block(f"Extracted Comments for: {filename}", date, title_size=14)
+    report.code(code)
+    report.line("Extracted Comments and Feedback:", 'Helvetica-Bold', 12, leading=18)
+    if not comments:
+        report.line("No comments found.", indent=10)
+    for line_num, comment, feedback in comments:
+        report.wrapped(f"Line {line_num}: {comment}", indent=10)
+        report.wrapped(f"Feedback: {feedback}", 'Helvetica-Oblique', 9, indent=30)
+        report.space(4)
+    return report.finish()
+
+
+def render_comment_feedback_report(filename, date, comments):
+    """Lesson 1 feedback sheet: each comment with its feedback, no code listing."""
+    report = ReportWriter(A4_REPORT)
+    report.title_block(filename, date, "Lesson 1: Comment Checker - Feedback")
+    report.space(12)
+    for line_num, comment, feedback in comments:
+        report.wrapped(f"Line {line_num}: {comment}", size=12, leading=16)
+        report.wrapped(f"Feedback: {feedback}", size=12, leading=16, indent=20, color=FEEDBACK_COLOR)
+        report.space(10)
+    return report.finish()
+
+
+def render_debug_report(filename, date, code, blocks):
+    """Code plus each DebugBlock's lines and feedback."""
+    report = ReportWriter(LETTER_REPORT)
+    report.title_block(filename, date, "Lesson 2: Debug Checker - Extracted Debug Blocks")
+    report.code(code, empty_text="(No code provided)")
+    report.line("Extracted Debug Blocks and Feedback:", 'Helvetica-Bold', 12, leading=18)
+    for block in blocks:
+        for line_num, text in block.lines:
+            report.wrapped(f"{line_num}: {text}", indent=10)
+        report.wrapped(f"Feedback: {block.feedback}", 'Helvetica-Oblique', 9, indent=30, color=FEEDBACK_COLOR)
+        report.space(10)
+    return report.finish()
+
+
+def render_debug_feedback_report(filename, date, blocks):
+    """Lesson 2 feedback sheet: each DebugBlock's lines and feedback, no code listing."""
+    report = ReportWriter(A4_REPORT)
+    report.title_block(filename, date, "Lesson 2: Debug Checker - Extracted Debug Blocks")
+    report.space(12)
+    for block in blocks:
+        for line_num, text in block.lines:
+            report.wrapped(f"{line_num}: {text}", size=12, leading=16)
+        report.wrapped(f"Feedback: {block.feedback}", size=12, leading=16, indent=20, color=FEEDBACK_COLOR)
+        report.space(10)
+    return report.finish()
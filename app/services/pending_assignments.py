@@ -0,0 +1,36 @@
+"""
+Pending assignments for the student dashboard.
+
+The dashboards used to walk enrollments -> assignments and run one
+Submission lookup per assignment, then keep the first five. This is a
+single anti-join instead: assignments in any course the student is enrolled
+in, with no submission from that student, soonest due date first (undated
+ones last), limited in SQL.
+"""
+from sqlalchemy import exists
+from app import db
+from app.models import Assignment, Enrollment, Submission
+
+DASHBOARD_LIMIT = 5
+
+
+def pending_assignments_query(student_id):
+    enrolled = exists().where(
+        Enrollment.course_id == Assignment.course_id,
+        Enrollment.student_id == student_id,
+    )
+    submitted = exists().where(
+        Submission.assignment_id == Assignment.id,
+        Submission.student_id == student_id,
+    )
+    return db.select(Assignment).where(enrolled, ~submitted).order_by(
+        Assignment.due_date.is_(None), Assignment.due_date, Assignment.id
+    )
+
+
+def pending_assignments_for(student_id, limit=DASHBOARD_LIMIT):
+    """Up to `limit` unsubmitted assignments for the student, in one query."""
+    query = pending_assignments_query(student_id)
+    if limit is not None:
+        query = query.limit(limit)
+    return db.session.execute(query).scalars().all()
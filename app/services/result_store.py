@@ -0,0 +1,125 @@
+"""
+Server-side store for comment and debug checker results.
+
+The checkers used to keep extracted comments and DEBUG blocks in the signed
+cookie session, which is resent with every request and silently breaks past
+the browser cookie size limit. Results now live in the checker_results table
+and the cookie only carries a short random token. Signed-in users' results
+are looked up by user id, so they follow the student across devices.
+
+Rows not updated for CHECKER_RESULT_TTL_SECONDS are ignored on read and
+deleted at most once every CHECKER_RESULT_PURGE_SECONDS per process.
+"""
+import json
+import secrets
+import time
+from datetime import datetime, timedelta
+from flask import current_app, g, session
+from flask_login import current_user
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import CheckerResult
+
+SESSION_KEY = 'checker_result_token'
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_PURGE_SECONDS = 3600
+
+# Cookie keys written by earlier versions; dropped the next time results are saved
+LEGACY_SESSION_KEYS = (
+    'extracted_debug_blocks', 'lesson2_debug_blocks', 'uploaded_filename',
+    'uploaded_code', 'extracted_comments', 'comment_lines', 'feedback_dict',
+)
+
+_last_purge = None
+
+
+def _ttl():
+    return timedelta(seconds=current_app.config.get('CHECKER_RESULT_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+
+
+def _user_id():
+    return current_user.id if current_user.is_authenticated else None
+
+
+def _find_entry():
+    user_id = _user_id()
+    if user_id is not None:
+        return CheckerResult.query.filter_by(user_id=user_id).first()
+    token = session.get(SESSION_KEY)
+    if not token:
+        return None
+    return CheckerResult.query.filter_by(token=token, user_id=None).first()
+
+
+def _load():
+    """Return (entry, data) for the current user or session, once per request."""
+    if 'checker_result' not in g:
+        entry = _find_entry()
+        data = {}
+        if entry is not None and entry.updated_at and entry.updated_at >= datetime.utcnow() - _ttl():
+            data = json.loads(entry.data)
+        g.checker_result = (entry, data)
+    return g.checker_result
+
+
+def get_result(key, default=None):
+    """Return a stored checker result for the current user or session."""
+    return _load()[1].get(key, default)
+
+
+def has_result(key):
+    return key in _load()[1]
+
+
+def save_results(**values):
+    """
+    Merge `values` into the stored results and commit.
+
+    Values must be JSON serialisable; tuples come back as lists.
+    """
+    entry, data = _load()
+    data = dict(data, **values)
+    if entry is None:
+        entry = CheckerResult(token=secrets.token_hex(16), user_id=_user_id())
+        db.session.add(entry)
+    entry.data = json.dumps(data)
+    entry.updated_at = datetime.utcnow()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request created this user's row first; update that one
+        db.session.rollback()
+        entry = _find_entry()
+        entry.data = json.dumps(data)
+        entry.updated_at = datetime.utcnow()
+        db.session.commit()
+    session[SESSION_KEY] = entry.token
+    for key in LEGACY_SESSION_KEYS:
+        session.pop(key, None)
+    g.checker_result = (entry, data)
+    _maybe_purge()
+
+
+def purge_expired():
+    """Delete results older than the TTL and return how many were removed."""
+    cutoff = datetime.utcnow() - _ttl()
+    deleted = CheckerResult.query.filter(CheckerResult.updated_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def _maybe_purge():
+    global _last_purge
+    interval = current_app.config.get('CHECKER_RESULT_PURGE_SECONDS', DEFAULT_PURGE_SECONDS)
+    now = time.monotonic()
+    if _last_purge is not None and now - _last_purge < interval:
+        return
+    _last_purge = now
+    try:
+        deleted = purge_expired()
+        if deleted:
+            print(f"[CHECKER RESULTS] Purged {deleted} expired result(s)")
+    except Exception as e:
+        db.session.rollback()
+        print(f"[CHECKER RESULTS] Warning: could not purge expired results: {e}")
@@ -0,0 +1,100 @@
+"""
+Paginated user roster for the admin page.
+
+admin.index and bulk_upload used to load every user, then lazy-load each
+user's enrollments and each enrollment's course, to build the
+users-by-courses grid. That was two queries per user on every view and
+every enrol/unenrol POST. The roster is now read one page at a time with
+keyset pagination: users with an id greater than the last id on the
+previous page, in id order, so later pages cost no more than the first.
+Pages can be filtered by role or by enrolled course in SQL. Each page's
+enrollments are fetched by one selectinload. Enrolling and unenrolling are
+single-row JSON actions (set_enrollment()), not a re-render of the whole
+roster.
+"""
+from flask import current_app
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import selectinload
+from app import db
+from app.models import Course, Enrollment, User
+from app.services.teacher_stats import invalidate_teacher_stats
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+ROLES = ('student', 'teacher')
+
+
+def page_size(requested=None):
+    default = current_app.config.get('ROSTER_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    if not requested or requested < 1:
+        return default
+    return min(requested, MAX_PAGE_SIZE)
+
+
+def _filtered(query, course_id=None, role=None):
+    if role in ROLES:
+        query = query.where(User.role == role)
+    if course_id:
+        query = query.where(exists().where(Enrollment.student_id == User.id, Enrollment.course_id == course_id))
+    return query
+
+
+def roster_page(after_id=None, course_id=None, role=None, limit=None):
+    """
+    Return (users, next_after) for one page of the roster. Each user has its
+    enrollments loaded. next_after is the id to pass as after_id for the
+    following page, or None on the last page.
+    """
+    limit = page_size(limit)
+    query = _filtered(select(User), course_id, role).options(selectinload(User.enrollments)).order_by(User.id)
+    if after_id:
+        query = query.where(User.id > after_id)
+    users = db.session.execute(query.limit(limit + 1)).scalars().all()
+    if len(users) > limit:
+        users = users[:limit]
+        return users, users[-1].id
+    return users, None
+
+
+def roster_count(course_id=None, role=None):
+    return db.session.execute(_filtered(select(func.count(User.id)), course_id, role)).scalar()
+
+
+def enrolled_course_ids(users):
+    """{user id: set of course ids} for users loaded by roster_page()."""
+    return {user.id: {enrollment.course_id for enrollment in user.enrollments} for user in users}
+
+
+def serialize_user(user):
+    return {
+        'id': user.id,
+        'username': user.username,
+        'role': user.role,
+        'course_ids': sorted({enrollment.course_id for enrollment in user.enrollments}),
+    }
+
+
+def set_enrollment(user_id, course_id, enrolled):
+    """
+    Enrol (enrolled=True) or unenrol a user, committing the change.
+    Returns (changed, message), or raises LookupError for an unknown user or course.
+    """
+    user = db.session.get(User, user_id)
+    course = db.session.get(Course, course_id)
+    if not user or not course:
+        raise LookupError('Invalid user or course.')
+    enrollments = Enrollment.query.filter_by(student_id=user_id, course_id=course_id).all()
+    if enrolled:
+        if enrollments:
+            return False, f'{user.username} is already enrolled in {course.title}.'
+        db.session.add(Enrollment(student_id=user_id, course_id=course_id))
+        message = f'{user.username} enrolled in {course.title}.'
+    else:
+        if not enrollments:
+            return False, f'{user.username} is not enrolled in {course.title}.'
+        for enrollment in enrollments:
+            db.session.delete(enrollment)
+        message = f'{user.username} unenrolled from {course.title}.'
+    db.session.commit()
+    invalidate_teacher_stats(course.teacher_id)
+    return True, message
@@ -0,0 +1,108 @@
+"""
+Startup check that the database is at the latest Alembic migration.
+
+create_app() used to reflect comment_feedback on every boot and ALTER the
+table when code_hash was missing. Schema changes now live only in
+migrations/versions. At startup, a fingerprint of that folder (file names,
+sizes and mtimes, plus the database URL) is compared with the one cached in
+SCHEMA_FINGERPRINT_FILE after the last good check. When they match, startup
+makes no database round trips at all. When they differ, for example after a
+deploy that adds a migration, one SELECT on alembic_version is compared with
+the migration heads. The heads are read from the files with a regex, without
+importing Alembic. A match refreshes the cache; a mismatch prints a warning
+to run `flask db upgrade`.
+"""
+import hashlib
+import json
+import os
+import re
+from sqlalchemy import text
+
+REVISION_REGEX = re.compile(r"^revision\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+DOWN_REVISION_REGEX = re.compile(r"^down_revision\s*=\s*(.+)$", re.MULTILINE)
+QUOTED_REGEX = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+def versions_dir(app):
+    return os.path.join(os.path.dirname(app.root_path), 'migrations', 'versions')
+
+
+def _migration_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.py'))
+
+
+def fingerprint(directory, database_url):
+    digest = hashlib.sha256(database_url.encode('utf-8'))
+    for name in _migration_files(directory):
+        stat = os.stat(os.path.join(directory, name))
+        digest.update(f"\0{name}\0{stat.st_size}\0{stat.st_mtime_ns}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def migration_heads(directory):
+    """Revision ids that no other migration names as its down_revision."""
+    revisions = set()
+    parents = set()
+    for name in _migration_files(directory):
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            source = f.read()
+        revision = REVISION_REGEX.search(source)
+        if not revision:
+            continue
+        revisions.add(revision.group(1))
+        down = DOWN_REVISION_REGEX.search(source)
+        if down:
+            parents.update(QUOTED_REGEX.findall(down.group(1)))
+    return revisions - parents
+
+
+def _fingerprint_file(app):
+    return app.config.get('SCHEMA_FINGERPRINT_FILE') or os.path.join(app.instance_path, 'schema_fingerprint.json')
+
+
+def _read_cached(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('fingerprint')
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached(path, value, heads):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': value, 'heads': sorted(heads)}, f)
+    except OSError as e:
+        print(f"[DB INIT] Warning: could not cache schema fingerprint: {e}")
+
+
+def check_schema(app, db):
+    """
+    Warn if the database is behind the migrations on disk.
+
+    Returns 'cached' (no queries), 'verified', 'outdated', 'unknown' or
+    'skipped' (SCHEMA_CHECK = 'off' or no migrations folder).
+    """
+    directory = versions_dir(app)
+    if app.config.get('SCHEMA_CHECK', 'cached') == 'off' or not os.path.isdir(directory):
+        return 'skipped'
+    current = fingerprint(directory, app.config.get('SQLALCHEMY_DATABASE_URI') or '')
+    path = _fingerprint_file(app)
+    if _read_cached(path) == current:
+        return 'cached'
+    heads = migration_heads(directory)
+    with app.app_context():
+        try:
+            applied = {row[0] for row in db.session.execute(text('SELECT version_num FROM alembic_version'))}
+        except Exception as e:
+            db.session.rollback()
+            print(f"[DB INIT] Warning: could not read the migration version ({e.__class__.__name__}); run `flask db upgrade`")
+            return 'unknown'
+        finally:
+            db.session.remove()
+    if applied != heads:
+        print(f"[DB INIT] Warning: database is at {sorted(applied)}, migrations head is {sorted(heads)}; run `flask db upgrade`")
+        return 'outdated'
+    _write_cached(path, current, heads)
+    return 'verified'
@@ -0,0 +1,160 @@
+"""
+Score distributions for assignments, quizzes and rubric criteria.
+
+The grading dashboard used to compute only the count, graded count and mean
+with list comprehensions over Submission objects. The scores are now
+selected as flat columns, with no ORM objects, and loaded into NumPy arrays.
+Percentiles, histograms, means and standard deviations are computed over
+the whole array. Per-group statistics (per rubric criterion, per course)
+use one np.unique / np.bincount pass instead of a Python loop over rows, so
+a year of attempts across every course is a few array operations.
+
+Assignment scores are stored in points, so course-level views convert them
+to a percentage of Assignment.max_points in SQL. Quiz attempt scores are
+already percentages.
+"""
+from itertools import chain
+import numpy as np
+from sqlalchemy import func, select
+from app import db
+from app.models import Assignment, GradeDetail, Quiz, QuizAttempt, RubricCriterion, Submission
+
+PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_BINS = 10
+
+
+def _column(stmt):
+    """Run a one-column SELECT and return the non-null values as a float64 array."""
+    return np.fromiter(
+        (value for value in db.session.execute(stmt).scalars() if value is not None),
+        dtype=np.float64,
+    )
+
+
+def _columns(stmt, width):
+    """Run a SELECT of non-null numeric columns and return it as a (rows, width) float64 array."""
+    rows = db.session.execute(stmt).all()
+    # Flattening the rows is much faster than np.asarray() probing each Row as a sequence
+    flat = np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=len(rows) * width)
+    return flat.reshape(len(rows), width)
+
+
+def _round(value):
+    return round(float(value), 2)
+
+
+def summarize(values, low=0.0, high=100.0, bins=HISTOGRAM_BINS):
+    """
+    Count, mean, standard deviation, min/max, percentiles and a histogram
+    over [low, high] for a 1-D array of scores. Statistics are None when
+    there are no values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    edges = np.linspace(low, high, bins + 1)
+    counts, _ = np.histogram(np.clip(values, low, high), bins=edges)
+    summary = {
+        'count': int(values.size),
+        'mean': None,
+        'std': None,
+        'min': None,
+        'max': None,
+        'percentiles': {str(p): None for p in PERCENTILES},
+        'histogram': {'edges': [_round(e) for e in edges], 'counts': counts.tolist()},
+    }
+    if values.size:
+        summary.update({
+            'mean': _round(values.mean()),
+            'std': _round(values.std()),
+            'min': _round(values.min()),
+            'max': _round(values.max()),
+            'percentiles': dict(zip((str(p) for p in PERCENTILES), (_round(v) for v in np.percentile(values, PERCENTILES)))),
+        })
+    return summary
+
+
+def grouped_stats(keys, values):
+    """Per-key count, mean and standard deviation in one np.unique / np.bincount pass."""
+    if not len(keys):
+        return {}
+    unique, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse)
+    sums = np.bincount(inverse, weights=values)
+    squares = np.bincount(inverse, weights=values * values)
+    means = sums / counts
+    stds = np.sqrt(np.maximum(squares / counts - means * means, 0.0))
+    return {
+        int(key): {'count': int(count), 'mean': _round(mean), 'std': _round(std)}
+        for key, count, mean, std in zip(unique, counts, means, stds)
+    }
+
+
+def assignment_analytics(assignment):
+    """Graded-score distribution and per-criterion statistics for one assignment."""
+    submitted, graded = db.session.execute(
+        select(func.count(Submission.id), func.count(Submission.id).filter(Submission.graded.is_(True)))
+        .where(Submission.assignment_id == assignment.id)
+    ).one()
+    scores = _column(
+        select(Submission.score).where(Submission.assignment_id == assignment.id, Submission.graded.is_(True))
+    )
+    details = _columns(
+        select(GradeDetail.criterion_id, GradeDetail.points_awarded)
+        .join(Submission, Submission.id == GradeDetail.submission_id)
+        .where(Submission.assignment_id == assignment.id, GradeDetail.points_awarded.isnot(None)),
+        2,
+    )
+    per_criterion = grouped_stats(details[:, 0].astype(np.int64), details[:, 1])
+    criteria = []
+    if per_criterion:
+        for criterion in RubricCriterion.query.filter(RubricCriterion.id.in_(list(per_criterion))).order_by(RubricCriterion.order):
+            criteria.append({'id': criterion.id, 'name': criterion.name, 'points': criterion.points, **per_criterion[criterion.id]})
+    return {
+        'assignment_id': assignment.id,
+        'max_points': assignment.max_points,
+        'submitted': submitted,
+        'graded': graded,
+        'pending': submitted - graded,
+        'scores': summarize(scores, 0, assignment.max_points or 100),
+        'criteria': criteria,
+    }
+
+
+def course_score_analytics(course_ids):
+    """
+    Assignment (as % of max points) and quiz score distributions across
+    `course_ids`, overall and per course.
+    """
+    if not course_ids:
+        return {'assignments': summarize([]), 'quizzes': summarize([]), 'courses': {}}
+    assignment_scores = _columns(
+        select(Assignment.course_id, Submission.score * 100.0 / Assignment.max_points)
+        .select_from(Submission)
+        .join(Assignment, Assignment.id == Submission.assignment_id)
+        .where(
+            Assignment.course_id.in_(course_ids),
+            Assignment.max_points > 0,
+            Submission.graded.is_(True),
+            Submission.score.isnot(None),
+        ),
+        2,
+    )
+    quiz_scores = _columns(
+        select(Quiz.course_id, QuizAttempt.score)
+        .select_from(QuizAttempt)
+        .join(Quiz, Quiz.id == QuizAttempt.quiz_id)
+        .where(Quiz.course_id.in_(course_ids), QuizAttempt.score.isnot(None)),
+        2,
+    )
+    per_course_assignments = grouped_stats(assignment_scores[:, 0].astype(np.int64), assignment_scores[:, 1])
+    per_course_quizzes = grouped_stats(quiz_scores[:, 0].astype(np.int64), quiz_scores[:, 1])
+    return {
+        'assignments': summarize(assignment_scores[:, 1]),
+        'quizzes': summarize(quiz_scores[:, 1]),
+        'courses': {
+            course_id: {
+                'assignments': per_course_assignments.get(course_id),
+                'quizzes': per_course_quizzes.get(course_id),
+            }
+            for course_id in course_ids
+        },
+    }
@@ -0,0 +1,123 @@
+"""
+Headline statistics for a teacher's admin pages.
+
+admin.index and admin.dashboard used to count students, enrollments and
+submissions by lazy-loading every course's enrollments, assignments and
+submissions into Python. Here the same numbers come from a few GROUP BY
+queries per teacher: enrollments and distinct students, submissions with
+the ungraded count and average score, and lessons per course. Results are
+memoised per teacher for TEACHER_STATS_TTL_SECONDS. Submissions, grading and
+enrolment changes in this process drop the entry through
+invalidate_teacher_stats(). The TTL bounds how stale another worker's view
+can get.
+"""
+import time
+from flask import current_app
+from sqlalchemy import case, func, select
+from app import db
+from app.models import Assignment, Course, Enrollment, Lesson, Submission
+from app.services.cache import SizedLRUCache
+
+DEFAULT_CACHE_BYTES = 1024 * 1024
+DEFAULT_TTL_SECONDS = 60
+
+_cache = None
+
+
+def _stats_size(entry):
+    _, stats = entry
+    return 256 + 96 * len(stats['courses'])
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        max_bytes = current_app.config.get('TEACHER_STATS_CACHE_BYTES', DEFAULT_CACHE_BYTES)
+        _cache = SizedLRUCache(max_bytes, sizeof=_stats_size)
+    return _cache
+
+
+def _query_stats(teacher_id):
+    teacher_courses = select(Course.id).where(Course.teacher_id == teacher_id)
+    courses = {}
+
+    def course(course_id):
+        return courses.setdefault(course_id, {'enrollments': 0, 'lessons': 0, 'submissions': 0, 'ungraded': 0})
+
+    for course_id, count in db.session.execute(
+        select(Enrollment.course_id, func.count(Enrollment.id))
+        .where(Enrollment.course_id.in_(teacher_courses))
+        .group_by(Enrollment.course_id)
+    ):
+        course(course_id)['enrollments'] = count
+
+    for course_id, count in db.session.execute(
+        select(Lesson.course_id, func.count(Lesson.id))
+        .where(Lesson.course_id.in_(teacher_courses))
+        .group_by(Lesson.course_id)
+    ):
+        course(course_id)['lessons'] = count
+
+    score_sum = 0
+    scored = 0
+    for course_id, count, ungraded, course_score_sum, course_scored in db.session.execute(
+        select(
+            Assignment.course_id,
+            func.count(Submission.id),
+            func.sum(case((Submission.graded.is_(True), 0), else_=1)),
+            func.sum(case((Submission.graded.is_(True), Submission.score))),
+            func.count(case((Submission.graded.is_(True), Submission.score))),
+        )
+        .join(Assignment, Assignment.id == Submission.assignment_id)
+        .where(Assignment.course_id.in_(teacher_courses))
+        .group_by(Assignment.course_id)
+    ):
+        entry = course(course_id)
+        entry['submissions'] = count
+        entry['ungraded'] = ungraded or 0
+        score_sum += course_score_sum or 0
+        scored += course_scored
+
+    students = db.session.execute(
+        select(func.count(func.distinct(Enrollment.student_id))).where(Enrollment.course_id.in_(teacher_courses))
+    ).scalar()
+
+    return {
+        'students': students or 0,
+        'enrollments': sum(c['enrollments'] for c in courses.values()),
+        'submissions': sum(c['submissions'] for c in courses.values()),
+        'ungraded': sum(c['ungraded'] for c in courses.values()),
+        'average_score': round(score_sum / scored, 1) if scored else None,
+        'courses': courses,
+    }
+
+
+def teacher_stats(teacher_id):
+    """
+    Return {'students', 'enrollments', 'submissions', 'ungraded',
+    'average_score', 'courses'} for the teacher's courses. 'courses' maps
+    course id to its 'enrollments', 'lessons', 'submissions' and 'ungraded'
+    counts; courses with none of these are absent. 'average_score' is the
+    mean score of graded submissions, or None.
+    """
+    cache = _get_cache()
+    entry = cache.get(teacher_id)
+    now = time.monotonic()
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    stats = _query_stats(teacher_id)
+    ttl = current_app.config.get('TEACHER_STATS_TTL_SECONDS', DEFAULT_TTL_SECONDS)
+    cache.set(teacher_id, (now + ttl, stats))
+    return stats
+
+
+def invalidate_teacher_stats(teacher_id):
+    """Forget the memoised stats for `teacher_id` after its courses' data changed."""
+    _get_cache().pop(teacher_id)
+
+
+def invalidate_course_stats(course_id):
+    """Forget the memoised stats of the teacher who owns `course_id`."""
+    teacher_id = db.session.execute(select(Course.teacher_id).where(Course.id == course_id)).scalar()
+    if teacher_id is not None:
+        invalidate_teacher_stats(teacher_id)
@@ -0,0 +1,86 @@
+"""
+Process-wide template_path -> id lookup for sections.
+
+Checker and PDF routes find "their" Section by template path, often several
+times per request. The full template_path -> id map is small, so it is
+loaded with one query on first use and served from memory for
+TEMPLATE_REGISTRY_TTL_SECONDS. ORM inserts, updates and deletes of a Section
+in this process (admin edits, bulk imports) drop it at once. The TTL picks
+up changes made by other processes, such as the maintenance scripts, and
+paths that were missing when the map was loaded.
+
+Which section the comment checker stores its feedback against is configured
+with COMMENT_CHECKER_SECTION_TEMPLATE.
+"""
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event, select
+from app import db
+from app.models import Section
+from app.services.cache import SizedLRUCache
+
+DEFAULT_COMMENT_CHECKER_SECTION = "lessons/lesson3/l3section1.html"
+DEFAULT_CACHE_BYTES = 1024 * 1024
+DEFAULT_TTL_SECONDS = 300
+
+# Reentrant: the load can autoflush pending Section changes, whose events invalidate under the same lock
+_lock = threading.RLock()
+_cache = None
+
+
+def _map_size(entry):
+    _, ids = entry
+    return 128 + sum(96 + len(path) for path in ids)
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        max_bytes = current_app.config.get('TEMPLATE_REGISTRY_CACHE_BYTES', DEFAULT_CACHE_BYTES)
+        _cache = SizedLRUCache(max_bytes, sizeof=_map_size)
+    return _cache
+
+
+def _load(model):
+    # Keep the lowest id per path, matching the old .first() on a fresh table
+    rows = db.session.execute(
+        select(model.template_path, model.id)
+        .where(model.template_path.isnot(None), model.template_path != '')
+        .order_by(model.id.desc())
+    ).all()
+    return {template_path: model_id for template_path, model_id in rows}
+
+
+def _lookup(model, template_path):
+    cache = _get_cache()
+    with _lock:
+        entry = cache.get(model)
+        now = time.monotonic()
+        if entry is None or entry[0] <= now:
+            ttl = current_app.config.get('TEMPLATE_REGISTRY_TTL_SECONDS', DEFAULT_TTL_SECONDS)
+            entry = (now + ttl, _load(model))
+            cache.set(model, entry)
+    return entry[1].get(template_path)
+
+
+def section_id_for(template_path):
+    """Id of the Section rendered with `template_path`, or None."""
+    return _lookup(Section, template_path)
+
+
+def comment_checker_section_id():
+    """Id of the Section comment checker feedback is stored against, or None."""
+    template_path = current_app.config.get('COMMENT_CHECKER_SECTION_TEMPLATE', DEFAULT_COMMENT_CHECKER_SECTION)
+    return section_id_for(template_path)
+
+
+def invalidate_template_registry(*args):
+    """Forget the cached map; the next lookup reloads it."""
+    with _lock:
+        if _cache is not None:
+            _cache.clear()
+
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Section, _event_name, invalidate_template_registry)
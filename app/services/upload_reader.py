@@ -0,0 +1,90 @@
+"""
+Incremental, size-bounded decoding of uploaded source files.
+
+Uploads are read in fixed-size chunks through an incremental UTF-8 decoder,
+line endings are normalised per chunk, and complete lines are yielded as
+soon as they are available. Byte and line caps are checked while reading,
+so an oversized upload is rejected after the first chunk past the limit
+instead of after decoding all of it.
+"""
+import codecs
+from flask import current_app, has_app_context
+
+CHUNK_SIZE = 64 * 1024
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_MAX_LINES = 20000
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds the configured byte or line cap."""
+
+
+def _limits(max_bytes, max_lines):
+    if has_app_context():
+        max_bytes = max_bytes or current_app.config.get('CHECKER_MAX_UPLOAD_BYTES', DEFAULT_MAX_BYTES)
+        max_lines = max_lines or current_app.config.get('CHECKER_MAX_UPLOAD_LINES', DEFAULT_MAX_LINES)
+    return max_bytes or DEFAULT_MAX_BYTES, max_lines or DEFAULT_MAX_LINES
+
+
+def iter_upload_lines(stream, max_bytes=None, max_lines=None, errors='strict'):
+    """
+    Yield '\\n'-terminated lines from a binary stream.
+
+    '\\r\\n' and '\\r' are normalised to '\\n'. Raises UploadTooLarge as soon
+    as the byte or line cap is exceeded and UnicodeDecodeError for invalid
+    UTF-8 (unless `errors` says otherwise).
+    """
+    max_bytes, max_lines = _limits(max_bytes, max_lines)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors=errors)
+    total_bytes = 0
+    line_count = 0
+    pending = ''
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        final = not chunk
+        total_bytes += len(chunk)
+        if total_bytes > max_bytes:
+            raise UploadTooLarge(f"File is too large: the limit is {max_bytes // 1024} KB.")
+        text = pending + decoder.decode(chunk, final=final)
+        # Hold back a trailing '\r' in case its '\n' arrives in the next chunk
+        if not final and text.endswith('\r'):
+            text, pending = text[:-1], '\r'
+        else:
+            pending = ''
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        lines = text.split('\n')
+        pending = lines.pop() + pending
+        for line in lines:
+            line_count += 1
+            if line_count > max_lines:
+                raise UploadTooLarge(f"File is too long: the limit is {max_lines} lines.")
+            yield line + '\n'
+        if final:
+            break
+    if pending:
+        if line_count + 1 > max_lines:
+            raise UploadTooLarge(f"File is too long: the limit is {max_lines} lines.")
+        yield pending
+
+
+def read_upload(stream, max_bytes=None, max_lines=None, errors='strict'):
+    """Read a whole upload as normalised text, enforcing the caps while streaming."""
+    return ''.join(iter_upload_lines(stream, max_bytes, max_lines, errors))
+
+
+def count_lines(code):
+    """Lines as iter_upload_lines() counts them: a trailing newline does not start another line."""
+    if '\r' in code:
+        code = code.replace('\r\n', '\n').replace('\r', '\n')
+    return code.count('\n') + (bool(code) and not code.endswith('\n'))
+
+
+def check_source_limits(code, max_bytes=None, max_lines=None):
+    """Apply the upload caps to code that arrived as a form field."""
+    max_bytes, max_lines = _limits(max_bytes, max_lines)
+    # Only encode when the character count alone cannot settle it
+    if len(code) > max_bytes or (len(code) * 4 > max_bytes and len(code.encode('utf-8')) > max_bytes):
+        raise UploadTooLarge(f"Code is too large: the limit is {max_bytes // 1024} KB.")
+    if count_lines(code) > max_lines:
+        raise UploadTooLarge(f"Code is too long: the limit is {max_lines} lines.")
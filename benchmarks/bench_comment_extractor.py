@@ -0,0 +1,64 @@
+"""
+Micro-benchmark: legacy line.find('#') extraction vs the tokenize extractor.
+
+Runs both over every file in TestFiles/Programming (and a synthetic large
+file built from them) and reports time per pass and how many "comments"
+each approach finds. The legacy scan also reports '#' characters inside
+string literals, so its counts can be higher.
+
+Usage:
+    python benchmarks/bench_comment_extractor.py [--repeat 200]
+"""
+import argparse
+import glob
+import os
+import timeit
+
+from bench_utils import print_table
+
+from app.services.comment_extractor import extract_comments
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), '..', 'TestFiles', 'Programming')
+
+
+def legacy_extract(code):
+    """The extraction loop previously copy-pasted in practice_code_comments."""
+    results = []
+    for idx, line in enumerate(code.splitlines(), start=1):
+        if '#' in line:
+            comment_index = line.find('#')
+            comment = line[comment_index:].strip()
+            if comment:
+                results.append((idx, comment))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = {}
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.py'))):
+        with open(path, encoding='utf-8') as f:
+            corpus[os.path.basename(path)] = f.read()
+    corpus['(all files x20)'] = '\n'.join(corpus.values()) * 20
+
+    rows = []
+    for name, code in corpus.items():
+        repeat = max(1, args.repeat // 20) if name.startswith('(') else args.repeat
+        legacy_s = timeit.timeit(lambda: legacy_extract(code), number=repeat) / repeat
+        tokenize_s = timeit.timeit(lambda: extract_comments(code), number=repeat) / repeat
+        rows.append((
+            name,
+            len(code.splitlines()),
+            len(legacy_extract(code)),
+            len(extract_comments(code)),
+            f"{legacy_s * 1e6:.0f}",
+            f"{tokenize_s * 1e6:.0f}",
+        ))
+    print_table(['file', 'lines', 'legacy found', 'tokenize found', 'legacy us', 'tokenize us'], rows)
+
+
+if __name__ == '__main__':
+    main()
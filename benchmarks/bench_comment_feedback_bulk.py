@@ -0,0 +1,85 @@
+"""
+Benchmark: per-line CommentFeedback inserts vs the bulk ON CONFLICT path.
+
+Usage:
+    python benchmarks/bench_comment_feedback_bulk.py [--rtt-ms 20] [--database-url URL]
+
+--rtt-ms adds a fixed delay to every statement to approximate the round trip
+to the hosted Postgres database when running against local SQLite.
+"""
+import argparse
+import hashlib
+
+from bench_utils import make_app, RoundTripCounter, timed, print_table
+
+from app import db
+from app.models import User, Course, Lesson, Section, CommentFeedback
+from app.services.comment_feedback import bulk_insert_comment_feedback
+
+SIZES = [50, 500, 5000]
+
+
+def make_comments(n):
+    return [(i, f"# Comment number {i} explaining this step", "This comment is clear and descriptive. Well done!") for i in range(1, n + 1)]
+
+
+def seed():
+    user = User(username='bench', email='bench@example.com')
+    db.session.add(user)
+    db.session.flush()
+    course = Course(title='Bench', teacher_id=user.id)
+    db.session.add(course)
+    db.session.flush()
+    lesson = Lesson(title='Bench', course_id=course.id)
+    db.session.add(lesson)
+    db.session.flush()
+    section = Section(title='Bench', lesson_id=lesson.id)
+    db.session.add(section)
+    db.session.commit()
+    return user.id, section.id
+
+
+def per_line_insert(user_id, section_id, filename, code_hash, comments):
+    """The original loop: one SELECT (plus one INSERT) per comment line."""
+    for idx, comment, feedback in comments:
+        exists = CommentFeedback.query.filter_by(user_id=user_id, section_id=section_id, filename=filename, line_num=idx).first()
+        if not exists:
+            db.session.add(CommentFeedback(user_id=user_id, section_id=section_id, filename=filename,
+                                           line_num=idx, comment=comment, feedback=feedback, code_hash=code_hash))
+    db.session.commit()
+
+
+def bulk_insert(user_id, section_id, filename, code_hash, comments):
+    bulk_insert_comment_feedback(user_id, section_id, filename, code_hash, comments)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rtt-ms', type=float, default=0.0)
+    parser.add_argument('--database-url', default='sqlite://')
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    rows = []
+    with app.app_context():
+        user_id, section_id = seed()
+        for n in SIZES:
+            comments = make_comments(n)
+            code_hash = hashlib.sha256(str(n).encode()).hexdigest()
+            for label, fn in (('per-line', per_line_insert), ('bulk', bulk_insert)):
+                filename = f"{label}_{n}.py"
+                with RoundTripCounter(db.engine, args.rtt_ms) as counter, timed() as t:
+                    fn(user_id, section_id, filename, code_hash, comments)
+                rows.append((n, label, counter.count, f"{t['ms']:.1f}"))
+                # Re-checking the same file must not add rows
+                with RoundTripCounter(db.engine, args.rtt_ms) as counter, timed() as t:
+                    fn(user_id, section_id, filename, code_hash, comments)
+                stored = CommentFeedback.query.filter_by(filename=filename).count()
+                assert stored == n, (label, n, stored)
+                rows.append((n, f"{label} (re-check)", counter.count, f"{t['ms']:.1f}"))
+    print_table(['lines', 'strategy', 'round trips', 'ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: re-checking a revised file by replacing every CommentFeedback row
+vs the incremental recheck_comment_feedback path.
+
+Each file is checked once, then a revision with three edited comment lines
+is re-checked. The replace strategy deletes the file's rows, re-analyses
+every comment and re-inserts them; the incremental strategy reuses stored
+feedback and writes only the changed lines.
+
+Usage:
+    python benchmarks/bench_comment_recheck.py [--rtt-ms 20] [--database-url URL]
+"""
+import argparse
+
+from bench_utils import make_app, RoundTripCounter, timed, print_table
+from bench_comment_feedback_bulk import seed
+
+from app import db
+from app.models import CommentFeedback
+from app.services.comment_analysis import analyze_comments, code_hash_for
+from app.services.comment_feedback import bulk_insert_comment_feedback, recheck_comment_feedback
+
+SIZES = [500, 5000, 20000]
+
+
+def make_versions(n):
+    lines = [f"total_{i} = total_{i - 1} + {i}  # add step {i} to the running total" for i in range(n)]
+    original = "\n".join(lines) + "\n"
+    for i in (n // 4, n // 2, 3 * n // 4):
+        lines[i] = f"total_{i} = 0  # reset before the next pass"
+    return original, "\n".join(lines) + "\n"
+
+
+def replace_all(user_id, section_id, filename, code):
+    CommentFeedback.query.filter_by(user_id=user_id, section_id=section_id, filename=filename).delete()
+    bulk_insert_comment_feedback(user_id, section_id, filename, code_hash_for(code), analyze_comments(code))
+    db.session.commit()
+
+
+def incremental(user_id, section_id, filename, code):
+    recheck_comment_feedback(user_id, section_id, filename, code)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rtt-ms', type=float, default=0.0)
+    parser.add_argument('--database-url', default='sqlite://')
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    rows = []
+    with app.app_context():
+        user_id, section_id = seed()
+        for n in SIZES:
+            original, revised = make_versions(n)
+            for label, fn in (('replace', replace_all), ('incremental', incremental)):
+                filename = f"{label}_{n}.py"
+                fn(user_id, section_id, filename, original)
+                with RoundTripCounter(db.engine, args.rtt_ms) as counter, timed() as t:
+                    fn(user_id, section_id, filename, revised)
+                stored = CommentFeedback.query.filter_by(filename=filename).count()
+                assert stored == n, (label, n, stored)
+                rows.append((n, label, counter.count, f"{t['ms']:.1f}"))
+    print_table(['comments', 'strategy', 'round trips', 'ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: per-comment cost of the compiled comment rule engine as rules grow.
+
+Compares the compiled ruleset (Aho-Corasick literal prefilter + confirming
+regex) against evaluating each rule with its own re.search call, for 3
+(built-in), 30 and 300 rules. Also times the one-off compile so the cost of a
+ruleset version change is visible.
+
+Usage:
+    python benchmarks/bench_comment_rules.py [--comments 5000]
+"""
+import argparse
+import json
+import re
+import timeit
+
+from bench_utils import print_table
+
+from app.services.comment_rules import CompiledRuleset, Rule, RULES_FILE
+
+
+def builtin_rules():
+    with open(RULES_FILE, encoding='utf-8') as f:
+        data = json.load(f)
+    rules = [Rule(r['id'], r['pattern'], r['message'], r['priority']) for r in data['rules']]
+    return rules, data['default_message']
+
+
+def padded_rules(n):
+    rules, default_message = builtin_rules()
+    for i in range(len(rules), n):
+        rules.append(Rule(f'word-{i}', rf'\bbannedword{i}\b', f'Avoid bannedword{i}.', 100 + i))
+    return rules, default_message
+
+
+def sample_comments(n):
+    base = [
+        '# see https://docs.python.org',
+        '# print(total)',
+        '# loop',
+        '# Convert the temperature to Celsius before comparing it with the limit',
+        'x = 1  # Store the starting number of attempts the user is allowed',
+    ]
+    return [base[i % len(base)] for i in range(n)]
+
+
+def per_rule_feedback(compiled_rules, default_message, comment):
+    for rule_id, regex, message in compiled_rules:
+        if regex.search(comment):
+            return message
+    return default_message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--comments', type=int, default=5000)
+    args = parser.parse_args()
+    comments = sample_comments(args.comments)
+
+    rows = []
+    for n in (3, 30, 300):
+        rules, default_message = padded_rules(n)
+        compile_ms = timeit.timeit(lambda: CompiledRuleset(rules, default_message), number=5) / 5 * 1000
+        ruleset = CompiledRuleset(rules, default_message)
+        separate = [(r.rule_id, re.compile(r.pattern), r.message) for r in ruleset.rules]
+        combined_s = timeit.timeit(lambda: [ruleset.feedback(c) for c in comments], number=3) / 3
+        separate_s = timeit.timeit(lambda: [per_rule_feedback(separate, default_message, c) for c in comments], number=3) / 3
+        assert [ruleset.feedback(c) for c in comments] == [per_rule_feedback(separate, default_message, c) for c in comments]
+        rows.append((
+            n,
+            f"{compile_ms:.2f}",
+            f"{combined_s / len(comments) * 1e6:.2f}",
+            f"{separate_s / len(comments) * 1e6:.2f}",
+        ))
+    print_table(['rules', 'compile ms', 'compiled us/comment', 'per-rule us/comment'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark create_app() wall time with and without the runtime schema check.
+
+The old create_app() reflected comment_feedback on every boot (table list +
+column list) before it could decide whether to ALTER it. The new one
+compares a cached fingerprint of migrations/versions and only queries
+alembic_version when the migrations changed.
+
+Each case calls create_app() in this process after a warm-up call, so
+module import time is excluded and only the per-boot work is measured.
+The engine uses NullPool like the Render config, and --rtt-ms adds a fake
+network round trip to every statement and every new connection.
+
+Usage:
+    python benchmarks/bench_create_app.py [--rtt-ms 20] [--repeat 10]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from bench_utils import print_table, timed
+
+tmp = tempfile.mkdtemp(prefix='bench_create_app_')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'app.db')}"
+os.environ['SCHEMA_FINGERPRINT_FILE'] = os.path.join(tmp, 'schema_fingerprint.json')
+os.environ.pop('FLASK_RUN_FROM_CLI', None)
+
+import config  # noqa: E402
+from sqlalchemy import event, inspect, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.pool import NullPool, Pool  # noqa: E402
+
+config.Config.SQLALCHEMY_ENGINE_OPTIONS = {'poolclass': NullPool}
+
+from app import create_app, db  # noqa: E402
+from app.services.schema_version import migration_heads, versions_dir  # noqa: E402
+
+
+class FakeNetwork:
+    """Sleep `rtt` on every statement and new connection, and count both."""
+
+    def __init__(self, rtt_ms):
+        self.rtt = rtt_ms / 1000.0
+        self.statements = 0
+        self.connections = 0
+
+    def _statement(self, *args):
+        self.statements += 1
+        time.sleep(self.rtt)
+
+    def _connect(self, *args):
+        self.connections += 1
+        time.sleep(self.rtt)
+
+    def __enter__(self):
+        event.listen(Engine, 'before_cursor_execute', self._statement)
+        event.listen(Pool, 'connect', self._connect)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, 'before_cursor_execute', self._statement)
+        event.remove(Pool, 'connect', self._connect)
+
+
+def legacy_schema_check(app):
+    """The inspection create_app() used to run on every boot."""
+    with app.app_context():
+        inspector = inspect(db.engine)
+        if 'comment_feedback' in inspector.get_table_names():
+            columns = [col['name'] for col in inspector.get_columns('comment_feedback')]
+            if 'code_hash' not in columns:
+                raise RuntimeError('benchmark database is missing code_hash')
+
+
+def prepare_database():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        heads = migration_heads(versions_dir(app))
+        with db.engine.begin() as conn:
+            conn.execute(text('CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)'))
+            conn.execute(text('DELETE FROM alembic_version'))
+            for head in heads:
+                conn.execute(text('INSERT INTO alembic_version VALUES (:v)'), {'v': head})
+
+
+def run_case(label, setup, boot, rtt_ms, repeat):
+    times = []
+    with FakeNetwork(rtt_ms) as network:
+        for _ in range(repeat):
+            setup()
+            with timed() as t:
+                boot()
+            times.append(t['ms'])
+    return (label, f"{statistics.median(times):.1f}", f"{network.statements / repeat:.0f}",
+            f"{network.connections / repeat:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rtt-ms', type=float, default=20.0)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    prepare_database()
+    fingerprint_file = os.environ['SCHEMA_FINGERPRINT_FILE']
+
+    def clear_cache():
+        if os.path.exists(fingerprint_file):
+            os.remove(fingerprint_file)
+
+    def no_setup():
+        pass
+
+    def legacy_boot():
+        config.Config.SCHEMA_CHECK = 'off'
+        try:
+            legacy_schema_check(create_app())
+        finally:
+            config.Config.SCHEMA_CHECK = 'cached'
+
+    create_app()  # warm-up: imports, template loader, first fingerprint
+    rows = [
+        run_case('before: reflect comment_feedback', no_setup, legacy_boot, args.rtt_ms, args.repeat),
+        run_case('after: fingerprint changed', clear_cache, create_app, args.rtt_ms, args.repeat),
+        run_case('after: fingerprint cached', no_setup, create_app, args.rtt_ms, args.repeat),
+    ]
+    print(f"create_app() with {args.rtt_ms:g} ms simulated round trip, median of {args.repeat}")
+    print_table(['startup', 'ms', 'statements', 'connections'], rows)
+
+
+if __name__ == '__main__':
+    main()
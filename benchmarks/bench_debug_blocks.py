@@ -0,0 +1,104 @@
+"""
+Micro-benchmark: the old line-by-line DEBUG block extractor plus its
+substring feedback vs parse_debug_blocks() on large files.
+
+The synthetic file is mostly ordinary code with a DEBUG block every 50
+lines, roughly the density of a well-documented assessment.
+
+Usage:
+    python benchmarks/bench_debug_blocks.py [--lines 10000] [--repeat 20]
+"""
+import argparse
+import re
+import timeit
+
+from bench_utils import print_table
+
+from app.services.debug_blocks import parse_debug_blocks
+
+
+def legacy_extract(code):
+    """The extractor previously in app/routes/main.py (recompiled its regex per call)."""
+    debug_line_regex = re.compile(r'#\s*DEBUG(\b|\s|:)', re.IGNORECASE)
+    debug_blocks = []
+    lines = code.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if debug_line_regex.match(line):
+            block = [f"{i+1}: {lines[i].strip()}"]
+            j = i + 1
+            while j < len(lines):
+                subline = lines[j].strip()
+                if debug_line_regex.match(subline):
+                    block.append(f"{j+1}: {lines[j].strip()}")
+                    j += 1
+                else:
+                    break
+            debug_blocks.append('\n'.join(block))
+            i = j
+        else:
+            i += 1
+    return debug_blocks
+
+
+def legacy_feedback(block):
+    """The substring-based feedback the checker page and PDFs recomputed per block."""
+    block_lower = block.lower()
+    if '# debug:' in block_lower and ('test' not in block_lower and 'issue' not in block_lower and 'fix' not in block_lower):
+        return 'Add a test, issue, and fix description to your DEBUG block.'
+    missing = [part for part in ('TEST', 'ISSUE', 'FIX') if part.lower() not in block_lower]
+    if not missing:
+        return 'Great! Your DEBUG block is complete.'
+    return f"Add a {', '.join(missing)} to your DEBUG block for full marks."
+
+
+def legacy_check(code):
+    return [(block, legacy_feedback(block)) for block in legacy_extract(code)]
+
+
+def parsed_check(code):
+    return [(block.text, block.feedback) for block in parse_debug_blocks(code)]
+
+
+def make_code(n_lines, every=50):
+    lines = []
+    while len(lines) < n_lines:
+        i = len(lines)
+        if i % every == 0:
+            lines += [
+                "    # DEBUG TEST: entered a negative number",
+                "    # DEBUG ISSUE: the loop never ended",
+                "    # DEBUG FIX: added a check for n < 0",
+            ]
+        else:
+            lines.append(f"    total_{i} = compute(total_{i - 1}, {i})  # running total")
+    return "\n".join(lines[:n_lines]) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lines', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = []
+    for every in (50, 5):
+        code = make_code(args.lines, every)
+        legacy_s = timeit.timeit(lambda: legacy_check(code), number=args.repeat) / args.repeat
+        parsed_s = timeit.timeit(lambda: parsed_check(code), number=args.repeat) / args.repeat
+        blocks = parse_debug_blocks(code)
+        assert parsed_check(code) == legacy_check(code)
+        rows.append((
+            args.lines,
+            f"1 per {every} lines",
+            len(blocks),
+            sum(1 for b in blocks if b.complete),
+            f"{legacy_s * 1000:.2f}",
+            f"{parsed_s * 1000:.2f}",
+        ))
+    print_table(['lines', 'DEBUG density', 'blocks', 'complete', 'legacy ms', 'parser ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
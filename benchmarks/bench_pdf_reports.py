@@ -0,0 +1,157 @@
+"""
+Benchmark for the checker PDF reports.
+
+Renders comment reports with 1, 100 and 1,000 comments through the shared
+renderer in app/services/pdf_reports.py, next to a copy of the old route
+code (one drawString() and setFont() per line, simpleSplit() on every
+comment and feedback string). Feedback messages repeat the way they do in
+real reports, where a handful of rule messages cover most comments.
+
+Usage:
+    python benchmarks/bench_pdf_reports.py [--repeat 5]
+"""
+import argparse
+import io
+import timeit
+
+from bench_utils import print_table
+
+from reportlab.lib.pagesizes import A4, letter
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfgen import canvas
+
+from app.services.pdf_reports import render_comments_report, render_comment_feedback_report
+
+FEEDBACK = [
+    'Good comment! Clear and helpful.',
+    'Try to explain why the code does this, not just what it does.',
+    'This comment is very short. Add more detail so a reader understands the purpose of the code below.',
+    'Avoid leaving commented-out code in your submission.',
+]
+
+
+def build(count):
+    code = '\n'.join(
+        f"total = total + value_{i}  # add value {i} to the running total before printing the summary"
+        for i in range(count)
+    )
+    comments = [
+        (i + 1, f"# add value {i} to the running total before printing the summary", FEEDBACK[i % len(FEEDBACK)])
+        for i in range(count)
+    ]
+    return code, comments
+
+
+def legacy_comments_report(filename, date, code, comments):
+    """The old download_comments_pdf layout."""
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    y = height - 40
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(40, y, f"Extracted Comments for: {filename}")
+    y -= 24
+    p.setFont("Helvetica", 12)
+    p.drawString(40, y, f"Date: {date}")
+    y -= 30
+    p.setFont("Helvetica", 11)
+    p.drawString(40, y, "Code:")
+    y -= 18
+    p.setFont("Courier", 9)
+    for line in code.splitlines():
+        if y < 60:
+            p.showPage()
+            y = height - 40
+            p.setFont("Courier", 9)
+        p.drawString(50, y, line)
+        y -= 12
+    y -= 18
+    p.setFont("Helvetica-Bold", 12)
+    p.drawString(40, y, "Extracted Comments and Feedback:")
+    y -= 18
+    p.setFont("Helvetica", 10)
+    for line_num, comment, feedback in comments:
+        if y < 60:
+            p.showPage()
+            y = height - 40
+            p.setFont("Helvetica", 10)
+        for line in simpleSplit(f"Line {line_num}: {comment}", "Helvetica", 10, width - 100):
+            p.drawString(50, y, line)
+            y -= 12
+        p.setFont("Helvetica-Oblique", 9)
+        for line in simpleSplit(f"Feedback: {feedback}", "Helvetica-Oblique", 9, width - 120):
+            p.drawString(70, y, line)
+            y -= 12
+        y -= 4
+        p.setFont("Helvetica", 10)
+    p.save()
+    buffer.seek(0)
+    return buffer
+
+
+def legacy_feedback_report(filename, date, comments):
+    """The old download_lesson1_feedback layout."""
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    y = height - 50
+    p.setFont("Helvetica-Bold", 16)
+    p.drawString(50, y, f"{filename}")
+    y -= 30
+    p.setFont("Helvetica", 12)
+    p.drawString(50, y, f"Date: {date}")
+    y -= 30
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(50, y, "Lesson 1: Comment Checker - Feedback")
+    y -= 40
+    p.setFont("Helvetica", 12)
+    max_width = width - 100
+    for line_num, comment, feedback in comments:
+        if y < 80:
+            p.showPage()
+            y = height - 50
+            p.setFont("Helvetica", 12)
+        for line in simpleSplit(f"Line {line_num}: {comment}", "Helvetica", 12, max_width):
+            p.drawString(50, y, line)
+            y -= 16
+        p.setFillColorRGB(0.2, 0.2, 0.7)
+        for line in simpleSplit(f"Feedback: {feedback}", "Helvetica", 12, max_width - 20):
+            p.drawString(70, y, line)
+            y -= 16
+        p.setFillColorRGB(0, 0, 0)
+        y -= 10
+    p.save()
+    buffer.seek(0)
+    return buffer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for count in (1, 100, 1000):
+        code, comments = build(count)
+        cases = (
+            ('comments + code', lambda: legacy_comments_report('bench.py', '2024-01-01', code, comments),
+             lambda: render_comments_report('bench.py', '2024-01-01', code, comments)),
+            ('lesson 1 feedback', lambda: legacy_feedback_report('bench.py', '2024-01-01', comments),
+             lambda: render_comment_feedback_report('bench.py', '2024-01-01', comments)),
+        )
+        for label, legacy, shared in cases:
+            legacy_s = timeit.timeit(legacy, number=args.repeat) / args.repeat
+            shared_s = timeit.timeit(shared, number=args.repeat) / args.repeat
+            rows.append((
+                label,
+                count,
+                f"{legacy_s * 1000:.1f}",
+                f"{shared_s * 1000:.1f}",
+                f"{len(shared().getvalue()) / 1024:.0f}",
+                f"{legacy_s / shared_s:.1f}x",
+            ))
+    print_table(['report', 'comments', 'legacy ms', 'shared ms', 'KB', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: score statistics from ORM objects in Python vs flat columns + NumPy.
+
+The legacy path loads Submission / QuizAttempt objects and computes the
+mean, standard deviation, quartiles and a 10-bin histogram with
+list comprehensions and the statistics module, the way grading_dashboard
+computed its mean. The new path is course_score_analytics(), which also
+produces per-course breakdowns.
+
+Usage:
+    python benchmarks/bench_score_analytics.py [--attempts 20000 100000] [--database-url URL]
+"""
+import argparse
+import random
+import statistics
+
+from bench_utils import make_app, timed, print_table
+
+from app import db
+from app.models import User, Course, Assignment, Submission, Quiz, QuizAttempt
+from app.services.score_analytics import course_score_analytics
+
+COURSES = 8
+ASSIGNMENTS_PER_COURSE = 20
+
+
+def seed(attempts):
+    random.seed(7)
+    teacher = User(username='teacher', email='teacher@example.com', role='teacher')
+    db.session.add(teacher)
+    db.session.flush()
+    db.session.execute(User.__table__.insert(), [
+        {'username': f's{i}', 'email': f's{i}@example.com', 'role': 'student'} for i in range(500)
+    ])
+    student_ids = db.session.execute(db.select(User.id).where(User.role == 'student')).scalars().all()
+    course_ids = []
+    for c in range(COURSES):
+        course = Course(title=f'Course {c}', teacher_id=teacher.id)
+        db.session.add(course)
+        db.session.flush()
+        course_ids.append(course.id)
+        db.session.execute(Assignment.__table__.insert(), [
+            {'course_id': course.id, 'title': f'A{a}', 'max_points': 50} for a in range(ASSIGNMENTS_PER_COURSE)
+        ])
+        db.session.add(Quiz(course_id=course.id, title=f'Quiz {c}', max_attempts=1000))
+    db.session.flush()
+    assignment_ids = db.session.execute(db.select(Assignment.id)).scalars().all()
+    quiz_ids = db.session.execute(db.select(Quiz.id)).scalars().all()
+    db.session.execute(Submission.__table__.insert(), [
+        {'assignment_id': random.choice(assignment_ids), 'student_id': random.choice(student_ids),
+         'graded': True, 'score': random.randint(0, 50)}
+        for _ in range(attempts // 2)
+    ])
+    db.session.execute(QuizAttempt.__table__.insert(), [
+        {'quiz_id': random.choice(quiz_ids), 'student_id': random.choice(student_ids), 'score': random.uniform(0, 100)}
+        for _ in range(attempts // 2)
+    ])
+    db.session.commit()
+    return course_ids
+
+
+def python_summary(values):
+    if not values:
+        return None
+    edges = [i * 10 for i in range(11)]
+    histogram = [0] * 10
+    for value in values:
+        histogram[min(int(value // 10), 9)] += 1
+    return {
+        'mean': statistics.fmean(values),
+        'std': statistics.pstdev(values),
+        'quartiles': statistics.quantiles(values, n=4),
+        'histogram': histogram,
+        'edges': edges,
+    }
+
+
+def legacy_analytics(course_ids):
+    submissions = Submission.query.join(Assignment).filter(
+        Assignment.course_id.in_(course_ids), Submission.graded.is_(True)
+    ).all()
+    attempts = QuizAttempt.query.join(Quiz).filter(Quiz.course_id.in_(course_ids)).all()
+    assignment_scores = [s.score * 100.0 / s.assignment.max_points for s in submissions if s.score is not None]
+    quiz_scores = [a.score for a in attempts if a.score is not None]
+    return python_summary(assignment_scores), python_summary(quiz_scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--attempts', type=int, nargs='+', default=[20000, 100000])
+    parser.add_argument('--database-url', default='sqlite://')
+    args = parser.parse_args()
+
+    rows = []
+    for attempts in args.attempts:
+        app = make_app(args.database_url)
+        with app.app_context():
+            course_ids = seed(attempts)
+            db.session.expire_all()
+            with timed() as t:
+                legacy = legacy_analytics(course_ids)
+            rows.append((attempts, 'ORM objects + Python', f"{t['ms']:.1f}"))
+            db.session.expire_all()
+            with timed() as t:
+                result = course_score_analytics(course_ids)
+            rows.append((attempts, 'flat columns + NumPy (per course too)', f"{t['ms']:.1f}"))
+            assert abs(legacy[1]['mean'] - result['quizzes']['mean']) < 0.01
+            db.drop_all()
+    print_table(['scores', 'strategy', 'ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: the admin pages' lazy-loading statistics vs teacher_stats().
+
+The legacy path is what admin.index computed on every request: walk every
+course's enrollments, then every assignment's submissions. The new path is
+the GROUP BY queries in app/services/teacher_stats.py, shown both on a cache
+miss and a cache hit. Each size is a teacher with that many courses, each
+with the given number of students and assignments, and every student has
+submitted about half of the assignments.
+
+Usage:
+    python benchmarks/bench_teacher_stats.py [--rtt-ms 20] [--database-url URL]
+"""
+import argparse
+
+from bench_utils import make_app, RoundTripCounter, timed, print_table
+
+from app import db
+from app.models import User, Course, Enrollment, Assignment, Submission
+from app.services.teacher_stats import teacher_stats, invalidate_teacher_stats
+
+# (courses, students per course, assignments per course)
+SIZES = [(2, 25, 10), (4, 50, 25), (6, 100, 50)]
+
+
+def seed(teacher_number, courses, students, assignments):
+    teacher = User(username=f'teacher{teacher_number}', email=f'teacher{teacher_number}@example.com', role='teacher')
+    db.session.add(teacher)
+    db.session.flush()
+    student_rows = [
+        {'username': f't{teacher_number}s{i}', 'email': f't{teacher_number}s{i}@example.com', 'role': 'student'}
+        for i in range(students)
+    ]
+    db.session.execute(User.__table__.insert(), student_rows)
+    student_ids = db.session.execute(
+        db.select(User.id).where(User.username.like(f't{teacher_number}s%'))
+    ).scalars().all()
+    for c in range(courses):
+        course = Course(title=f'Course {teacher_number}.{c}', teacher_id=teacher.id)
+        db.session.add(course)
+        db.session.flush()
+        db.session.execute(Enrollment.__table__.insert(), [{'student_id': s, 'course_id': course.id} for s in student_ids])
+        db.session.execute(Assignment.__table__.insert(), [{'course_id': course.id, 'title': f'A{a}'} for a in range(assignments)])
+        assignment_ids = db.session.execute(
+            db.select(Assignment.id).where(Assignment.course_id == course.id)
+        ).scalars().all()
+        submissions = [
+            {'assignment_id': a, 'student_id': s, 'graded': (a + s) % 3 == 0, 'score': 50 + (a * s) % 50}
+            for a in assignment_ids for s in student_ids if (a + s) % 2 == 0
+        ]
+        db.session.execute(Submission.__table__.insert(), submissions)
+    db.session.commit()
+    return teacher.id
+
+
+def legacy_stats(teacher_id):
+    """The statistics block previously in admin.index."""
+    teacher_courses = Course.query.filter_by(teacher_id=teacher_id).all()
+    student_ids = set()
+    for course in teacher_courses:
+        for enrollment in course.enrollments:
+            student_ids.add(enrollment.student_id)
+    students = User.query.filter(User.id.in_(student_ids)).all() if student_ids else []
+    total_enrollments = sum(len(course.enrollments) for course in teacher_courses)
+    total_submissions = sum(
+        len([s for s in course.assignments])
+        for course in teacher_courses
+        for assign in course.assignments
+        for s in assign.submissions
+    )
+    return len(students), total_enrollments, total_submissions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rtt-ms', type=float, default=0.0)
+    parser.add_argument('--database-url', default='sqlite://')
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    rows = []
+    with app.app_context():
+        for number, (courses, students, assignments) in enumerate(SIZES):
+            teacher_id = seed(number, courses, students, assignments)
+            size = f"{courses}x{students}x{assignments}"
+
+            db.session.expire_all()
+            with RoundTripCounter(db.engine, args.rtt_ms) as counter, timed() as t:
+                legacy = legacy_stats(teacher_id)
+            rows.append((size, 'lazy-load (legacy)', counter.count, f"{t['ms']:.1f}"))
+
+            db.session.expire_all()
+            invalidate_teacher_stats(teacher_id)
+            with RoundTripCounter(db.engine, args.rtt_ms) as counter, timed() as t:
+                stats = teacher_stats(teacher_id)
+            rows.append((size, 'GROUP BY (miss)', counter.count, f"{t['ms']:.1f}"))
+            assert (stats['students'], stats['enrollments']) == legacy[:2], (stats, legacy)
+
+            with RoundTripCounter(db.engine, args.rtt_ms) as counter, timed() as t:
+                teacher_stats(teacher_id)
+            rows.append((size, 'GROUP BY (cached)', counter.count, f"{t['ms']:.3f}"))
+    print_table(['courses x students x assignments', 'strategy', 'round trips', 'ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Shared helpers for the benchmark scripts in this folder.
+
+The benchmarks build a bare Flask app around the real models instead of
+calling create_app(), so they run against a local SQLite database (or any
+--database-url) without OAuth, blueprints or the production config.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from sqlalchemy import event
+from app import db
+
+
+def make_app(database_url='sqlite://'):
+    """Create a minimal app bound to `database_url` with all tables created."""
+    from app import models  # noqa: F401  (registers the tables)
+    flask_app = Flask('benchmarks')
+    flask_app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    flask_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    flask_app.config['SECRET_KEY'] = 'benchmark'
+    db.init_app(flask_app)
+    with flask_app.app_context():
+        db.create_all()
+    return flask_app
+
+
+class RoundTripCounter:
+    """Count statements sent to the database, optionally adding fake network latency."""
+
+    def __init__(self, engine, rtt_ms=0.0):
+        self.engine = engine
+        self.rtt = rtt_ms / 1000.0
+        self.count = 0
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._before_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._before_execute)
+
+
+@contextmanager
+def timed():
+    """Yield a dict whose 'ms' key holds the elapsed wall time on exit."""
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['ms'] = (time.perf_counter() - start) * 1000.0
+
+
+def print_table(headers, rows):
+    """Print rows as a simple fixed-width table."""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    line = '  '.join(str(h).ljust(w) for h, w in zip(headers, widths))
+    print(line)
+    print('-' * len(line))
+    for row in rows:
+        print('  '.join(str(c).ljust(w) for c, w in zip(row, widths)))
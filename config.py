@@ -52,10 +52,46 @@ class Config:
     # File Uploads
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
+    # Caps for files checked by the comment/debug checkers (enforced while streaming)
+    CHECKER_MAX_UPLOAD_BYTES = int(os.environ.get('CHECKER_MAX_UPLOAD_BYTES', 1024 * 1024))
+    CHECKER_MAX_UPLOAD_LINES = int(os.environ.get('CHECKER_MAX_UPLOAD_LINES', 20000))
 
     # Pagination
     ITEMS_PER_PAGE = 20
 
+    # Comment checker: in-process result cache budget (persistent table sits behind it)
+    COMMENT_ANALYSIS_CACHE_BYTES = int(os.environ.get('COMMENT_ANALYSIS_CACHE_BYTES', 8 * 1024 * 1024))
+    # How often teacher-edited comment rules are re-read (recompiled only when they change)
+    COMMENT_RULES_RELOAD_SECONDS = int(os.environ.get('COMMENT_RULES_RELOAD_SECONDS', 60))
+    # Process pool size for `flask batch-check` (0 or 1 runs inline; the web batch checker always runs inline)
+    BATCH_CHECK_WORKERS = int(os.environ.get('BATCH_CHECK_WORKERS', min(4, os.cpu_count() or 1)))
+    # Total decompressed size of the .py files in one batch zip (each file is also held to CHECKER_MAX_UPLOAD_BYTES)
+    BATCH_MAX_TOTAL_BYTES = int(os.environ.get('BATCH_MAX_TOTAL_BYTES', 32 * 1024 * 1024))
+    # Section (by template path) that comment checker feedback is stored against
+    COMMENT_CHECKER_SECTION_TEMPLATE = os.environ.get('COMMENT_CHECKER_SECTION_TEMPLATE', 'lessons/lesson3/l3section1.html')
+    # Section template_path -> id map is reloaded this often (sooner after Section edits in this process)
+    TEMPLATE_REGISTRY_TTL_SECONDS = int(os.environ.get('TEMPLATE_REGISTRY_TTL_SECONDS', 300))
+    # Server-side checker results: rows unused for this long are purged (checked hourly per process)
+    CHECKER_RESULT_TTL_SECONDS = int(os.environ.get('CHECKER_RESULT_TTL_SECONDS', 7 * 24 * 3600))
+    CHECKER_RESULT_PURGE_SECONDS = int(os.environ.get('CHECKER_RESULT_PURGE_SECONDS', 3600))
+    # Generated feedback PDFs kept on disk (defaults to <instance folder>/pdf_cache); least recently used evicted past the budget
+    PDF_CACHE_DIR = os.environ.get('PDF_CACHE_DIR')
+    PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    # Startup schema check: 'cached' compares a fingerprint of migrations/versions and only
+    # queries alembic_version when it changed; 'off' skips it (defaults to <instance folder>/schema_fingerprint.json)
+    SCHEMA_CHECK = os.environ.get('SCHEMA_CHECK', 'cached')
+    SCHEMA_FINGERPRINT_FILE = os.environ.get('SCHEMA_FINGERPRINT_FILE')
+    # Teacher dashboard statistics are memoised per teacher for this long (dropped early on submit/grade/enrol)
+    TEACHER_STATS_TTL_SECONDS = int(os.environ.get('TEACHER_STATS_TTL_SECONDS', 60))
+    # Users per page on the admin roster (keyset-paginated by user id)
+    ROSTER_PAGE_SIZE = int(os.environ.get('ROSTER_PAGE_SIZE', 25))
+    # Students per page on the course gradebook (the CSV export always has every student)
+    GRADEBOOK_PAGE_SIZE = int(os.environ.get('GRADEBOOK_PAGE_SIZE', 50))
+    # Per-student lesson completion bitmaps on the course page are memoised this long (dropped early on complete_lesson)
+    LESSON_PROGRESS_TTL_SECONDS = int(os.environ.get('LESSON_PROGRESS_TTL_SECONDS', 300))
+    # Process pool size for `flask export-feedback` (0 or 1 renders inline; the web export always renders inline)
+    FEEDBACK_EXPORT_WORKERS = int(os.environ.get('FEEDBACK_EXPORT_WORKERS', min(4, os.cpu_count() or 1)))
+
 class DevelopmentConfig(Config):
     DEBUG = True
 
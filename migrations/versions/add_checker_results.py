@@ -0,0 +1,25 @@
+"""
+Add checker_results table (server-side store for checker results)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_checker_results'
+down_revision = 'add_comment_rules'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'checker_results',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('token', sa.String(32), nullable=False, unique=True),
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=True, unique=True),
+        sa.Column('data', sa.Text, nullable=False),
+        sa.Column('updated_at', sa.DateTime, server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+    op.create_index('ix_checker_results_updated_at', 'checker_results', ['updated_at'])
+
+def downgrade():
+    op.drop_index('ix_checker_results_updated_at', table_name='checker_results')
+    op.drop_table('checker_results')
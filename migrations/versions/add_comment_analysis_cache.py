@@ -0,0 +1,24 @@
+"""
+Add comment_analysis_cache table
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_comment_analysis_cache'
+down_revision = 'comment_feedback_unique_line'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'comment_analysis_cache',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('code_hash', sa.String(64), nullable=False),
+        sa.Column('ruleset_version', sa.String(64), nullable=False),
+        sa.Column('results', sa.Text, nullable=False),
+        sa.Column('created_at', sa.DateTime, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.UniqueConstraint('code_hash', 'ruleset_version', name='uq_comment_analysis_cache_key'),
+    )
+
+def downgrade():
+    op.drop_table('comment_analysis_cache')
@@ -0,0 +1,27 @@
+"""
+Add comment_rules table
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_comment_rules'
+down_revision = 'add_comment_analysis_cache'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'comment_rules',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('rule_key', sa.String(64), nullable=False, unique=True),
+        sa.Column('pattern', sa.Text, nullable=False),
+        sa.Column('message', sa.Text, nullable=False),
+        sa.Column('priority', sa.Integer, server_default='100'),
+        sa.Column('is_active', sa.Boolean, server_default=sa.true()),
+        sa.Column('created_by', sa.Integer, sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime, server_default=sa.text('CURRENT_TIMESTAMP')),
+    )
+
+def downgrade():
+    op.drop_table('comment_rules')
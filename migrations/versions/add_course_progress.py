@@ -0,0 +1,65 @@
+"""
+Add course_progress rollup table (per-student, per-course progress counters)
+
+The table is backfilled from existing submissions, quiz attempts and lesson
+progress during the upgrade, with the same definitions as
+`flask rebuild-course-progress` (app/services/course_progress.py).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_course_progress'
+down_revision = 'add_submissions_student_idx'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'course_progress',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('student_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('course_id', sa.Integer, sa.ForeignKey('courses.id'), nullable=False),
+        sa.Column('lessons_completed', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('assignments_submitted', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('quizzes_attempted', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.UniqueConstraint('student_id', 'course_id', name='uq_course_progress_student_course'),
+    )
+
+    # Lessons count once every section has a completed lesson_progress row;
+    # assignments and quizzes count once the student has any submission/attempt
+    op.execute("""
+        INSERT INTO course_progress (student_id, course_id, lessons_completed, assignments_submitted, quizzes_attempted, updated_at)
+        SELECT student_id, course_id, SUM(lessons), SUM(assignments), SUM(quizzes), CURRENT_TIMESTAMP
+        FROM (
+            SELECT done.student_id AS student_id, l.course_id AS course_id,
+                   COUNT(*) AS lessons, 0 AS assignments, 0 AS quizzes
+            FROM (
+                SELECT lp.student_id, s.lesson_id, COUNT(DISTINCT s.id) AS sections_done
+                FROM lesson_progress lp
+                JOIN sections s ON s.id = lp.section_id
+                WHERE lp.completed = TRUE
+                GROUP BY lp.student_id, s.lesson_id
+            ) done
+            JOIN (
+                SELECT lesson_id, COUNT(id) AS sections FROM sections GROUP BY lesson_id
+            ) section_counts ON section_counts.lesson_id = done.lesson_id
+            JOIN lessons l ON l.id = done.lesson_id
+            WHERE done.sections_done = section_counts.sections
+            GROUP BY done.student_id, l.course_id
+            UNION ALL
+            SELECT sub.student_id, a.course_id, 0, COUNT(DISTINCT sub.assignment_id), 0
+            FROM submissions sub
+            JOIN assignments a ON a.id = sub.assignment_id
+            GROUP BY sub.student_id, a.course_id
+            UNION ALL
+            SELECT qa.student_id, q.course_id, 0, 0, COUNT(DISTINCT qa.quiz_id)
+            FROM quiz_attempts qa
+            JOIN quizzes q ON q.id = qa.quiz_id
+            GROUP BY qa.student_id, q.course_id
+        ) counts
+        GROUP BY student_id, course_id
+    """)
+
+def downgrade():
+    op.drop_table('course_progress')
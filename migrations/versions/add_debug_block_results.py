@@ -0,0 +1,36 @@
+"""
+Add debug_block_results table (parsed DEBUG blocks per user/file/code hash)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'add_debug_block_results'
+down_revision = 'add_checker_results'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'debug_block_results',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('filename', sa.String(255), nullable=False),
+        sa.Column('code_hash', sa.String(64), nullable=False),
+        sa.Column('block_index', sa.Integer, nullable=False),
+        sa.Column('start_line', sa.Integer, nullable=False),
+        sa.Column('end_line', sa.Integer, nullable=False),
+        sa.Column('lines', sa.Text, nullable=False),
+        sa.Column('test', sa.Text, nullable=False),
+        sa.Column('issue', sa.Text, nullable=False),
+        sa.Column('fix', sa.Text, nullable=False),
+        sa.Column('complete', sa.Boolean, nullable=False),
+        sa.Column('checked_at', sa.DateTime, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.UniqueConstraint('user_id', 'filename', 'code_hash', 'block_index', name='uq_debug_block_results_block'),
+    )
+    op.create_index('ix_debug_block_results_filename_complete', 'debug_block_results', ['filename', 'complete'])
+    op.create_index('ix_debug_block_results_checked_at', 'debug_block_results', ['checked_at'])
+
+def downgrade():
+    op.drop_index('ix_debug_block_results_checked_at', table_name='debug_block_results')
+    op.drop_index('ix_debug_block_results_filename_complete', table_name='debug_block_results')
+    op.drop_table('debug_block_results')
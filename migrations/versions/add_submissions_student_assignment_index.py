@@ -0,0 +1,15 @@
+"""
+Index submissions by (student_id, assignment_id) for the pending-assignments anti-join
+"""
+from alembic import op
+
+revision = 'add_submissions_student_idx'
+down_revision = 'comment_feedback_code_hash'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('ix_submissions_student_assignment', 'submissions', ['student_id', 'assignment_id'])
+
+def downgrade():
+    op.drop_index('ix_submissions_student_assignment', table_name='submissions')
@@ -0,0 +1,26 @@
+"""
+Ensure comment_feedback.code_hash exists
+
+Databases first built with db.create_all() before code_hash was added relied
+on create_app() inspecting the table and running ALTER TABLE on every boot.
+That check now lives here and runs once, on `flask db upgrade`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'comment_feedback_code_hash'
+down_revision = 'add_debug_block_results'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'comment_feedback' not in inspector.get_table_names():
+        return
+    columns = [col['name'] for col in inspector.get_columns('comment_feedback')]
+    if 'code_hash' not in columns:
+        op.add_column('comment_feedback', sa.Column('code_hash', sa.String(64), nullable=False, server_default='unknown'))
+
+def downgrade():
+    # code_hash is part of the model and of the original comment_feedback table; leave it in place
+    pass
@@ -0,0 +1,28 @@
+"""
+Add unique key on comment_feedback (user_id, section_id, filename, line_num)
+
+Existing duplicate rows are collapsed to the oldest entry before the
+constraint is created so the upgrade works on live data.
+"""
+from alembic import op
+
+revision = 'comment_feedback_unique_line'
+down_revision = '98d9d256417d'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute(
+        'DELETE FROM comment_feedback WHERE id NOT IN ('
+        'SELECT MIN(id) FROM comment_feedback '
+        'GROUP BY user_id, section_id, filename, line_num)'
+    )
+    with op.batch_alter_table('comment_feedback', schema=None) as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_comment_feedback_line',
+            ['user_id', 'section_id', 'filename', 'line_num']
+        )
+
+def downgrade():
+    with op.batch_alter_table('comment_feedback', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_comment_feedback_line', type_='unique')
@@ -0,0 +1,66 @@
+# Script: test_feedback_export.py
+# Description: Regression test that the class feedback export keeps DEBUG blocks in file order
+# and only exports the latest checked version of each file.
+
+import io
+import zipfile
+from flask import Flask
+from app import db
+from app.models import User
+from app.services import feedback_export
+from app.services.debug_block_results import store_debug_blocks
+from app.services.debug_blocks import DebugBlock
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def blocks(count, first_line):
+    return [
+        DebugBlock(first_line + 10 * i, first_line + 10 * i + 2, [(first_line + 10 * i, f'# DEBUG {i}')], 'test', 'issue', 'fix')
+        for i in range(count)
+    ]
+
+
+def test_debug_blocks_export_in_file_order():
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        student = User(username='student', email='s@example.com', role='student')
+        db.session.add(student)
+        db.session.flush()
+        # One bulk insert per checked version, as the debug checker stores them
+        store_debug_blocks(student.id, 'main.py', 'old', blocks(3, 100))
+        db.session.commit()
+        store_debug_blocks(student.id, 'main.py', 'new', blocks(6, 1))
+        db.session.commit()
+
+        rendered = []
+
+        def fake_render(filename, date, items):
+            rendered.append((filename, items))
+            return io.BytesIO(b'%PDF')
+
+        original = feedback_export.render_debug_feedback_report
+        feedback_export.render_debug_feedback_report = fake_render
+        try:
+            data = b''.join(feedback_export.stream_feedback_zip(None, workers=0))
+        finally:
+            feedback_export.render_debug_feedback_report = original
+
+        assert len(rendered) == 1
+        filename, items = rendered[0]
+        assert filename == 'main.py'
+        assert [block.start_line for block in items] == [1, 11, 21, 31, 41, 51]
+        assert zipfile.ZipFile(io.BytesIO(data)).namelist() == ['student/main.py_debug_blocks.pdf']
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    test_debug_blocks_export_in_file_order()
+    print("feedback export: OK")
@@ -0,0 +1,88 @@
+# Script: test_pending_assignments.py
+# Description: Regression test that the dashboard's pending-assignments lookup stays a single query.
+
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import event
+from app import db
+from app.models import Assignment, Course, Enrollment, Submission, User
+from app.services.pending_assignments import pending_assignments_for
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed(courses, assignments_per_course):
+    """Student enrolled in every course but the last; submitted every third assignment."""
+    teacher = User(username='teacher', email='t@example.com', role='teacher')
+    student = User(username='student', email='s@example.com', role='student')
+    db.session.add_all([teacher, student])
+    db.session.flush()
+    start = datetime(2025, 1, 1)
+    for c in range(courses):
+        course = Course(title=f'Course {c}', teacher_id=teacher.id)
+        db.session.add(course)
+        db.session.flush()
+        if c < courses - 1:
+            db.session.add(Enrollment(student_id=student.id, course_id=course.id))
+        for a in range(assignments_per_course):
+            due = None if a == 0 else start + timedelta(days=a * courses + c)
+            assignment = Assignment(course_id=course.id, title=f'A{c}.{a}', due_date=due)
+            db.session.add(assignment)
+            db.session.flush()
+            if a % 3 == 1:
+                db.session.add(Submission(assignment_id=assignment.id, student_id=student.id))
+    db.session.commit()
+    return student.id
+
+
+def expected_pending(student_id):
+    """The old per-assignment loop, sorted the way the service orders results."""
+    pending = []
+    for enrollment in Enrollment.query.filter_by(student_id=student_id).all():
+        for assignment in Assignment.query.filter_by(course_id=enrollment.course_id).all():
+            if not Submission.query.filter_by(assignment_id=assignment.id, student_id=student_id).first():
+                pending.append(assignment)
+    pending.sort(key=lambda a: (a.due_date is None, a.due_date or datetime.min, a.id))
+    return [a.id for a in pending]
+
+
+def count_queries(fn):
+    statements = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before)
+    return result, len(statements)
+
+
+def test_pending_assignments_is_one_query():
+    for courses, per_course in ((2, 3), (6, 20)):
+        app = make_app()
+        with app.app_context():
+            db.create_all()
+            student_id = seed(courses, per_course)
+            db.session.expire_all()
+            pending, queries = count_queries(lambda: pending_assignments_for(student_id))
+            assert queries == 1
+            assert [a.id for a in pending] == expected_pending(student_id)[:5]
+
+            everything, queries = count_queries(lambda: pending_assignments_for(student_id, limit=None))
+            assert queries == 1
+            assert [a.id for a in everything] == expected_pending(student_id)
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    test_pending_assignments_is_one_query()
+    print("pending assignments: OK")
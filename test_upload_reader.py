@@ -0,0 +1,27 @@
+# Script: test_upload_reader.py
+# Description: Regression test that streamed uploads and form-field code hit the line cap at the same point.
+
+import io
+import pytest
+from app.services.upload_reader import UploadTooLarge, check_source_limits, count_lines, iter_upload_lines, read_upload
+
+
+@pytest.mark.parametrize('data', [b'x\n' * 3, b'x\n' * 2 + b'x', b'x\r\n' * 3, b'x\r' * 3, b'', b'\n\n\n'])
+def test_line_cap_boundary_matches(data):
+    # Exactly at the limit: both paths accept, and agree on the count
+    code = read_upload(io.BytesIO(data), max_lines=3)
+    check_source_limits(code, max_lines=3)
+    check_source_limits(data.decode('utf-8'), max_lines=3)
+    assert count_lines(code) == count_lines(data.decode('utf-8')) == len(list(iter_upload_lines(io.BytesIO(data))))
+
+
+@pytest.mark.parametrize('data', [b'x\n' * 4, b'x\n' * 3 + b'x', b'x\r\n' * 4])
+def test_line_cap_exceeded_on_both_paths(data):
+    with pytest.raises(UploadTooLarge):
+        read_upload(io.BytesIO(data), max_lines=3)
+    with pytest.raises(UploadTooLarge):
+        check_source_limits(data.decode('utf-8'), max_lines=3)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, '-q']))